@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""archive_export.py
+Archive en colonnes (Parquet) de tous les bulletins publiés, pour les
+analyses sur plusieurs saisons (fréquence de publication par région, par
+culture...) sans relire chaque XML avec ET.parse.
+
+À chaque génération, publish_feed ajoute les nouveaux bulletins du flux :
+
+    archive_bulletins/month=2025-07/part-<horodatage>.parquet
+
+Colonnes : guid, region (nom du flux), category, author, pub_date
+(horodatage UTC), title, link. Le dossier est partitionné par mois de
+publication (partitionnement « Hive », lu directement par pyarrow.dataset,
+DuckDB, pandas, Polars...).
+
+Chaque exécution ajoute un petit fichier par mois touché : « compact »
+regroupe les fichiers de chaque mois en un seul (et retire les doublons).
+
+Nécessite pyarrow (pip install pyarrow) ; sans lui l'archive est
+simplement ignorée.
+
+Usage:
+    python archive_export.py                 (bulletins par région et par année)
+    python archive_export.py --backfill      (archive les flux existants de liste_des_flux/)
+    python archive_export.py --compact
+"""
+
+import os
+import sys
+import glob
+import time
+
+from feed_io import iter_feed_items, pub_timestamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'archive_bulletins')
+# Mois des bulletins sans date lisible
+UNKNOWN_MONTH = 'inconnu'
+COLUMNS = ('guid', 'region', 'category', 'author', 'pub_date', 'title', 'link')
+
+if _HAS_ARROW:
+    SCHEMA = pa.schema([
+        ('guid', pa.string()),
+        ('region', pa.string()),
+        ('category', pa.string()),
+        ('author', pa.string()),
+        ('pub_date', pa.timestamp('s', tz='UTC')),
+        ('title', pa.string()),
+        ('link', pa.string()),
+    ])
+
+
+def _write_part(month_dir, table, prefix='part'):
+    """Écrit un fichier Parquet de façon atomique (les lecteurs ignorent les .tmp)."""
+    os.makedirs(month_dir, exist_ok=True)
+    path = os.path.join(month_dir, f'{prefix}-{time.time_ns()}-{os.getpid()}.parquet')
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    return path
+
+
+def append_items(feed_name, items, category=None, author=None, archive_dir=ARCHIVE_DIR):
+    """
+    Ajoute des bulletins à l'archive, un fichier par mois de publication.
+
+    Returns:
+        Nombre de bulletins archivés (0 sans pyarrow)
+    """
+    if not _HAS_ARROW or not items:
+        return 0
+    region = os.path.splitext(feed_name)[0]
+    months = {}
+    for it in items:
+        stamp = int(pub_timestamp(it)) or None
+        month = time.strftime('%Y-%m', time.gmtime(stamp)) if stamp else UNKNOWN_MONTH
+        columns = months.setdefault(month, {name: [] for name in COLUMNS})
+        columns['guid'].append(it.get('guid'))
+        columns['region'].append(region)
+        columns['category'].append(category or it.get('category'))
+        columns['author'].append(author or it.get('author'))
+        columns['pub_date'].append(stamp)
+        columns['title'].append(it.get('title'))
+        columns['link'].append(it.get('link'))
+    try:
+        for month, columns in months.items():
+            columns['pub_date'] = pa.array(columns['pub_date'], pa.int64()).cast(SCHEMA.field('pub_date').type)
+            _write_part(os.path.join(archive_dir, f'month={month}'),
+                        pa.table(columns, schema=SCHEMA))
+    except (OSError, pa.ArrowException) as e:
+        # L'archive est un plus : ne jamais faire échouer la génération du flux
+        print(f"⚠️  Archive des bulletins non mise à jour: {e}")
+        return 0
+    return len(items)
+
+
+def _parts(month_dir):
+    return sorted(glob.glob(os.path.join(month_dir, '*.parquet')))
+
+
+def compact(archive_dir=ARCHIVE_DIR):
+    """
+    Regroupe les fichiers de chaque mois en un seul ; pour un même bulletin
+    (région + guid), la version la plus récemment archivée est conservée.
+
+    Returns:
+        (nombre de mois compactés, nombre de fichiers supprimés)
+    """
+    months = removed = 0
+    for month_dir in sorted(glob.glob(os.path.join(archive_dir, 'month=*'))):
+        parts = _parts(month_dir)
+        if len(parts) < 2:
+            continue
+        # Parties dans l'ordre d'écriture (horodatage du nom de fichier)
+        parts.sort(key=lambda p: int(os.path.basename(p).split('-')[1]))
+        table = pa.concat_tables(pq.read_table(p, schema=SCHEMA) for p in parts)
+        table = table.append_column('_row', pa.array(range(table.num_rows), pa.int64()))
+        last = table.group_by(['region', 'guid'], use_threads=False).aggregate([('_row', 'max')])
+        rows = last['_row_max']
+        table = table.take(pc.take(rows, pc.sort_indices(rows))).drop_columns(['_row'])
+        _write_part(month_dir, table)
+        for path in parts:
+            os.remove(path)
+        months += 1
+        removed += len(parts)
+    return months, removed
+
+
+def backfill(feeds_dir, archive_dir=ARCHIVE_DIR):
+    """Archive tous les flux .xml d'un dossier ; retourne le nombre de bulletins."""
+    total = 0
+    for path in sorted(glob.glob(os.path.join(feeds_dir, '*.xml'))):
+        total += append_items(os.path.basename(path), list(iter_feed_items(path)),
+                              archive_dir=archive_dir)
+    return total
+
+
+def load_dataset(archive_dir=ARCHIVE_DIR):
+    """Archive complète en pyarrow.dataset (colonne month comprise)."""
+    return ds.dataset(archive_dir, format='parquet', partitioning='hive',
+                      exclude_invalid_files=True)
+
+
+def counts_by_region_year(archive_dir=ARCHIVE_DIR):
+    """Nombre de bulletins distincts par région et par année de publication."""
+    table = load_dataset(archive_dir).to_table(columns=['region', 'guid', 'pub_date'])
+    table = table.append_column('year', pc.year(table['pub_date']))
+    result = table.group_by(['region', 'year']).aggregate([('guid', 'count_distinct')])
+    return result.sort_by([('region', 'ascending'), ('year', 'ascending')])
+
+
+def main():
+    if not _HAS_ARROW:
+        print("❌ pyarrow non installé - installez avec: pip install pyarrow")
+        sys.exit(1)
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if 'backfill' in options:
+        feeds_dir = args[0] if args else os.path.join(BASE_DIR, 'liste_des_flux')
+        count = backfill(feeds_dir)
+        print(f"✅ {count} bulletin(s) archivé(s) dans {ARCHIVE_DIR}")
+        return
+    if 'compact' in options:
+        months, removed = compact()
+        print(f"🗜️  {months} mois compacté(s), {removed} fichier(s) regroupé(s)")
+        return
+
+    if not glob.glob(os.path.join(ARCHIVE_DIR, 'month=*', '*.parquet')):
+        print(f"ℹ️  Archive vide ({ARCHIVE_DIR})")
+        return
+    start = time.perf_counter()
+    result = counts_by_region_year()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"📊 Bulletins par région et par année ({elapsed:.0f} ms)")
+    for region, year, count in zip(*(result[c].to_pylist() for c in result.column_names)):
+        print(f"  {region:30} {year if year is not None else '?':>6} {count:>6}")
+
+
+if __name__ == '__main__':
+    main()
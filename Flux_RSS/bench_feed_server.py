@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""bench_feed_server.py
+Petit banc de charge de feed_server.py comparé à `python -m http.server`.
+
+Lance les deux serveurs en local sur le dossier liste_des_flux/ et mesure,
+pour plusieurs scénarios (sans compression, gzip/br, requêtes
+conditionnelles If-None-Match), le débit en requêtes/s et les octets
+transférés.
+
+Usage:
+    python bench_feed_server.py [dossier_flux] [requêtes=2000] [clients=8]
+"""
+
+import os
+import sys
+import glob
+import time
+import threading
+import http.client
+import http.server
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import quote
+
+from feed_server import make_server
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def run_scenario(port, paths, total, clients, headers_for):
+    """Envoie `total` requêtes GET réparties sur `clients` threads."""
+    per_client = total // clients
+
+    def client(offset):
+        sent = 0
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        for n in range(per_client):
+            path = paths[(offset + n) % len(paths)]
+            conn.request('GET', path, headers=headers_for(path))
+            resp = conn.getresponse()
+            sent += len(resp.read())
+            if resp.getheader('Connection', '').lower() == 'close' or resp.version == 10:
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.close()
+        return sent
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        transferred = sum(pool.map(client, range(clients)))
+    elapsed = time.perf_counter() - start_time
+    return per_client * clients / elapsed, transferred
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    feeds_dir = sys.argv[1] if len(sys.argv) >= 2 else os.path.join(base_dir, 'liste_des_flux')
+    total = int(sys.argv[2]) if len(sys.argv) >= 3 else 2000
+    clients = int(sys.argv[3]) if len(sys.argv) >= 4 else 8
+
+    paths = ['/' + quote(os.path.basename(p)) for p in sorted(glob.glob(os.path.join(feeds_dir, '*.xml')))]
+    if not paths:
+        print(f"❌ Aucun flux .xml dans {feeds_dir}")
+        sys.exit(1)
+
+    feed_server = make_server(feeds_dir, 0, quiet=True)
+    feed_port = start(feed_server)
+    plain_server = http.server.ThreadingHTTPServer(
+        ('', 0), partial(QuietHandler, directory=feeds_dir))
+    plain_port = start(plain_server)
+
+    # ETag de chaque flux (variante gzip) pour les requêtes conditionnelles
+    etags = {}
+    conn = http.client.HTTPConnection('127.0.0.1', feed_port)
+    for path in paths:
+        conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+        resp = conn.getresponse()
+        resp.read()
+        etags[path] = resp.getheader('ETag')
+    conn.close()
+
+    scenarios = [
+        ('http.server (référence)', plain_port, lambda p: {}),
+        ('feed_server sans compression', feed_port, lambda p: {}),
+        ('feed_server gzip/br', feed_port, lambda p: {'Accept-Encoding': 'br, gzip'}),
+        ('feed_server If-None-Match (304)', feed_port,
+         lambda p: {'Accept-Encoding': 'gzip', 'If-None-Match': etags[p]}),
+    ]
+
+    print("=" * 70)
+    print(f"  📊 Banc de charge : {len(paths)} flux, {total} requêtes, {clients} clients")
+    print("=" * 70)
+    print(f"{'Scénario':<36} {'req/s':>10} {'octets':>14}")
+    print("-" * 70)
+    for label, port, headers_for in scenarios:
+        rate, transferred = run_scenario(port, paths, total, clients, headers_for)
+        print(f"{label:<36} {rate:>10.0f} {transferred:>14,}")
+
+    feed_server.shutdown()
+    plain_server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""bench_formats.py
+Mesure le coût des sorties Atom / JSON Feed par rapport au RSS seul.
+
+Compare, sur une liste d'items synthétique :
+  - RSS seul (make_rss) ;
+  - RSS + Atom + JSON Feed rendus depuis la liste en mémoire (feed_formats) ;
+  - RSS puis post-traitement (relecture du XML produit) comme avant.
+
+Usage:
+    python bench_formats.py [items=200] [répétitions=200]
+"""
+
+import sys
+import time
+import email.utils
+import xml.etree.ElementTree as ET
+from hashlib import md5
+
+from create_rss_from_index import make_rss
+from feed_formats import render_formats
+
+
+def make_items(count):
+    """Items ressemblant à ceux de extract_bulletins_from_index."""
+    items = []
+    start = time.time()
+    for n in range(count):
+        link = f"https://draaf.example.gouv.fr/bsv-viticulture-no{n}-a{6000 + n}.html"
+        items.append({
+            'title': f"BSV Viticulture Auvergne N°{n} du 22 juillet 2025",
+            'link': link,
+            'description': f"BSV Viticulture Auvergne N°{n} du 22 juillet 2025",
+            'pubDate': email.utils.formatdate(start - n * 7 * 86400, usegmt=True),
+            'guid': md5(link.encode('utf-8')).hexdigest(),
+        })
+    return items
+
+
+def rss_only(items):
+    return make_rss('Viticulture', 'https://draaf.example.gouv.fr', 'BSV', items,
+                    'DRAAF', 'Viticulture')
+
+
+def rss_and_formats(items):
+    rss = rss_only(items)
+    extra = render_formats(['atom', 'json'], 'Viticulture', 'https://draaf.example.gouv.fr',
+                           'BSV', items, 'Viticulture', 'DRAAF')
+    return rss, extra
+
+
+def rss_then_reparse(items):
+    rss = rss_only(items)
+    root = ET.fromstring(rss)
+    reparsed = [{child.tag: child.text for child in item} for item in root.iter('item')]
+    extra = render_formats(['atom', 'json'], 'Viticulture', 'https://draaf.example.gouv.fr',
+                           'BSV', reparsed, 'Viticulture', 'DRAAF')
+    return rss, extra
+
+
+def measure(func, items, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(items)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) >= 2 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) >= 3 else 200
+    items = make_items(count)
+
+    print("=" * 70)
+    print(f"  📊 Coût des formats de sortie ({count} items, {repeat} répétitions)")
+    print("=" * 70)
+    base = measure(rss_only, items, repeat)
+    rows = [
+        ('RSS seul', base),
+        ('RSS + Atom + JSON (même liste)', measure(rss_and_formats, items, repeat)),
+        ('RSS puis relecture -> Atom + JSON', measure(rss_then_reparse, items, repeat)),
+    ]
+    print(f"{'Variante':<40} {'ms/flux':>10} {'x RSS':>8}")
+    print("-" * 70)
+    for label, ms in rows:
+        print(f"{label:<40} {ms:>10.2f} {ms / base:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""bench_metadata.py
+Compare l'extraction des métadonnées de create_rss.py (scan_document : un
+seul passage sur la page) à l'ancienne version (une douzaine d'expressions
+régulières appliquées chacune à toute la page), sur un jeu de pages types.
+
+Vérifie que les deux versions donnent les mêmes résultats puis mesure le
+temps par page.
+
+Usage:
+    python bench_metadata.py [répétitions=200]
+"""
+
+import re
+import sys
+import html
+import time
+
+import create_rss
+from create_rss import parse_date_string, parse_french_date
+
+
+# --- Ancienne version (référence) -------------------------------------------
+
+def legacy_title(html_text):
+    m = re.search(r'<title[^>]*>(.*?)</title>', html_text, re.I | re.S)
+    if m:
+        return html.unescape(m.group(1).strip())
+    m = re.search(r"<meta[^>]+property=[\"']og:title[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
+    if m:
+        return html.unescape(m.group(1).strip())
+    return None
+
+
+def legacy_description(html_text):
+    m = re.search(r"<meta[^>]+name=[\"']description[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
+    if m:
+        return html.unescape(m.group(1).strip())
+    m = re.search(r"<meta[^>]+property=[\"']og:description[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
+    if m:
+        return html.unescape(m.group(1).strip())
+    return ''
+
+
+def legacy_pub_date(html_text, url=''):
+    patterns = [
+        r"<meta[^>]+property=[\"']article:published_time[\"'][^>]*content=[\"'](.*?)[\"']",
+        r"<meta[^>]+name=[\"']published[\"'][^>]*content=[\"'](.*?)[\"']",
+        r"<meta[^>]+name=[\"']date[\"'][^>]*content=[\"'](.*?)[\"']",
+    ]
+    for pat in patterns:
+        m = re.search(pat, html_text, re.I | re.S)
+        if m:
+            parsed = parse_date_string(m.group(1).strip())
+            if parsed:
+                return parsed
+    m = re.search(r'<time[^>]+datetime=["\']([^"\']+)["\']', html_text, re.I)
+    if m:
+        parsed = parse_date_string(m.group(1).strip())
+        if parsed:
+            return parsed
+    m = re.search(r'\b(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})\b',
+                  html_text, re.I)
+    if m:
+        parsed = parse_french_date(*m.groups())
+        if parsed:
+            return parsed
+    m = re.search(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b', html_text)
+    if m:
+        day, month, year = m.groups()
+        parsed = parse_date_string(f"{year}-{month.zfill(2)}-{day.zfill(2)}")
+        if parsed:
+            return parsed
+    return None
+
+
+def legacy_category(html_text, url=''):
+    m = re.search(r"<meta[^>]+property=[\"']article:section[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
+    if m:
+        return html.unescape(m.group(1).strip())
+    m = re.search(r"<meta[^>]+name=[\"']category[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
+    if m:
+        return html.unescape(m.group(1).strip())
+    if 'viticulture' in url.lower() or 'viticulture' in html_text[:2000].lower():
+        return 'Viticulture'
+    if 'grandes cultures' in html_text[:2000].lower():
+        return 'Grandes Cultures'
+    return None
+
+
+def legacy_author(html_text, url=''):
+    m = re.search(r"<meta[^>]+name=[\"']author[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
+    if m:
+        return html.unescape(m.group(1).strip())
+    if 'draaf' in url.lower():
+        return 'DRAAF Auvergne-Rhône-Alpes'
+    return None
+
+
+def legacy_extract(page, url):
+    return (legacy_title(page), legacy_description(page), legacy_pub_date(page, url),
+            legacy_category(page, url), legacy_author(page, url))
+
+
+def current_extract(page, url):
+    doc = create_rss.scan_document(page)
+    return (create_rss.extract_title(page, doc), create_rss.extract_description(page, doc),
+            create_rss.extract_pub_date(page, url, doc), create_rss.extract_category(page, url, doc),
+            create_rss.extract_author(page, url, doc))
+
+
+# --- Pages types ------------------------------------------------------------
+
+# Menu et pied de page volumineux, comme sur les sites des DRAAF
+FILLER = ''.join(
+    f'<li class="menu-item"><a href="/rubrique-{n}" title="Rubrique {n}">Rubrique {n}</a></li>\n'
+    for n in range(600))
+FOOTER = '<footer><p>Mentions légales - Plan du site - Accessibilité</p></footer>'
+
+
+def page(head, body=''):
+    return (f'<!DOCTYPE html>\n<html lang="fr"><head><meta charset="utf-8">{head}</head>'
+            f'<body><nav><ul>{FILLER}</ul></nav><main>{body}</main>{FOOTER}</body></html>')
+
+
+FIXTURES = [
+    ('métadonnées complètes', 'https://draaf.example.gouv.fr/bsv-viticulture', page(
+        '<title>BSV Viticulture n°16 &amp; bilan</title>'
+        '<meta name="description" content="Bulletin de santé du végétal, viticulture">'
+        '<meta property="article:published_time" content="2025-07-22T10:00:00+02:00">'
+        '<meta property="article:section" content="Viticulture">'
+        '<meta name="author" content="DRAAF Occitanie">')),
+    ('Open Graph seul', 'https://chambre.example.fr/bulletin', page(
+        '<meta property="og:title" content="Bulletin grandes cultures">'
+        '<meta property="og:description" content="Situation au 15 mai">')),
+    ('balise time', 'https://example.fr/actualite', page(
+        '<title>Actualité</title>',
+        '<article><h1>Actualité</h1><time datetime="2025-03-04">4 mars</time></article>')),
+    ('date française dans le texte', 'https://draaf.example.gouv.fr/bsv', page(
+        '<title>BSV Arboriculture</title>',
+        '<p>BSV Arboriculture du 22 juillet 2025</p>')),
+    ('date numérique', 'https://example.fr/page', page(
+        "<title>Note d'information</title>",
+        '<p>Mise à jour le 17/07/2025</p>')),
+    ('catégorie en début de page', 'https://example.fr/bsv-gc', page(
+        '<title>BSV Grandes Cultures</title><meta name="category" content="Grandes cultures">')),
+    ('sans métadonnées', 'https://example.fr/', page('')),
+]
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, url, html_text in FIXTURES:
+            func(html_text, url)
+    return (time.perf_counter() - start) / (repeat * len(FIXTURES)) * 1000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) >= 2 else 200
+
+    print("=" * 70)
+    print(f"  📊 Extraction des métadonnées ({len(FIXTURES)} pages types, {repeat} répétitions)")
+    print("=" * 70)
+    identical = True
+    for name, url, html_text in FIXTURES:
+        same = legacy_extract(html_text, url) == current_extract(html_text, url)
+        identical &= same
+        print(f"  {'✅' if same else '❌'} {name}")
+        if not same:
+            print(f"     ancien  : {legacy_extract(html_text, url)}")
+            print(f"     nouveau : {current_extract(html_text, url)}")
+
+    legacy = measure(legacy_extract, repeat)
+    current = measure(current_extract, repeat)
+    print("-" * 70)
+    print(f"  Regex successives (ancien) : {legacy:8.3f} ms/page")
+    print(f"  scan_document (un passage) : {current:8.3f} ms/page  (x{legacy / current:.1f})")
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == '__main__':
+    main()
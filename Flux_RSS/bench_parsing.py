@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""bench_parsing.py
+Compare l'analyse complète d'une page index (arbre BeautifulSoup de toute
+la page) à l'analyse restreinte de create_rss_robust.py (métadonnées lues
+avec un SoupStrainer, bulletins cherchés dans les seuls sous-arbres des
+liens candidats, voir _link_subtrees).
+
+Vérifie que les deux analyses donnent exactement les mêmes items et
+métadonnées, puis mesure le temps et le pic mémoire Python (tracemalloc).
+L'arbre lxml intermédiaire de l'analyse restreinte est alloué en C : il
+n'apparaît pas dans tracemalloc, mais il est libéré avant la construction
+de l'arbre BeautifulSoup réduit.
+
+Sans fichier, la page est générée : menu et pied de page volumineux,
+comme sur les sites des DRAAF, et de nombreux bulletins.
+
+Usage:
+    python bench_parsing.py [page.html] [--url=https://...] [--repeat=3]
+"""
+
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import create_rss_robust
+from create_rss_robust import extract_bulletins_smart, extract_page_metadata, detect_author
+
+
+# Date de repli identique pour les deux analyses (bulletins sans date)
+NOW = time.time()
+
+
+def synthetic_page(bulletins=3000):
+    """Page index type : gros menu, bulletins en liste avec leur date, pied de page."""
+    menu = ''.join(
+        f'<li class="menu-item"><a href="/rubrique-{n}" title="Rubrique {n}">Rubrique {n}</a>'
+        f'<ul><li><a href="/rubrique-{n}/page">Page {n}</a></li></ul></li>\n'
+        for n in range(1500))
+    items = ''.join(
+        f'<li class="article"><div class="meta"><span>Publié le {n % 28 + 1} mars 2024</span>'
+        f'<time datetime="2024-03-{n % 28 + 1:02d}T10:00:00+01:00">{n % 28 + 1}/03</time></div>'
+        f'<p>Résumé de la situation sanitaire, semaine {n % 52 + 1}.</p>'
+        f'<a href="/bsv-viticulture-{n}.html">BSV Viticulture n°{n}</a>'
+        f'<a href="/partager?u={n}">Partager</a></li>\n'
+        for n in range(bulletins))
+    return ('<!DOCTYPE html>\n<html lang="fr"><head><meta charset="utf-8">'
+            '<title>Bulletins de santé du végétal</title>'
+            '<meta name="description" content="BSV de la région">'
+            '<meta name="author" content="DRAAF Exemple"></head>'
+            f'<body><nav><ul>{menu}</ul></nav><main><ul>{items}</ul></main>'
+            '<footer><p>Mentions légales - Plan du site - Accessibilité</p></footer></body></html>')
+
+
+def full_parse(html_content, url):
+    title, description = extract_page_metadata_full(html_content)
+    return (title, description, detect_author_full(html_content),
+            extract_bulletins_smart(html_content, url, restricted=False))
+
+
+def restricted_parse(html_content, url):
+    title, description = extract_page_metadata(html_content, url)
+    return (title, description, detect_author(html_content, url),
+            extract_bulletins_smart(html_content, url))
+
+
+def extract_page_metadata_full(html_content):
+    with mock.patch.object(create_rss_robust, 'METADATA_TAGS', None):
+        return extract_page_metadata(html_content, '')
+
+
+def detect_author_full(html_content):
+    with mock.patch.object(create_rss_robust, 'METADATA_TAGS', None):
+        return detect_author(html_content, '')
+
+
+def measure(func, html_content, url, repeat):
+    """(résultat, ms par page, pic tracemalloc en Mo)"""
+    with mock.patch.object(create_rss_robust.time, 'time', lambda: NOW):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func(html_content, url)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        tracemalloc.start()
+        try:
+            func(html_content, url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    repeat = int(options.get('repeat') or 3)
+    url = options.get('url') or 'https://draaf.example.gouv.fr/bsv'
+    if args:
+        with open(args[0], encoding='utf-8', errors='replace') as f:
+            html_content = f.read()
+        name = args[0]
+    else:
+        html_content = synthetic_page()
+        name = 'page générée'
+
+    print("=" * 70)
+    print(f"  📊 Analyse complète / restreinte : {name} ({len(html_content):,} caractères)")
+    print("=" * 70)
+    full, full_ms, full_peak = measure(full_parse, html_content, url, repeat)
+    restricted, restricted_ms, restricted_peak = measure(restricted_parse, html_content, url, repeat)
+
+    identical = full == restricted
+    print(f"  {'✅' if identical else '❌'} {len(full[3])} bulletin(s), "
+          f"{'résultats identiques' if identical else 'résultats DIFFÉRENTS'}")
+    if not identical:
+        print(f"     complète   : {full[:3]}, {len(full[3])} bulletin(s)")
+        print(f"     restreinte : {restricted[:3]}, {len(restricted[3])} bulletin(s)")
+    print("-" * 70)
+    print(f"  Analyse complète   : {full_ms:8.1f} ms/page, pic mémoire {full_peak:7.1f} Mo")
+    print(f"  Analyse restreinte : {restricted_ms:8.1f} ms/page, pic mémoire {restricted_peak:7.1f} Mo"
+          f"  (x{full_peak / max(restricted_peak, 1e-6):.1f} moins)")
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""bench_tiers.py
+Vérifie le choix de l'extracteur de --tiered (extract_bulletins_tiered de
+create_rss_robust.py) sur des pages générées, et compare son temps à
+l'analyse BeautifulSoup seule :
+
+  - page simple (titres « BSV ... du 22 juillet 2025 ») : regex ;
+  - dates invalides (« du 30 février 2024 ») : les bulletins sont datés
+    de repli et marqués 'undated', repli sur BeautifulSoup ;
+  - liens sans « BSV » dans le titre : regex insuffisantes, BeautifulSoup.
+
+Usage:
+    python bench_tiers.py [--bulletins=300] [--repeat=3]
+"""
+
+import sys
+import time
+
+from create_rss_robust import extract_bulletins_smart, extract_bulletins_tiered
+
+
+URL = 'https://draaf.example.gouv.fr/bsv'
+
+
+def page(titles):
+    """Page index type : menu, un bulletin par ligne de liste, pied de page."""
+    menu = ''.join(f'<li><a href="/rubrique-{n}">Rubrique {n}</a></li>' for n in range(100))
+    items = ''.join(f'<li><a href="/bsv-{n}.html">{title}</a></li>\n'
+                    for n, title in enumerate(titles))
+    return ('<html><head><title>Bulletins de santé du végétal</title></head>'
+            f'<body><nav><ul>{menu}</ul></nav><main><ul>{items}</ul></main>'
+            '<footer>Mentions légales</footer></body></html>')
+
+
+def cases(bulletins):
+    """(nom, page, extracteur attendu, tous les bulletins sans date ?)"""
+    return [
+        ('page simple', page(f'BSV Viticulture N°{n} du {n % 28 + 1} mars 2024'
+                             for n in range(bulletins)), 'regex', False),
+        ('dates invalides', page(f'BSV Viticulture N°{n} du 30 février 2024'
+                                 for n in range(bulletins)), 'soup', True),
+        ('liens sans BSV', page(f'Bulletin de santé du végétal n°{n}'
+                                for n in range(bulletins)), 'soup', False),
+    ]
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    repeat = int(options.get('repeat') or 3)
+    bulletins = int(options.get('bulletins') or 300)
+
+    print("=" * 70)
+    print(f"  📊 Extraction à deux niveaux ({bulletins} bulletins par page)")
+    print("=" * 70)
+    ok = True
+    for name, html_content, expected, undated in cases(bulletins):
+        try:
+            (items, tier), tiered_ms = timed(
+                lambda: extract_bulletins_tiered(html_content, URL), repeat)
+        except Exception as e:
+            print(f"  ❌ {name} : {type(e).__name__}: {e}")
+            ok = False
+            continue
+        _, soup_ms = timed(lambda: extract_bulletins_smart(html_content, URL), repeat)
+        good = tier == expected and (not undated or all(b.get('undated') for b in items))
+        ok = ok and good
+        print(f"  {'✅' if good else '❌'} {name:16} {tier:5} (attendu {expected}), "
+              f"{len(items)} bulletin(s), {tiered_ms:7.1f} ms / BeautifulSoup seul {soup_ms:7.1f} ms")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
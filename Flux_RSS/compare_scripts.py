@@ -8,6 +8,7 @@ import time
 import subprocess
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 def analyze_rss_file(filepath):
     """Analyse un fichier RSS et retourne des statistiques."""
@@ -29,7 +30,6 @@ def analyze_rss_file(filepath):
             pub_date = item.find('pubDate')
             if pub_date is not None:
                 try:
-                    from email.utils import parsedate_to_datetime
                     date_obj = parsedate_to_datetime(pub_date.text).date()
                     if date_obj != today:
                         items_with_real_dates += 1
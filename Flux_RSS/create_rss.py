@@ -2,6 +2,10 @@
 """create_rss.py
 Peut fonctionner en mode interactif (une URL) ou batch à partir d'un fichier
 .xlsx (col A = URL, col B = nom du fichier) ou .csv.
+Colonne C (optionnelle) : formats supplémentaires, ex. "atom,json".
+Option --profile : profil cProfile/tracemalloc par flux (voir profiling.py).
+Options --record / --replay[=AAAA-MM-JJ] : enregistrement des pages
+téléchargées puis rejeu hors ligne (voir snapshot_archive.py).
 
 Si vous voulez traiter un seul URL, laissez vide le chemin de fichier
 à l'invite et saisissez l'URL puis le nom du fichier de sortie.
@@ -23,6 +27,13 @@ import traceback
 import locale
 from hashlib import md5
 
+from feed_formats import parse_formats
+from feed_publish import publish_feed
+from dedupe import canonical_url, dedupe_items
+from feed_hints import add_hints
+import snapshot_archive
+from profiling import run_profiled, clear_profiles, print_summary
+
 try:
     import openpyxl
     _HAS_OPENPYXL = True
@@ -31,9 +42,16 @@ except Exception:
 
 
 def fetch(url, timeout=15):
+    if snapshot_archive.replaying():
+        return snapshot_archive.replay_text(url)
     headers = {'User-Agent': 'Mozilla/5.0 (python)'}
     req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
+    try:
+        resp = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        snapshot_archive.record(url, e.code, e.reason, e.headers.items(), e.read())
+        raise
+    with resp:
         # essayer à partir des en-têtes, sinon utf-8
         charset = None
         try:
@@ -41,62 +59,130 @@ def fetch(url, timeout=15):
         except Exception:
             charset = None
         data = resp.read()
+        snapshot_archive.record(url, resp.status, resp.reason, resp.headers.items(), data)
         charset = charset or 'utf-8'
         return data.decode(charset, errors='replace')
 
 
-def extract_title(html_text):
-    m = re.search(r'<title[^>]*>(.*?)</title>', html_text, re.I | re.S)
-    if m:
-        return html.unescape(m.group(1).strip())
-    m = re.search(r"<meta[^>]+property=[\"']og:title[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
-    if m:
-        return html.unescape(m.group(1).strip())
+
+# Balises lues par scan_document : un seul passage sur la page
+_TAG_RE = re.compile(r'<(title|meta|time)\b([^>]*)>', re.I)
+_ATTR_RE = re.compile(r'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_TITLE_END_RE = re.compile(r'</title\s*>', re.I)
+_FRENCH_DATE_RE = re.compile(
+    r'\b(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})\b',
+    re.I)
+_NUMERIC_DATE_RE = re.compile(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b')
+# Préfiltres : trouvent vite les seuls endroits où les motifs ci-dessus
+# peuvent commencer (un mois entouré d'espaces, « /mm/aaaa » ou « -mm-aaaa »)
+_MONTH_RE = re.compile(
+    r'\s(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s',
+    re.I)
+_NUMERIC_TAIL_RE = re.compile(r'[/-]\d{1,2}[/-]\d{4}\b')
+
+
+def scan_document(html_text):
+    """
+    Relève en un seul passage les métadonnées utilisées par les extract_* :
+    premier <title>, balises <meta name/property> (première valeur de chaque
+    clé, ex: 'name:description', 'property:og:title') et premier
+    <time datetime>, plus le début de page en minuscules.
+    """
+    doc = {'title': None, 'meta': {}, 'time': None, 'head': html_text[:2000].lower()}
+    meta = doc['meta']
+    for m in _TAG_RE.finditer(html_text):
+        tag = m.group(1).lower()
+        if tag == 'title':
+            if doc['title'] is None:
+                end = _TITLE_END_RE.search(html_text, m.end())
+                if end:
+                    doc['title'] = html.unescape(html_text[m.end():end.start()].strip())
+            continue
+        attrs = {}
+        for a in _ATTR_RE.finditer(m.group(2)):
+            value = a.group(2) if a.group(2) is not None else a.group(3) if a.group(3) is not None else a.group(4)
+            attrs.setdefault(a.group(1).lower(), value)
+        if tag == 'time':
+            if doc['time'] is None and 'datetime' in attrs:
+                doc['time'] = html.unescape(attrs['datetime']).strip()
+        elif 'content' in attrs:
+            content = html.unescape(attrs['content'].strip())
+            for key in ('name', 'property'):
+                if key in attrs:
+                    meta.setdefault(f"{key}:{attrs[key].lower()}", content)
+    return doc
+
+
+def _match_day_before(pattern, text, end):
+    """Essaie `pattern` sur le jour (1 ou 2 chiffres) qui se termine en `end`."""
+    for start in (end - 2, end - 1):
+        if start >= 0:
+            m = pattern.match(text, start)
+            if m:
+                return m
     return None
 
 
-def extract_description(html_text):
-    m = re.search(r"<meta[^>]+name=[\"']description[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
-    if m:
-        return html.unescape(m.group(1).strip())
-    m = re.search(r"<meta[^>]+property=[\"']og:description[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I | re.S)
-    if m:
-        return html.unescape(m.group(1).strip())
-    return ''
+def find_french_date(html_text):
+    """Même résultat que _FRENCH_DATE_RE.search(html_text), sans essayer chaque position."""
+    for candidate in _MONTH_RE.finditer(html_text):
+        end = candidate.start() + 1
+        # Remonter les espaces entre le jour et le mois
+        while end > 0 and html_text[end - 1].isspace():
+            end -= 1
+        m = _match_day_before(_FRENCH_DATE_RE, html_text, end)
+        if m:
+            return m
+    return None
+
+
+def find_numeric_date(html_text):
+    """Même résultat que _NUMERIC_DATE_RE.search(html_text)."""
+    pos = 0
+    while True:
+        candidate = _NUMERIC_TAIL_RE.search(html_text, pos)
+        if candidate is None:
+            return None
+        m = _match_day_before(_NUMERIC_DATE_RE, html_text, candidate.start())
+        if m:
+            return m
+        pos = candidate.start() + 1
+
+
+def extract_title(html_text, doc=None):
+    doc = doc or scan_document(html_text)
+    return doc['title'] or doc['meta'].get('property:og:title')
+
 
+def extract_description(html_text, doc=None):
+    doc = doc or scan_document(html_text)
+    return doc['meta'].get('name:description') or doc['meta'].get('property:og:description') or ''
 
-def extract_pub_date(html_text, url=''):
+
+def extract_pub_date(html_text, url='', doc=None):
     """
     Extrait la date de publication depuis la page HTML.
     Cherche dans les métadonnées, les balises time, ou le contenu textuel.
     Retourne un string au format RFC 822 ou None.
     """
+    doc = doc or scan_document(html_text)
     # 1. Chercher dans les métadonnées Open Graph ou article:published_time
-    patterns = [
-        r"<meta[^>]+property=[\"']article:published_time[\"'][^>]*content=[\"'](.*?)[\"']",
-        r"<meta[^>]+name=[\"']published[\"'][^>]*content=[\"'](.*?)[\"']",
-        r"<meta[^>]+name=[\"']date[\"'][^>]*content=[\"'](.*?)[\"']",
-    ]
-    for pat in patterns:
-        m = re.search(pat, html_text, re.I | re.S)
-        if m:
-            date_str = m.group(1).strip()
+    for key in ('property:article:published_time', 'name:published', 'name:date'):
+        date_str = doc['meta'].get(key)
+        if date_str:
             parsed = parse_date_string(date_str)
             if parsed:
                 return parsed
     
     # 2. Chercher une balise <time datetime="...">
-    m = re.search(r'<time[^>]+datetime=["\']([^"\']+)["\']', html_text, re.I)
-    if m:
-        date_str = m.group(1).strip()
-        parsed = parse_date_string(date_str)
+    if doc['time']:
+        parsed = parse_date_string(doc['time'])
         if parsed:
             return parsed
     
     # 3. Chercher dans le contenu : dates au format français (ex: "22 juillet 2025", "17/07/2025")
     # Exemple pour les pages DRAAF qui affichent souvent "BSV ... du 22 juillet 2025"
-    m = re.search(r'\b(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})\b', 
-                  html_text, re.I)
+    m = find_french_date(html_text)
     if m:
         day, month_fr, year = m.groups()
         parsed = parse_french_date(day, month_fr, year)
@@ -104,7 +190,7 @@ def extract_pub_date(html_text, url=''):
             return parsed
     
     # 4. Chercher format dd/mm/yyyy ou dd-mm-yyyy
-    m = re.search(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b', html_text)
+    m = find_numeric_date(html_text)
     if m:
         day, month, year = m.groups()
         parsed = parse_date_string(f"{year}-{month.zfill(2)}-{day.zfill(2)}")
@@ -163,31 +249,29 @@ def parse_date_string(date_str):
     return None
 
 
-def extract_category(html_text, url=''):
+def extract_category(html_text, url='', doc=None):
     """Extrait la catégorie/thème de l'article (ex: Viticulture, Grandes Cultures...)."""
+    doc = doc or scan_document(html_text)
     # Chercher dans les métadonnées
-    m = re.search(r"<meta[^>]+property=[\"']article:section[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
-    if m:
-        return html.unescape(m.group(1).strip())
-    
-    m = re.search(r"<meta[^>]+name=[\"']category[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
-    if m:
-        return html.unescape(m.group(1).strip())
+    category = doc['meta'].get('property:article:section') or doc['meta'].get('name:category')
+    if category:
+        return category
     
     # Chercher dans l'URL ou le titre (ex: "BSV Viticulture...")
-    if 'viticulture' in url.lower() or 'viticulture' in html_text[:2000].lower():
+    if 'viticulture' in url.lower() or 'viticulture' in doc['head']:
         return 'Viticulture'
-    if 'grandes cultures' in html_text[:2000].lower():
+    if 'grandes cultures' in doc['head']:
         return 'Grandes Cultures'
     
     return None
 
 
-def extract_author(html_text, url=''):
+def extract_author(html_text, url='', doc=None):
     """Extrait l'auteur ou l'organisme (ex: DRAAF)."""
-    m = re.search(r"<meta[^>]+name=[\"']author[\"'][^>]*content=[\"'](.*?)[\"']", html_text, re.I)
-    if m:
-        return html.unescape(m.group(1).strip())
+    doc = doc or scan_document(html_text)
+    author = doc['meta'].get('name:author')
+    if author:
+        return author
     
     # Détecter "DRAAF" dans le contenu ou l'URL
     if 'draaf' in url.lower():
@@ -203,6 +287,8 @@ def make_rss(channel_title, channel_link, channel_desc, items):
     ET.SubElement(channel, 'link').text = channel_link
     ET.SubElement(channel, 'description').text = channel_desc
     ET.SubElement(channel, 'lastBuildDate').text = email.utils.formatdate(time.time(), usegmt=True)
+    # ttl / skipDays / skipHours d'après les publications (voir feed_hints)
+    add_hints(channel, items)
 
     for it in items:
         item = ET.SubElement(channel, 'item')
@@ -232,13 +318,30 @@ def safe_filename(name):
     return name
 
 
-def process_single(url, outname=None):
+def process_single(url, outname=None, formats=None, page_cache=None, outdir=None,
+                   write_only=False):
+    """
+    Génère le flux d'une URL.
+
+    page_cache (dict optionnel, partagé sur un lot) : pages déjà téléchargées
+    par URL canonique, pour ne récupérer qu'une fois une même page listée
+    plusieurs fois.
+    outdir : dossier de sortie (par défaut liste_des_flux/ à côté du script).
+    write_only : fichiers du flux seulement, sans delta, index, archive
+    Parquet ni notification (voir feed_publish.publish_feed).
+    """
     if not url:
         return False, 'URL vide'
     if not urlparse(url).scheme:
         url = 'http://' + url
+    key = canonical_url(url)
     try:
-        page = fetch(url)
+        if page_cache is not None and key in page_cache:
+            page = page_cache[key]
+        else:
+            page = fetch(url)
+            if page_cache is not None:
+                page_cache[key] = page
     except urllib.error.HTTPError as e:
         return False, f'HTTP {e.code} {e.reason}'
     except urllib.error.URLError as e:
@@ -246,17 +349,20 @@ def process_single(url, outname=None):
     except Exception as e:
         return False, str(e)
 
-    title = extract_title(page) or url
-    desc = extract_description(page) or title
+    # Un seul passage sur la page pour toutes les métadonnées
+    doc = scan_document(page)
+    title = extract_title(page, doc) or url
+    desc = extract_description(page, doc) or title
     
     # Extraire la date de publication (ou utiliser la date actuelle si non trouvée)
-    pubDate = extract_pub_date(page, url)
-    if not pubDate:
+    pubDate = extract_pub_date(page, url, doc)
+    undated = not pubDate
+    if undated:
         pubDate = email.utils.formatdate(time.time(), usegmt=True)
     
     # Extraire des infos supplémentaires
-    category = extract_category(page, url)
-    author = extract_author(page, url)
+    category = extract_category(page, url, doc)
+    author = extract_author(page, url, doc)
     
     # Générer un GUID unique basé sur l'URL
     guid = md5(url.encode('utf-8')).hexdigest()
@@ -270,6 +376,9 @@ def process_single(url, outname=None):
         'author': author,
         'guid': guid
     }]
+    if undated:
+        # Date de repli (voir dedupe.py)
+        items[0]['undated'] = True
 
     if not outname:
         # construire un nom de fichier depuis le domaine
@@ -277,8 +386,9 @@ def process_single(url, outname=None):
         dom = parsed.netloc or 'feed'
         outname = dom
     # créer le dossier de sortie `liste_des_flux` à côté du script
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    outdir = os.path.join(base_dir, 'liste_des_flux')
+    if outdir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        outdir = os.path.join(base_dir, 'liste_des_flux')
     try:
         os.makedirs(outdir, exist_ok=True)
     except Exception:
@@ -288,10 +398,13 @@ def process_single(url, outname=None):
     outname = safe_filename(outname)
     outname = os.path.join(outdir, outname)
 
+    # Bulletin déjà publié par un autre flux : même guid (voir dedupe.py)
+    items, _ = dedupe_items(os.path.basename(outname), items)
+
     rss_bytes = make_rss(title, url, desc, items)
     try:
-        with open(outname, 'wb') as f:
-            f.write(rss_bytes)
+        publish_feed(outname, rss_bytes, items, title, url, desc, formats=formats,
+                     write_only=write_only)
     except Exception as e:
         return False, f'Impossible d\'ecrire {outname}: {e}'
 
@@ -307,7 +420,8 @@ def read_csv(path):
                 continue
             url = r[0].strip() if len(r) > 0 else ''
             name = r[1].strip() if len(r) > 1 else ''
-            rows.append((url, name))
+            formats = parse_formats(r[2] if len(r) > 2 else '')
+            rows.append((url, name, formats))
     return rows
 
 
@@ -322,15 +436,21 @@ def read_xlsx(path):
             continue
         url = (row[0] or '').strip() if len(row) > 0 else ''
         name = (row[1] or '').strip() if len(row) > 1 else ''
-        rows.append((url, name))
+        formats = parse_formats(row[2] if len(row) > 2 else '')
+        rows.append((url, name, formats))
     return rows
 
 
 def main():
     # Accept an optional command-line argument: path to .xlsx/.csv list file.
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    profile = 'profile' in options
+    # --record / --replay : instantanés des pages (voir snapshot_archive.py)
+    snapshot_archive.configure(options)
     listpath = None
-    if len(sys.argv) > 1:
-        listpath = sys.argv[1]
+    if args:
+        listpath = args[0]
     else:
         try:
             listpath = input("Chemin vers fichier .xlsx/.csv (laisser vide pour URL unique) : ").strip()
@@ -366,15 +486,22 @@ def main():
             print('Aucune URL fournie. Fin.')
             sys.exit(1)
         outname = input("Nom du fichier de sortie (par défaut 'feed.xml'): ").strip() or 'feed.xml'
-        tasks = [(url, outname)]
+        tasks = [(url, outname, parse_formats(''))]
 
     summary = {'ok': [], 'failed': []}
-    for i, (url, name) in enumerate(tasks, start=1):
+    page_cache = {}
+    if profile:
+        clear_profiles()
+    for i, (url, name, formats) in enumerate(tasks, start=1):
         if not url:
             summary['failed'].append((i, url, 'URL vide'))
             continue
         try:
-            ok, info = process_single(url, name)
+            if profile:
+                ok, info = run_profiled(name or urlparse(url).netloc or f'flux_{i}',
+                                        process_single, url, name, formats, page_cache)
+            else:
+                ok, info = process_single(url, name, formats, page_cache)
             if ok:
                 summary['ok'].append((i, url, info))
                 print(f'[{i}] OK -> {info}')
@@ -393,6 +520,8 @@ def main():
         print('Détails des échecs:')
         for f in summary['failed']:
             print(' ', f)
+    if profile:
+        print_summary()
 
 
 if __name__ == '__main__':
@@ -7,6 +7,11 @@ Usage:
     python create_rss_from_index.py
     Ou:
     python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie>
+    python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie> --paginate [--max-pages=50]
+    python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie> --formats=atom,json
+    python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie> --no-cache
+    python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie> --max-items=100
+    python create_rss_from_index.py <URL_page_index> <nom_fichier_sortie> --record | --replay[=AAAA-MM-JJ]
 """
 
 import sys
@@ -22,22 +27,41 @@ import time
 import email.utils
 from hashlib import md5
 
+from feed_io import load_feed_items, merge_items
+from feed_formats import parse_formats
+from feed_publish import publish_feed
+from dedupe import dedupe_items
+import extraction_cache
+from feed_archive import archive_items, add_archive_link
+from feed_hints import add_hints
+import snapshot_archive
+from profiling import run_profiled, clear_profiles, print_summary
+
 
 def fetch(url, timeout=15):
     """Récupère le contenu HTML d'une URL."""
+    if snapshot_archive.replaying():
+        return snapshot_archive.replay_text(url)
     headers = {'User-Agent': 'Mozilla/5.0 (python)'}
     req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
+    try:
+        resp = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        snapshot_archive.record(url, e.code, e.reason, e.headers.items(), e.read())
+        raise
+    with resp:
         charset = None
         try:
             charset = resp.headers.get_content_charset()
         except Exception:
             charset = None
         data = resp.read()
+        snapshot_archive.record(url, resp.status, resp.reason, resp.headers.items(), data)
         charset = charset or 'utf-8'
         return data.decode(charset, errors='replace')
 
 
+
 def parse_french_date(day, month_fr, year):
     """Convertit une date française (22 juillet 2025) en format RFC 822."""
     months_fr = {
@@ -94,6 +118,7 @@ def extract_bulletins_from_index(html_text, base_url):
         date_match = re.search(r'\bdu\s+(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})', 
                               clean_title, re.I)
         
+        undated = False
         if date_match:
             day, month_fr, year = date_match.groups()
             pub_date = parse_french_date(day, month_fr, year)
@@ -112,16 +137,26 @@ def extract_bulletins_from_index(html_text, base_url):
                     pub_date = parse_french_date(day, month_fr, year)
                 else:
                     pub_date = email.utils.formatdate(time.time(), usegmt=True)
+                    undated = True
             else:
                 pub_date = email.utils.formatdate(time.time(), usegmt=True)
+                undated = True
+        if not pub_date:
+            # Date trouvée mais invalide (« 31 février ») : date de repli
+            pub_date = email.utils.formatdate(time.time(), usegmt=True)
+            undated = True
         
-        bulletins.append({
+        bulletin = {
             'title': clean_title,
             'link': full_url,
             'description': clean_title,
             'pubDate': pub_date,
             'guid': md5(full_url.encode('utf-8')).hexdigest()
-        })
+        }
+        if undated:
+            # Date de repli (voir dedupe.py)
+            bulletin['undated'] = True
+        bulletins.append(bulletin)
     
     # Trier par date (plus récent en premier)
     if bulletins:
@@ -130,6 +165,88 @@ def extract_bulletins_from_index(html_text, base_url):
     return bulletins
 
 
+def find_next_page_url(html_text, base_url):
+    """
+    Cherche le lien vers la page suivante d'une liste paginée.
+    Essaie rel="next", un lien « suivant », puis le lien qui suit la page
+    courante d'une pagination SPIP (<strong class="on">1</strong> <a>2</a>).
+    Retourne l'URL absolue ou None.
+    """
+    patterns = [
+        r'<(?:link|a)[^>]+rel=["\']next["\'][^>]*href=["\']([^"\']+)["\']',
+        r'<(?:link|a)[^>]+href=["\']([^"\']+)["\'][^>]*rel=["\']next["\']',
+        r'<a[^>]+href=["\']([^"\']+)["\'][^>]*>\s*(?:page\s+)?suivante?\s*(?:&raquo;|»|&gt;)?\s*</a>',
+        r'<a[^>]+href=["\']([^"\']+)["\'][^>]*class=["\'][^"\']*(?:suivant|next)[^"\']*["\']',
+        # Limité au bloc de pagination : ni la recherche de la page courante
+        # ni celle du lien suivant ne franchissent un </p>, </div>, </nav> ou </ul>
+        r'class=["\'][^"\']*\bpagination\b[^"\']*["\'][^>]*>'
+        r'[^<]*(?:<(?!/(?:p|div|nav|ul)\b)[^<]*)*?'
+        r'<[^>]+class=["\']on["\'][^>]*>[^<]*</\w+>'
+        r'[^<]*(?:<(?!a\b|/(?:p|div|nav|ul)\b)[^>]*>[^<]*)*<a[^>]+href=["\']([^"\']+)["\']',
+    ]
+    for pat in patterns:
+        m = re.search(pat, html_text, re.I | re.S)
+        if m:
+            return urljoin(base_url, html.unescape(m.group(1)))
+    return None
+
+
+def crawl_paginated(index_url, known_guids=frozenset(), max_pages=50, known_links=frozenset()):
+    """
+    Parcourt une liste paginée en suivant les liens « page suivante » et
+    s'arrête dès qu'une page contient un bulletin déjà connu (par son guid,
+    ou par son lien : dedupe.py remplace le guid des doublons d'autres flux).
+    Retourne (html de la première page, nouveaux bulletins, nombre de pages lues).
+    """
+    first_html = None
+    bulletins = []
+    seen_guids = set()
+    seen_pages = set()
+    url = index_url
+    
+    while url and url not in seen_pages and len(seen_pages) < max_pages:
+        seen_pages.add(url)
+        html_text = fetch(url)
+        if first_html is None:
+            first_html = html_text
+        
+        reached_known = False
+        for bull in extract_bulletins_from_index(html_text, url):
+            if bull['guid'] in known_guids or bull['link'] in known_links:
+                reached_known = True
+            elif bull['guid'] not in seen_guids:
+                seen_guids.add(bull['guid'])
+                bulletins.append(bull)
+        
+        if reached_known:
+            break
+        url = find_next_page_url(html_text, url)
+    
+    return first_html, bulletins, len(seen_pages)
+
+
+def output_path_for(index_url, output_filename=None):
+    """Détermine le chemin du fichier de sortie dans liste_des_flux/."""
+    if not output_filename:
+        # Extraire un nom depuis l'URL
+        parsed = urlparse(index_url)
+        path_parts = [p for p in parsed.path.split('/') if p]
+        if path_parts:
+            output_filename = path_parts[-1].replace('.html', '') + '.xml'
+        else:
+            output_filename = 'bulletins.xml'
+    
+    if not output_filename.endswith('.xml'):
+        output_filename += '.xml'
+    
+    # Créer le dossier de sortie
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    outdir = os.path.join(base_dir, 'liste_des_flux')
+    os.makedirs(outdir, exist_ok=True)
+    
+    return os.path.join(outdir, output_filename)
+
+
 def extract_page_info(html_text, url):
     """Extrait le titre et la description de la page index."""
     # Titre
@@ -143,14 +260,20 @@ def extract_page_info(html_text, url):
     return title, description
 
 
-def make_rss(channel_title, channel_link, channel_desc, items, author=None, category=None):
-    """Génère le XML RSS avec tous les items."""
+def make_rss(channel_title, channel_link, channel_desc, items, author=None, category=None,
+             prev_archive=None):
+    """Génère le XML RSS avec tous les items (prev_archive : voir feed_archive)."""
     rss = ET.Element('rss', version='2.0')
     channel = ET.SubElement(rss, 'channel')
     ET.SubElement(channel, 'title').text = channel_title
     ET.SubElement(channel, 'link').text = channel_link
     ET.SubElement(channel, 'description').text = channel_desc
     ET.SubElement(channel, 'lastBuildDate').text = email.utils.formatdate(time.time(), usegmt=True)
+    # ttl / skipDays / skipHours d'après les publications (voir feed_hints)
+    add_hints(channel, items)
+    
+    if prev_archive:
+        add_archive_link(channel, 'prev-archive', prev_archive)
     
     if category:
         ET.SubElement(channel, 'category').text = category
@@ -174,26 +297,66 @@ def make_rss(channel_title, channel_link, channel_desc, items, author=None, cate
     return ET.tostring(rss, encoding='utf-8', xml_declaration=True)
 
 
-def process_index_page(index_url, output_filename=None):
+def process_index_page(index_url, output_filename=None, paginate=False, max_pages=50,
+                       formats=None, use_cache=True, max_items=None):
     """
     Traite une page index et génère un flux RSS complet.
+    En mode paginé, suit les pages suivantes jusqu'au premier bulletin déjà
+    présent dans le flux précédent et conserve les anciens items.
+    `formats` liste les sorties supplémentaires (ex: ['atom', 'json']).
+    Avec `use_cache`, une page identique au dernier passage n'est pas
+    réanalysée (voir extraction_cache.py).
+    Au-delà de `max_items` bulletins, les plus anciens sont archivés (voir
+    feed_archive.py).
     Retourne (success: bool, message: str)
     """
     print(f"📥 Récupération de la page: {index_url}")
+    output_path = output_path_for(index_url, output_filename)
     
-    try:
-        html_content = fetch(index_url)
-    except Exception as e:
-        return False, f"Erreur lors de la récupération: {e}"
-    
-    print(f"✅ Page récupérée ({len(html_content)} caractères)")
+    if paginate:
+        previous = load_feed_items(output_path)
+        try:
+            html_content, bulletins, pages = crawl_paginated(
+                index_url, {it['guid'] for it in previous}, max_pages,
+                {it['link'] for it in previous if it.get('link')})
+        except Exception as e:
+            return False, f"Erreur lors de la récupération: {e}"
+        print(f"✅ {pages} page(s) récupérée(s), {len(bulletins)} nouveau(x) bulletin(s)")
+        bulletins = merge_items(bulletins, previous)
+    else:
+        try:
+            html_content = fetch(index_url)
+        except Exception as e:
+            return False, f"Erreur lors de la récupération: {e}"
+        
+        print(f"✅ Page récupérée ({len(html_content)} caractères)")
     
-    # Extraire les informations de la page
-    channel_title, channel_desc = extract_page_info(html_content, index_url)
+    # Entrée distincte de celle de create_rss_robust.py pour la même URL
+    cache_key = 'index:' + index_url
+    cached = digest = None
+    if use_cache and not paginate:
+        digest = extraction_cache.content_digest(html_content)
+        cached = extraction_cache.lookup(cache_key, digest)
+    if cached is not None:
+        print("♻️  Page inchangée : bulletins repris du cache d'extraction")
+        # Mêmes options et mêmes indications qu'à la dernière écriture
+        if (cached.get('outputs') == extraction_cache.output_signature(
+                cached['bulletins'], formats, max_items)
+                and extraction_cache.outputs_exist(output_path, formats)):
+            print(f"💾 Flux RSS inchangé: {output_path}")
+            return True, output_path
+        bulletins = cached['bulletins']
+        channel_title, channel_desc = cached['channel_title'], cached['channel_desc']
+    else:
+        if not paginate:
+            # Extraire tous les bulletins
+            bulletins = extract_bulletins_from_index(html_content, index_url)
+        
+        # Extraire les informations de la page
+        channel_title, channel_desc = extract_page_info(html_content, index_url)
+    extracted = {'bulletins': bulletins, 'channel_title': channel_title,
+                 'channel_desc': channel_desc}
     print(f"📋 Titre: {channel_title}")
-    
-    # Extraire tous les bulletins
-    bulletins = extract_bulletins_from_index(html_content, index_url)
     print(f"📰 {len(bulletins)} bulletin(s) trouvé(s)")
     
     if not bulletins:
@@ -217,32 +380,26 @@ def process_index_page(index_url, output_filename=None):
     if 'draaf' in index_url.lower():
         author = 'DRAAF Auvergne-Rhône-Alpes'
     
-    # Générer le RSS
-    rss_content = make_rss(channel_title, index_url, channel_desc, bulletins, author, category)
-    
-    # Déterminer le nom du fichier de sortie
-    if not output_filename:
-        # Extraire un nom depuis l'URL
-        parsed = urlparse(index_url)
-        path_parts = [p for p in parsed.path.split('/') if p]
-        if path_parts:
-            output_filename = path_parts[-1].replace('.html', '') + '.xml'
-        else:
-            output_filename = 'bulletins.xml'
-    
-    if not output_filename.endswith('.xml'):
-        output_filename += '.xml'
+    # Bulletins déjà publiés par un autre flux : même guid (voir dedupe.py)
+    bulletins, duplicates = dedupe_items(os.path.basename(output_path), bulletins)
+    if duplicates:
+        print(f"🔁 {duplicates} bulletin(s) déjà présent(s) dans un autre flux")
     
-    # Créer le dossier de sortie
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    outdir = os.path.join(base_dir, 'liste_des_flux')
-    os.makedirs(outdir, exist_ok=True)
+    # Limiter la taille du flux : les plus anciens vont dans les archives
+    bulletins, prev_archive = archive_items(output_path, bulletins, max_items, channel_title,
+                                            index_url, channel_desc, category, author)
     
-    output_path = os.path.join(outdir, output_filename)
+    # Générer le RSS
+    rss_content = make_rss(channel_title, index_url, channel_desc, bulletins, author, category,
+                           prev_archive)
     
-    # Écrire le fichier
-    with open(output_path, 'wb') as f:
-        f.write(rss_content)
+    # Écrire le fichier (variantes .gz/.br, autres formats, delta)
+    publish_feed(output_path, rss_content, bulletins, channel_title, index_url,
+                 channel_desc, category, author, formats)
+    if digest is not None:
+        # Après l'écriture : un flux non écrit n'est jamais considéré à jour
+        extraction_cache.store(cache_key, digest, dict(extracted, outputs=extraction_cache.output_signature(
+            extracted['bulletins'], formats, max_items)))
     
     print(f"💾 Flux RSS généré: {output_path}")
     return True, output_path
@@ -255,10 +412,15 @@ def main():
     print("=" * 70)
     print()
     
-    # Récupérer l'URL et le nom de fichier
-    if len(sys.argv) >= 2:
-        index_url = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) >= 3 else None
+    # Récupérer l'URL et le nom de fichier (les options --xxx sont à part)
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    # --record / --replay : instantanés des pages (voir snapshot_archive.py)
+    snapshot_archive.configure(options)
+    
+    if len(args) >= 1:
+        index_url = args[0]
+        output_file = args[1] if len(args) >= 2 else None
     else:
         try:
             index_url = input("URL de la page index (liste des bulletins): ").strip()
@@ -276,8 +438,19 @@ def main():
     if not urlparse(index_url).scheme:
         index_url = 'https://' + index_url
     
-    # Traiter la page
-    success, message = process_index_page(index_url, output_file)
+    # Traiter la page (sous profilage avec --profile, voir profiling.py)
+    kwargs = dict(paginate='paginate' in options,
+                  max_pages=int(options.get('max-pages') or 50),
+                  formats=parse_formats(options.get('formats')),
+                  use_cache='no-cache' not in options and 'replay' not in options,
+                  max_items=int(options['max-items']) if options.get('max-items') else None)
+    if 'profile' in options:
+        clear_profiles()
+        success, message = run_profiled(output_path_for(index_url, output_file),
+                                        process_index_page, index_url, output_file, **kwargs)
+        print_summary()
+    else:
+        success, message = process_index_page(index_url, output_file, **kwargs)
     
     print()
     if success:
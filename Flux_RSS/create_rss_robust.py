@@ -6,20 +6,48 @@ Fonctionne quelle que soit la structure HTML de la page.
 Usage:
     python create_rss_robust.py
     python create_rss_robust.py <URL_page_index> <nom_fichier_sortie>
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --paginate [--max-pages=50]
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --formats=atom,json
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --streaming
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --no-cache
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --max-items=100
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --tiered    (regex d'abord, BeautifulSoup en repli ; aussi avec --pipeline)
+    python create_rss_robust.py <URL_page_index> <nom_fichier_sortie> --record | --replay[=AAAA-MM-JJ]
+    python create_rss_robust.py --pipeline <liste.xlsx|liste.csv> [--fetchers=4] [--parsers=N]
+    (--profile dans tous les modes : profils cProfile/tracemalloc, voir profiling.py ;
+     --record / --replay dans tous les modes : instantanés des pages, voir snapshot_archive.py)
 """
 
 import sys
 import os
 import re
+import json
+import codecs
 import time
 import email.utils
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future
 from datetime import datetime
 from hashlib import md5
 from urllib.parse import urljoin, urlparse
 import xml.etree.ElementTree as ET
 
+from feed_io import load_feed_items, merge_items, write_atomic
+from feed_formats import parse_formats
+from feed_publish import publish_feed
+from dedupe import dedupe_items
+from site_profiles import find_profile, profiles_signature
+from feed_archive import archive_items, add_archive_link
+from feed_hints import add_hints
+import extraction_cache
+import snapshot_archive
+from create_rss_from_index import extract_bulletins_from_index
+from profiling import run_profiled, clear_profiles, print_summary
+
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
+    from lxml import etree
     import requests
     _HAS_LIBS = True
 except ImportError:
@@ -29,13 +57,37 @@ except ImportError:
     sys.exit(1)
 
 
+# Seules balises lues pour les métadonnées du canal (titre, description, auteur)
+METADATA_TAGS = SoupStrainer(['title', 'meta'])
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def _replayed_response(url):
+    """Réponse requests reconstituée depuis les instantanés (voir snapshot_archive.py)."""
+    snapshot = snapshot_archive.load(url)
+    response = requests.Response()
+    response.url = url
+    response.status_code = snapshot['status']
+    response.reason = snapshot['reason']
+    response.headers.update(snapshot['headers'])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = snapshot['body']
+    response._content_consumed = True
+    return response
+
+
 def fetch_page(url, timeout=15):
-    """Récupère une page web avec requests."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
+    """Récupère une page web avec requests (ou depuis les instantanés en --replay)."""
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        if snapshot_archive.replaying():
+            response = _replayed_response(url)
+        else:
+            response = requests.get(url, headers=REQUEST_HEADERS, timeout=timeout)
+            snapshot_archive.record(url, response.status_code, response.reason,
+                                    response.headers, response.content)
         response.raise_for_status()
         response.encoding = response.apparent_encoding or 'utf-8'
         return response.text
@@ -114,22 +166,24 @@ def parse_date_from_multiple_sources(link_tag, context_text=''):
     return None
 
 
-def extract_bulletins_smart(html_content, base_url, keywords=None):
-    """
-    Extrait intelligemment les bulletins d'une page HTML.
-    
-    Args:
-        html_content: Contenu HTML de la page
-        base_url: URL de base pour construire les liens absolus
-        keywords: Liste de mots-clés à rechercher (ex: ['bsv', 'bulletin'])
-    
-    Returns:
-        Liste de dict avec title, link, description, pubDate, guid
-    """
-    if keywords is None:
-        keywords = ['bsv', 'bulletin']
-    
-    soup = BeautifulSoup(html_content, 'lxml')
+# Textes de liens de navigation/système
+SKIP_LINK_TEXTS = ('accéder', 'menu', 'recherche', 'footer', 'partager',
+                   'imprimer', 'télécharger', 'retour', 'suivant', 'précédent')
+
+
+def is_bulletin_link(text, href, keywords):
+    """Un lien est un bulletin si son texte ou son URL contient un mot-clé."""
+    text_lower = text.lower()
+    if not any(k.lower() in text_lower or k.lower() in href.lower() for k in keywords):
+        return False
+    # Filtrer les liens de navigation/système
+    if len(text) < 10:
+        return False
+    return not any(skip in text_lower for skip in SKIP_LINK_TEXTS)
+
+
+def extract_links_heuristic(soup, base_url, keywords):
+    """Bulletins repérés parmi tous les liens de la page par mots-clés (ordre du document)."""
     bulletins = []
     seen_urls = set()
     
@@ -138,25 +192,7 @@ def extract_bulletins_smart(html_content, base_url, keywords=None):
         href = link_tag['href']
         text = link_tag.get_text(strip=True)
         
-        # Filtrer : garder seulement les liens pertinents
-        is_relevant = False
-        
-        # Vérifier si le texte ou l'URL contient un mot-clé
-        for keyword in keywords:
-            if keyword.lower() in text.lower() or keyword.lower() in href.lower():
-                is_relevant = True
-                break
-        
-        if not is_relevant:
-            continue
-        
-        # Filtrer les liens de navigation/système
-        if len(text) < 10:
-            continue
-        
-        skip_keywords = ['accéder', 'menu', 'recherche', 'footer', 'partager', 
-                        'imprimer', 'télécharger', 'retour', 'suivant', 'précédent']
-        if any(skip in text.lower() for skip in skip_keywords):
+        if not is_bulletin_link(text, href, keywords):
             continue
         
         # Construire l'URL absolue
@@ -169,18 +205,214 @@ def extract_bulletins_smart(html_content, base_url, keywords=None):
         
         # Extraire la date
         pub_date = parse_date_from_multiple_sources(link_tag)
-        if not pub_date:
+        undated = not pub_date
+        if undated:
             # Par défaut : date actuelle
             pub_date = email.utils.formatdate(time.time(), usegmt=True)
         
         # Créer le bulletin
-        bulletins.append({
+        bulletin = {
             'title': text,
             'link': full_url,
             'description': text,
             'pubDate': pub_date,
             'guid': md5(full_url.encode('utf-8')).hexdigest()
-        })
+        }
+        if undated:
+            # Date de repli (voir dedupe.py)
+            bulletin['undated'] = True
+        bulletins.append(bulletin)
+    
+    return bulletins
+
+
+def _profile_date(link_tag, container, date_selector):
+    """Date du bloc d'un lien : le lien lui-même, puis jusqu'à deux parents dans le conteneur."""
+    node = link_tag
+    for _ in range(3):
+        date_tag = node if date_selector.match(node) else date_selector.select_one(node)
+        if date_tag is not None:
+            if date_tag.get('datetime'):
+                try:
+                    dt = datetime.fromisoformat(date_tag['datetime'].replace('Z', '+00:00'))
+                    return email.utils.formatdate(dt.timestamp(), usegmt=True)
+                except ValueError:
+                    pass
+            timestamp = parse_french_date(date_tag.get_text(' ', strip=True))
+            if timestamp:
+                return email.utils.formatdate(timestamp, usegmt=True)
+        if node is container or node.parent is None:
+            break
+        node = node.parent
+    return None
+
+
+def extract_bulletins_with_profile(soup, base_url, profile, containers=None):
+    """
+    Bulletins trouvés avec un profil de site (voir site_profiles.py) : seuls
+    les liens du sous-arbre `container` sont examinés.
+
+    Args:
+        containers: conteneurs déjà repérés (analyse restreinte, voir
+            _container_subtrees) ; par défaut le sélecteur est appliqué à soup
+    """
+    bulletins = []
+    seen_urls = set()
+    if containers is None:
+        containers = profile['container'].select(soup)
+    for container in containers:
+        for link_tag in profile['link'].select(container):
+            href = link_tag.get('href')
+            text = link_tag.get_text(strip=True)
+            if not href or not text:
+                continue
+            full_url = urljoin(base_url, href)
+            if full_url in seen_urls:
+                continue
+            seen_urls.add(full_url)
+            
+            pub_date = None
+            if profile['date'] is not None:
+                pub_date = _profile_date(link_tag, container, profile['date'])
+            if not pub_date:
+                pub_date = parse_date_from_multiple_sources(link_tag)
+            undated = not pub_date
+            if undated:
+                pub_date = email.utils.formatdate(time.time(), usegmt=True)
+            
+            bulletin = {
+                'title': text,
+                'link': full_url,
+                'description': text,
+                'pubDate': pub_date,
+                'guid': md5(full_url.encode('utf-8')).hexdigest()
+            }
+            if undated:
+                bulletin['undated'] = True
+            bulletins.append(bulletin)
+    return bulletins
+
+
+def _link_subtrees(html_content, keywords):
+    """
+    HTML réduit aux sous-arbres utiles à l'heuristique : le parent de chaque
+    lien susceptible d'être un bulletin, avec tout son contenu (balise
+    <time>, texte de contexte des dates).
+
+    La page est d'abord lue par lxml (arbre en C, bien plus compact que
+    celui de BeautifulSoup) ; seuls ces fragments, dans l'ordre du document,
+    sont ensuite analysés par BeautifulSoup. Le filtre est plus large que
+    is_bulletin_link (mot-clé seulement, espaces ignorés dans le texte) pour
+    ne perdre aucun lien retenu par l'analyse complète.
+
+    Returns:
+        Le HTML réduit, ou None si un lien a pour parent <body> ou <html>
+        (l'analyse complète est alors nécessaire)
+    """
+    try:
+        root = etree.HTML(html_content)
+    except (ValueError, etree.LxmlError):
+        return None
+    if root is None:
+        return ''
+    keywords = [k.lower() for k in keywords]
+    compact_keywords = [''.join(k.split()) for k in keywords]
+
+    parents = {}
+    for link_tag in root.iter('a'):
+        href = link_tag.get('href')
+        if href is None:
+            continue
+        href = href.lower()
+        text = ''.join(''.join(link_tag.itertext()).lower().split())
+        if not any(k in href for k in keywords) and not any(k in text for k in compact_keywords):
+            continue
+        parent = link_tag.getparent()
+        if parent is None or parent.tag in ('body', 'html'):
+            return None
+        parents[parent] = None
+
+    # Un parent inclus dans un autre est déjà dans son fragment
+    kept = set(parents)
+    fragments = [
+        etree.tostring(parent, method='html', encoding='unicode', with_tail=False)
+        for parent in parents
+        if not any(ancestor in kept for ancestor in parent.iterancestors())
+    ]
+    return f"<html><body>{''.join(fragments)}</body></html>"
+
+
+def _container_subtrees(html_content, profile):
+    """
+    HTML réduit aux conteneurs du profil (les plus externes, dans l'ordre du
+    document), repérés dans l'arbre lxml avec le sélecteur traduit par
+    cssselect.
+
+    Returns:
+        Le HTML réduit, ou None si le sélecteur n'a pas de version lxml
+        (l'analyse complète est alors nécessaire)
+    """
+    if profile.get('container_lxml') is None:
+        return None
+    try:
+        root = etree.HTML(html_content)
+    except (ValueError, etree.LxmlError):
+        return None
+    if root is None:
+        return ''
+    matched = profile['container_lxml'](root)
+    kept = set(matched)
+    fragments = [
+        etree.tostring(container, method='html', encoding='unicode', with_tail=False)
+        for container in matched
+        if not any(ancestor in kept for ancestor in container.iterancestors())
+    ]
+    return f"<html><body>{''.join(fragments)}</body></html>"
+
+
+def extract_bulletins_smart(html_content, base_url, keywords=None, restricted=True):
+    """
+    Extrait intelligemment les bulletins d'une page HTML.
+    
+    Utilise le profil du site s'il en existe un (site_profiles.py), sinon
+    (ou si le profil ne trouve rien) l'heuristique par mots-clés.
+    
+    Args:
+        html_content: Contenu HTML de la page
+        base_url: URL de base pour construire les liens absolus
+        keywords: Liste de mots-clés à rechercher (ex: ['bsv', 'bulletin'])
+        restricted: N'analyser avec BeautifulSoup que les conteneurs du
+            profil (voir _container_subtrees) ou, sans profil, les
+            sous-arbres des liens candidats (voir _link_subtrees) : mêmes
+            bulletins, beaucoup moins de mémoire sur les grandes pages
+    
+    Returns:
+        Liste de dict avec title, link, description, pubDate, guid
+    """
+    if keywords is None:
+        keywords = ['bsv', 'bulletin']
+    
+    bulletins = []
+    soup = None
+    profile = find_profile(base_url)
+    if profile is not None:
+        subtrees = _container_subtrees(html_content, profile) if restricted else None
+        if subtrees is None:
+            # Les sélecteurs du profil portent sur toute la page
+            soup = BeautifulSoup(html_content, 'lxml')
+            bulletins = extract_bulletins_with_profile(soup, base_url, profile)
+        else:
+            # Chaque fragment de premier niveau est un conteneur
+            reduced = BeautifulSoup(subtrees, 'lxml')
+            containers = reduced.body.find_all(recursive=False) if reduced.body else []
+            bulletins = extract_bulletins_with_profile(reduced, base_url, profile, containers)
+        if not bulletins:
+            print(f"⚠️  Profil « {profile['name']} » sans résultat, heuristique utilisée")
+    if not bulletins:
+        if soup is None:
+            subtrees = _link_subtrees(html_content, keywords) if restricted else None
+            soup = BeautifulSoup(html_content if subtrees is None else subtrees, 'lxml')
+        bulletins = extract_links_heuristic(soup, base_url, keywords)
     
     # Trier par date (plus récent en premier)
     bulletins.sort(
@@ -193,7 +425,7 @@ def extract_bulletins_smart(html_content, base_url, keywords=None):
 
 def extract_page_metadata(html_content, url):
     """Extrait le titre et la description de la page."""
-    soup = BeautifulSoup(html_content, 'lxml')
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=METADATA_TAGS)
     
     # Titre
     title = None
@@ -242,7 +474,7 @@ def detect_category(html_content, url):
 
 def detect_author(html_content, url):
     """Détecte l'auteur ou l'organisme."""
-    soup = BeautifulSoup(html_content, 'lxml')
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=METADATA_TAGS)
     
     # Chercher dans les métadonnées
     author_tag = soup.find('meta', attrs={'name': 'author'})
@@ -261,8 +493,8 @@ def detect_author(html_content, url):
 
 
 def generate_rss(channel_title, channel_link, channel_desc, items, 
-                 category=None, author=None):
-    """Génère le XML RSS."""
+                 category=None, author=None, prev_archive=None):
+    """Génère le XML RSS (prev_archive : page d'archives, voir feed_archive)."""
     rss = ET.Element('rss', version='2.0')
     channel = ET.SubElement(rss, 'channel')
     
@@ -272,6 +504,11 @@ def generate_rss(channel_title, channel_link, channel_desc, items,
     ET.SubElement(channel, 'lastBuildDate').text = email.utils.formatdate(
         time.time(), usegmt=True
     )
+    # ttl / skipDays / skipHours d'après les publications (voir feed_hints)
+    add_hints(channel, items)
+    
+    if prev_archive:
+        add_archive_link(channel, 'prev-archive', prev_archive)
     
     if category:
         ET.SubElement(channel, 'category').text = category
@@ -293,7 +530,437 @@ def generate_rss(channel_title, channel_link, channel_desc, items,
     return ET.tostring(rss, encoding='utf-8', xml_declaration=True)
 
 
-def process_page_to_rss(page_url, output_filename=None, keywords=None):
+# Mode --tiered : le résultat des regex de create_rss_from_index.py est gardé
+# s'il a au moins TIER_MIN_ITEMS bulletins, au moins TIER_MIN_SHARE des liens
+# candidats de la page et au plus TIER_MAX_UNDATED bulletins sans date
+TIER_MIN_ITEMS = 3
+TIER_MIN_SHARE = 0.8
+TIER_MAX_UNDATED = 0.2
+DEFAULT_KEYWORDS = ['bsv', 'bulletin']
+_ANCHOR_RE = re.compile(r'<a\b[^>]*?\bhref=["\']([^"\']+)["\'][^>]*>([^<]*)</a>', re.I)
+
+
+def _candidate_links(html_content, keywords):
+    """Liens en texte simple retenus par l'heuristique (estimation par regex)."""
+    hrefs = set()
+    for href, text in _ANCHOR_RE.findall(html_content):
+        text = text.strip()
+        if is_bulletin_link(text, href, keywords):
+            hrefs.add(href)
+    return len(hrefs)
+
+
+def extract_bulletins_tiered(html_content, base_url, keywords=None):
+    """
+    Extraction à deux niveaux : les regex de extract_bulletins_from_index
+    d'abord (rapides), extract_bulletins_smart (BeautifulSoup) seulement si
+    leur résultat semble incomplet (trop peu de bulletins, trop de bulletins
+    sans date). Les sites avec profil et les mots-clés autres que ceux par
+    défaut passent directement par BeautifulSoup (les regex ne cherchent que
+    « BSV »).
+
+    Returns:
+        (bulletins, niveau) avec niveau 'regex' ou 'soup'
+    """
+    if (keywords is None or keywords == DEFAULT_KEYWORDS) and find_profile(base_url) is None:
+        bulletins = extract_bulletins_from_index(html_content, base_url)
+        # Sans date lisible, les regex datent le bulletin de l'heure courante
+        # et le marquent 'undated'
+        undated = sum(1 for b in bulletins if b.get('undated'))
+        candidates = _candidate_links(html_content, DEFAULT_KEYWORDS)
+        if (len(bulletins) >= TIER_MIN_ITEMS and len(bulletins) >= TIER_MIN_SHARE * candidates
+                and undated <= TIER_MAX_UNDATED * len(bulletins)):
+            return bulletins, 'regex'
+        print(f"🔎 Regex insuffisantes ({len(bulletins)} bulletin(s) sur ~{candidates} lien(s), "
+              f"{undated} sans date) : analyse BeautifulSoup")
+    return extract_bulletins_smart(html_content, base_url, keywords), 'soup'
+
+
+def parse_page(html_content, page_url, keywords=None, tiered=False):
+    """
+    Étape CPU du traitement : métadonnées du canal et bulletins d'une page.
+    
+    Fonction de niveau module (donc sérialisable) pour pouvoir être exécutée
+    dans un ProcessPoolExecutor par le mode pipeline.
+    
+    Args:
+        tiered: regex d'abord, BeautifulSoup en repli (voir
+            extract_bulletins_tiered)
+    
+    Returns:
+        dict avec title, description, category, author, bulletins et, avec
+        tiered, tier (extracteur utilisé : 'regex' ou 'soup')
+    """
+    title, description = extract_page_metadata(html_content, page_url)
+    parsed = {
+        'title': title,
+        'description': description,
+        'category': detect_category(html_content, page_url),
+        'author': detect_author(html_content, page_url),
+    }
+    if tiered:
+        parsed['bulletins'], parsed['tier'] = extract_bulletins_tiered(html_content, page_url, keywords)
+    else:
+        parsed['bulletins'] = extract_bulletins_smart(html_content, page_url, keywords)
+    return parsed
+
+
+TIERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'niveaux_extraction.json')
+
+
+def record_tier(output_path, parsed, path=TIERS_PATH):
+    """Mémorise l'extracteur qui a servi un flux en mode --tiered (niveaux_extraction.json)."""
+    if 'tier' not in parsed:
+        return
+    try:
+        with open(path, encoding='utf-8') as f:
+            tiers = json.load(f)
+    except (OSError, ValueError):
+        tiers = {}
+    tiers[os.path.basename(output_path)] = {
+        'tier': parsed['tier'],
+        'items': len(parsed['bulletins']),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    write_atomic(path, json.dumps(tiers, ensure_ascii=False, indent=1).encode('utf-8'))
+
+
+# Taille des morceaux lus en mode streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+# Texte conservé par élément ouvert (contexte de date des liens)
+STREAM_TEXT_LIMIT = 2000
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class _StreamFrame:
+    """Élément ouvert pendant l'analyse incrémentale."""
+    __slots__ = ('tag', 'text', 'datetime', 'links', 'href', 'title')
+
+    def __init__(self, tag, href=None, title=None):
+        self.tag = tag
+        self.text = ''
+        self.datetime = None
+        self.links = []
+        self.href = href
+        self.title = title
+
+
+class StreamingBulletinTarget:
+    """
+    Cible d'un lxml.etree.HTMLParser alimenté morceau par morceau : aucun
+    arbre n'est construit, seule la pile des éléments ouverts est gardée.
+
+    Chaque <a> retenu (is_bulletin_link) est mis en attente dans son parent
+    puis émis à la fermeture de ce parent, quand le texte et la balise <time>
+    du parent sont connus : mêmes sources de date que
+    parse_date_from_multiple_sources.
+    """
+
+    def __init__(self, base_url, keywords):
+        self.base_url = base_url
+        self.keywords = keywords
+        self.stack = [_StreamFrame('#document')]
+        self.buffer = []
+        self.candidates = []
+        self.links_seen = 0
+        self.meta = {}
+        self.page_title = None
+
+    def _flush(self):
+        if self.buffer:
+            text = ''.join(self.buffer).strip()
+            self.buffer = []
+            frame = self.stack[-1]
+            if text and len(frame.text) < STREAM_TEXT_LIMIT:
+                frame.text += text
+
+    def start(self, tag, attrib):
+        self._flush()
+        frame = _StreamFrame(tag)
+        if tag == 'a' and attrib.get('href'):
+            frame.href = attrib['href']
+            frame.title = attrib.get('title')
+        elif tag == 'time':
+            frame.datetime = attrib.get('datetime')
+        elif tag == 'meta':
+            key = (attrib.get('name') or attrib.get('property') or '').lower()
+            if key and attrib.get('content'):
+                self.meta.setdefault(key, attrib['content'])
+        self.stack.append(frame)
+
+    def data(self, data):
+        if self.stack[-1].tag not in ('script', 'style'):
+            self.buffer.append(data)
+
+    def end(self, tag):
+        self._flush()
+        if len(self.stack) == 1:
+            return
+        frame = self.stack.pop()
+        parent = self.stack[-1]
+
+        if frame.tag == 'title' and self.page_title is None:
+            self.page_title = frame.text
+        elif frame.href is not None and is_bulletin_link(frame.text, frame.href, self.keywords):
+            parent.links.append((self.links_seen, frame))
+            self.links_seen += 1
+
+        # Le parent voit le texte et la première date de ses descendants
+        if frame.text and len(parent.text) < STREAM_TEXT_LIMIT:
+            parent.text += frame.text
+        if parent.datetime is None:
+            parent.datetime = frame.datetime
+
+        for order, link in frame.links:
+            self.candidates.append((order, self._bulletin(link, frame)))
+
+    def _bulletin(self, link, parent):
+        pub_date = None
+        if parent.datetime:
+            try:
+                dt = datetime.fromisoformat(parent.datetime.replace('Z', '+00:00'))
+                pub_date = email.utils.formatdate(dt.timestamp(), usegmt=True)
+            except ValueError:
+                pass
+        if not pub_date:
+            for text in (link.text, link.title, parent.text):
+                timestamp = parse_french_date(text) if text else None
+                if timestamp:
+                    pub_date = email.utils.formatdate(timestamp, usegmt=True)
+                    break
+        full_url = urljoin(self.base_url, link.href)
+        bulletin = {
+            'title': link.text,
+            'link': full_url,
+            'description': link.text,
+            'pubDate': pub_date or email.utils.formatdate(time.time(), usegmt=True),
+            'guid': md5(full_url.encode('utf-8')).hexdigest()
+        }
+        if not pub_date:
+            bulletin['undated'] = True
+        return bulletin
+
+    def close(self):
+        self._flush()
+        # Ordre du document, premier lien gardé pour une même URL
+        bulletins = []
+        seen_urls = set()
+        for _, bull in sorted(self.candidates, key=lambda c: c[0]):
+            if bull['link'] not in seen_urls:
+                seen_urls.add(bull['link'])
+                bulletins.append(bull)
+        bulletins.sort(key=lambda x: email.utils.parsedate_to_datetime(x['pubDate']),
+                       reverse=True)
+        return bulletins
+
+
+def stream_parse_page(page_url, keywords=None, timeout=15, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Variante de fetch_page + parse_page pour les très grandes pages : le
+    corps de la réponse est passé morceau par morceau à un parseur lxml
+    incrémental pendant le téléchargement. La page n'est jamais conservée
+    entière ni transformée en arbre : la mémoire reste bornée quelle que
+    soit sa taille.
+    
+    Returns:
+        dict comme parse_page, plus 'bytes' (taille téléchargée)
+    """
+    if keywords is None:
+        keywords = ['bsv', 'bulletin']
+    target = StreamingBulletinTarget(page_url, keywords)
+    parser = None
+    encoding = 'utf-8'
+    head = b''
+    size = 0
+    # En --record, le corps est aussi gardé en entier pour l'instantané
+    recorded = [] if snapshot_archive.recording() else None
+    try:
+        if snapshot_archive.replaying():
+            response = _replayed_response(page_url)
+        else:
+            response = requests.get(page_url, headers=REQUEST_HEADERS, timeout=timeout,
+                                    stream=True)
+        with response:
+            if recorded is not None and not response.ok:
+                snapshot_archive.record(page_url, response.status_code, response.reason,
+                                        response.headers, response.content)
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size):
+                if recorded is not None:
+                    recorded.append(chunk)
+                if parser is None:
+                    # Encodage : en-tête HTTP, sinon <meta charset>, sinon UTF-8
+                    match = _CHARSET_RE.search(chunk[:4096])
+                    if 'charset' in response.headers.get('Content-Type', '').lower():
+                        encoding = response.encoding
+                    elif match:
+                        encoding = match.group(1).decode('ascii')
+                    try:
+                        encoding = codecs.lookup(encoding).name
+                    except LookupError:
+                        encoding = 'utf-8'
+                    parser = etree.HTMLParser(target=target, encoding=encoding)
+                if len(head) < 2000:
+                    head += chunk[:2000 - len(head)]
+                size += len(chunk)
+                parser.feed(chunk)
+    except requests.RequestException as e:
+        raise Exception(f"Erreur lors de la récupération de {page_url}: {e}")
+    if recorded is not None:
+        snapshot_archive.record(page_url, response.status_code, response.reason,
+                                response.headers, b''.join(recorded))
+    if parser is None:
+        raise Exception(f"Page vide: {page_url}")
+    bulletins = parser.close()
+
+    meta = target.meta
+    title = target.page_title or meta.get('og:title') or 'Bulletins RSS'
+    head_text = head.decode(encoding, errors='replace')
+    return {
+        'title': title,
+        'description': meta.get('description') or meta.get('og:description') or title,
+        'category': detect_category(head_text, page_url),
+        'author': meta.get('author') or detect_author('', page_url),
+        'bulletins': bulletins,
+        'bytes': size,
+    }
+
+
+NEXT_PAGE_TEXTS = {'suivant', 'suivante', 'page suivante', 'next', '»', '›', '>', '>>'}
+
+
+def find_next_page_url(html_content, base_url):
+    """
+    Cherche le lien vers la page suivante d'une liste paginée.
+    
+    Essaie dans l'ordre : rel="next", un lien « suivant » (texte, classe ou
+    title), puis le lien qui suit la page courante dans une pagination SPIP
+    (<p class="pagination"><strong class="on">1</strong> <a ...>2</a>).
+    Retourne l'URL absolue ou None.
+    """
+    soup = BeautifulSoup(html_content, 'lxml')
+    
+    for tag in soup.find_all(['link', 'a'], href=True):
+        if 'next' in (tag.get('rel') or []):
+            return urljoin(base_url, tag['href'])
+    
+    for link_tag in soup.find_all('a', href=True):
+        text = link_tag.get_text(strip=True).lower()
+        classes = ' '.join(link_tag.get('class') or []).lower()
+        label = (link_tag.get('aria-label') or link_tag.get('title') or '').lower()
+        if text in NEXT_PAGE_TEXTS or 'suivant' in classes or 'next' in classes \
+                or 'suivant' in label:
+            return urljoin(base_url, link_tag['href'])
+    
+    for current in soup.select('.pagination .on, .pagination [aria-current]'):
+        container = current.find_parent(class_='pagination')
+        next_link = current.find_next('a', href=True)
+        if next_link and next_link.find_parent(class_='pagination') is container:
+            return urljoin(base_url, next_link['href'])
+    
+    return None
+
+
+def crawl_paginated(page_url, keywords=None, known_guids=frozenset(), max_pages=50,
+                    known_links=frozenset()):
+    """
+    Parcourt une liste paginée en suivant les liens « page suivante ».
+    
+    S'arrête dès qu'une page contient un bulletin dont le guid ou le lien
+    est déjà connu (flux précédent ; dedupe.py remplace le guid des
+    doublons d'autres flux, le lien reste) : une première exécution
+    récupère tout l'historique, les suivantes ne lisent en général que la
+    première page.
+    
+    Returns:
+        dict comme parse_page (métadonnées de la première page, bulletins
+        nouveaux de toutes les pages lues) avec en plus 'pages'
+    """
+    parsed = None
+    seen_guids = set()
+    seen_pages = set()
+    url = page_url
+    
+    while url and url not in seen_pages and len(seen_pages) < max_pages:
+        seen_pages.add(url)
+        html_content = fetch_page(url)
+        
+        if parsed is None:
+            parsed = parse_page(html_content, url, keywords)
+            page_bulletins = parsed['bulletins']
+            parsed['bulletins'] = []
+        else:
+            page_bulletins = extract_bulletins_smart(html_content, url, keywords)
+        
+        reached_known = False
+        for bull in page_bulletins:
+            if bull['guid'] in known_guids or bull['link'] in known_links:
+                reached_known = True
+            elif bull['guid'] not in seen_guids:
+                seen_guids.add(bull['guid'])
+                parsed['bulletins'].append(bull)
+        
+        if reached_known:
+            break
+        url = find_next_page_url(html_content, url)
+    
+    parsed['pages'] = len(seen_pages)
+    return parsed
+
+
+def build_output_path(page_url, output_filename=None):
+    """Détermine le chemin du fichier de sortie dans liste_des_flux/."""
+    if not output_filename:
+        parsed = urlparse(page_url)
+        path_parts = [p for p in parsed.path.split('/') if p]
+        if path_parts:
+            output_filename = path_parts[-1].replace('.html', '') + '.xml'
+        else:
+            output_filename = 'bulletins.xml'
+    
+    if not output_filename.endswith('.xml'):
+        output_filename += '.xml'
+    
+    # Créer le dossier de sortie
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    outdir = os.path.join(base_dir, 'liste_des_flux')
+    os.makedirs(outdir, exist_ok=True)
+    
+    return os.path.join(outdir, output_filename)
+
+
+def write_feed(page_url, parsed, output_filename=None, formats=None, max_items=None):
+    """
+    Génère le RSS à partir du résultat de parse_page et l'écrit sur disque,
+    avec les formats supplémentaires demandés et le delta (voir feed_publish).
+    Au-delà de max_items, les bulletins les plus anciens vont dans les pages
+    d'archives (voir feed_archive).
+    """
+    output_path = build_output_path(page_url, output_filename)
+    # Bulletins déjà publiés par un autre flux : même guid (voir dedupe.py)
+    bulletins, duplicates = dedupe_items(os.path.basename(output_path), parsed['bulletins'])
+    if duplicates:
+        print(f"🔁 {duplicates} bulletin(s) déjà présent(s) dans un autre flux")
+    bulletins, prev_archive = archive_items(output_path, bulletins, max_items, parsed['title'],
+                                            page_url, parsed['description'],
+                                            parsed['category'], parsed['author'])
+    rss_content = generate_rss(parsed['title'], page_url, parsed['description'],
+                               bulletins, parsed['category'], parsed['author'], prev_archive)
+    publish_feed(output_path, rss_content, bulletins, parsed['title'],
+                 page_url, parsed['description'], parsed['category'],
+                 parsed['author'], formats)
+    return output_path
+
+
+def _cache_digest(html_content, keywords, tiered):
+    """Empreinte pour extraction_cache (le mode --tiered a ses propres entrées)."""
+    params = (keywords, profiles_signature()) + (('tiered',) if tiered else ())
+    return extraction_cache.content_digest(html_content, *params)
+
+
+def process_page_to_rss(page_url, output_filename=None, keywords=None,
+                        paginate=False, max_pages=50, formats=None, streaming=False,
+                        use_cache=True, max_items=None, tiered=False):
     """
     Traite une page et génère un flux RSS.
     
@@ -301,6 +968,19 @@ def process_page_to_rss(page_url, output_filename=None, keywords=None):
         page_url: URL de la page index
         output_filename: Nom du fichier de sortie
         keywords: Mots-clés pour filtrer les bulletins
+        paginate: Suivre les pages suivantes jusqu'au premier bulletin déjà
+            présent dans le flux précédent (les anciens items sont conservés)
+        max_pages: Nombre maximal de pages lues en mode paginé
+        formats: Formats supplémentaires à écrire (ex: ['atom', 'json'])
+        streaming: Analyser la page pendant son téléchargement (très grandes
+            pages, voir stream_parse_page) ; sans effet pour un site avec
+            profil, dont les sélecteurs demandent l'analyse normale
+        use_cache: Reprendre les bulletins de la dernière extraction si la
+            page n'a pas changé (voir extraction_cache.py)
+        max_items: Nombre maximal de bulletins du flux, les plus anciens
+            étant archivés (voir feed_archive.py)
+        tiered: Regex d'abord, BeautifulSoup seulement si leur résultat
+            semble incomplet (voir extract_bulletins_tiered)
     
     Returns:
         (success: bool, message: str)
@@ -311,27 +991,65 @@ def process_page_to_rss(page_url, output_filename=None, keywords=None):
     print()
     print(f"📥 Récupération de la page: {page_url}")
     
-    # Récupérer la page
-    try:
-        html_content = fetch_page(page_url)
-        print(f"✅ Page récupérée ({len(html_content):,} caractères)")
-    except Exception as e:
-        return False, str(e)
-    
-    # Extraire les métadonnées
-    title, description = extract_page_metadata(html_content, page_url)
-    category = detect_category(html_content, page_url)
-    author = detect_author(html_content, page_url)
+    digest = None
+    if streaming and not paginate and find_profile(page_url) is not None:
+        # Le parseur incrémental ne sait appliquer que l'heuristique
+        print("⚠️  --streaming ignoré : ce site a un profil (profils_sites.json), analyse normale")
+        streaming = False
+    if paginate:
+        # Mode paginé : s'arrêter sur le premier bulletin déjà publié
+        previous = load_feed_items(build_output_path(page_url, output_filename))
+        try:
+            parsed = crawl_paginated(page_url, keywords,
+                                     {it['guid'] for it in previous}, max_pages,
+                                     {it['link'] for it in previous if it.get('link')})
+        except Exception as e:
+            return False, str(e)
+        print(f"✅ {parsed['pages']} page(s) récupérée(s), "
+              f"{len(parsed['bulletins'])} nouveau(x) bulletin(s)")
+        parsed['bulletins'] = merge_items(parsed['bulletins'], previous)
+    elif streaming:
+        try:
+            parsed = stream_parse_page(page_url, keywords)
+        except Exception as e:
+            return False, str(e)
+        print(f"✅ Page analysée pendant le téléchargement ({parsed['bytes']:,} octets)")
+    else:
+        # Récupérer la page
+        try:
+            html_content = fetch_page(page_url)
+            print(f"✅ Page récupérée ({len(html_content):,} caractères)")
+        except Exception as e:
+            return False, str(e)
+        
+        # Page identique au dernier passage : extraction reprise du cache
+        parsed = None
+        if use_cache:
+            digest = _cache_digest(html_content, keywords, tiered)
+            parsed = extraction_cache.lookup(page_url, digest)
+        if parsed is not None:
+            print("♻️  Page inchangée : bulletins repris du cache d'extraction")
+            output_path = build_output_path(page_url, output_filename)
+            # Mêmes options et mêmes indications qu'à la dernière écriture
+            if (parsed.get('outputs') == extraction_cache.output_signature(
+                    parsed['bulletins'], formats, max_items)
+                    and extraction_cache.outputs_exist(output_path, formats)):
+                print(f"💾 Flux RSS inchangé: {output_path}")
+                return True, output_path
+        else:
+            # Extraire les métadonnées et les bulletins
+            parsed = parse_page(html_content, page_url, keywords, tiered)
+        record_tier(build_output_path(page_url, output_filename), parsed)
+    bulletins = parsed['bulletins']
     
-    print(f"📋 Titre: {title}")
-    if category:
-        print(f"🏷️  Catégorie: {category}")
-    if author:
-        print(f"✍️  Auteur: {author}")
+    print(f"📋 Titre: {parsed['title']}")
+    if parsed['category']:
+        print(f"🏷️  Catégorie: {parsed['category']}")
+    if parsed['author']:
+        print(f"✍️  Auteur: {parsed['author']}")
     
-    # Extraire les bulletins
-    bulletins = extract_bulletins_smart(html_content, page_url, keywords)
-    print(f"📰 {len(bulletins)} bulletin(s) trouvé(s)")
+    print(f"📰 {len(bulletins)} bulletin(s) trouvé(s)"
+          + (f" (extraction : {parsed['tier']})" if 'tier' in parsed else ''))
     print()
     
     if not bulletins:
@@ -347,44 +1065,229 @@ def process_page_to_rss(page_url, output_filename=None, keywords=None):
         print(f"  ... et {len(bulletins) - 5} autres")
     print()
     
-    # Générer le RSS
-    rss_content = generate_rss(title, page_url, description, bulletins, 
-                               category, author)
+    # Générer et écrire le RSS
+    output_path = write_feed(page_url, parsed, output_filename, formats, max_items)
+    if digest is not None:
+        # Après l'écriture : un flux non écrit n'est jamais considéré à jour
+        extraction_cache.store(page_url, digest, dict(parsed, outputs=extraction_cache.output_signature(
+            bulletins, formats, max_items)))
     
-    # Déterminer le nom du fichier
-    if not output_filename:
-        parsed = urlparse(page_url)
-        path_parts = [p for p in parsed.path.split('/') if p]
-        if path_parts:
-            output_filename = path_parts[-1].replace('.html', '') + '.xml'
+    print(f"💾 Flux RSS généré: {output_path}")
+    return True, output_path
+
+
+_END = object()
+
+
+def _fetch_worker(tasks, fetched):
+    """Étape 1 (threads) : télécharge les pages et les passe aux parseurs."""
+    while True:
+        task = tasks.get()
+        if task is _END:
+            fetched.put(_END)
+            return
+        i, url, name, formats = task
+        try:
+            fetched.put((i, url, name, formats, fetch_page(url), None))
+        except Exception as e:
+            fetched.put((i, url, name, formats, None, str(e)))
+
+
+def _write_worker(parsed_queue, summary, max_items=None):
+    """Étape 3 (thread) : attend les résultats des parseurs et écrit les flux."""
+    while True:
+        entry = parsed_queue.get()
+        if entry is _END:
+            return
+        i, url, name, formats, future, error, cache = entry
+        if error is None:
+            try:
+                parsed = future.result()
+                digest, hit = cache or (None, False)
+                output_path = build_output_path(url, name or None)
+                record_tier(output_path, parsed)
+                if 'tier' in parsed:
+                    summary['tiers'][parsed['tier']] = summary['tiers'].get(parsed['tier'], 0) + 1
+                signature = (extraction_cache.output_signature(parsed['bulletins'], formats, max_items)
+                             if digest else None)
+                if (hit and parsed.get('outputs') == signature
+                        and extraction_cache.outputs_exist(output_path, formats)):
+                    info = f"{output_path} (inchangé)"
+                elif parsed['bulletins']:
+                    info = write_feed(url, parsed, name or None, formats, max_items)
+                    if digest:
+                        extraction_cache.store(url, digest, dict(parsed, outputs=signature))
+                else:
+                    error = "Aucun bulletin trouvé sur cette page"
+            except Exception as e:
+                error = str(e)
+        if error is None:
+            summary['ok'].append((i, url, info))
+            print(f"[{i}] OK -> {info} ({len(parsed['bulletins'])} bulletin(s))")
         else:
-            output_filename = 'bulletins.xml'
+            summary['failed'].append((i, url, error))
+            print(f"[{i}] ERREUR -> {error}")
+
+
+def run_pipeline(tasks, keywords=None, fetchers=4, parsers=None, queue_size=8,
+                 profile=False, use_cache=True, max_items=None, tiered=False):
+    """
+    Traite plusieurs pages index en recouvrant réseau et parsing.
     
-    if not output_filename.endswith('.xml'):
-        output_filename += '.xml'
+    Trois étapes reliées par des files bornées (contre-pression) :
+      1. `fetchers` threads téléchargent les pages ;
+      2. un ProcessPoolExecutor de `parsers` processus exécute parse_page
+         (extract_page_metadata, extract_bulletins_smart...) ;
+      3. un thread d'écriture génère et enregistre les flux.
+    Quand les parseurs sont saturés, les files se remplissent et les
+    téléchargements se mettent en pause au lieu d'accumuler des pages.
     
-    # Créer le dossier de sortie
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    outdir = os.path.join(base_dir, 'liste_des_flux')
-    os.makedirs(outdir, exist_ok=True)
+    Args:
+        tasks: liste de (url, nom_fichier, formats) comme dans create_rss.read_csv
+        keywords: Mots-clés pour filtrer les bulletins
+        fetchers: Nombre de téléchargements simultanés
+        parsers: Nombre de processus de parsing (défaut : nombre de cœurs)
+        queue_size: Taille maximale des files entre les étapes
+        profile: Profiler le parsing de chaque page dans son processus
+            (profilage/<flux>.pstats, voir profiling.py)
+        use_cache: Ne pas réanalyser les pages inchangées depuis le dernier
+            passage (voir extraction_cache.py)
+        max_items: Nombre maximal de bulletins par flux (voir feed_archive.py)
+        tiered: Regex d'abord, BeautifulSoup en repli (voir extract_bulletins_tiered)
     
-    output_path = os.path.join(outdir, output_filename)
+    Returns:
+        dict {'ok': [...], 'failed': [...], 'tiers': {niveau: nombre de flux}}
+    """
+    summary = {'ok': [], 'failed': [], 'tiers': {}}
+    task_queue = queue.Queue()
+    fetched = queue.Queue(maxsize=queue_size)
+    parsed_queue = queue.Queue(maxsize=queue_size)
     
-    # Écrire le fichier
-    with open(output_path, 'wb') as f:
-        f.write(rss_content)
+    for i, (url, name, formats) in enumerate(tasks, start=1):
+        if not url:
+            summary['failed'].append((i, url, 'URL vide'))
+            continue
+        if not urlparse(url).scheme:
+            url = 'https://' + url
+        task_queue.put((i, url, name, formats))
+    for _ in range(fetchers):
+        task_queue.put(_END)
     
-    print(f"💾 Flux RSS généré: {output_path}")
-    return True, output_path
+    fetch_threads = [
+        threading.Thread(target=_fetch_worker, args=(task_queue, fetched), daemon=True)
+        for _ in range(fetchers)
+    ]
+    writer = threading.Thread(target=_write_worker,
+                              args=(parsed_queue, summary, max_items), daemon=True)
+    for t in fetch_threads:
+        t.start()
+    writer.start()
+    
+    # Étape 2 : le thread principal distribue les pages aux processus de parsing.
+    # parsed_queue conserve l'ordre de soumission et borne le nombre de
+    # parsings en cours.
+    with ProcessPoolExecutor(max_workers=parsers) as pool:
+        remaining = fetchers
+        while remaining:
+            entry = fetched.get()
+            if entry is _END:
+                remaining -= 1
+                continue
+            i, url, name, formats, html_content, error = entry
+            future = cache = None
+            if error is None and use_cache:
+                digest = _cache_digest(html_content, keywords, tiered)
+                cached = extraction_cache.lookup(url, digest)
+                cache = (digest, cached is not None)
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+            if error is None and future is None and profile:
+                future = pool.submit(run_profiled, name or urlparse(url).netloc or f'flux_{i}',
+                                     parse_page, html_content, url, keywords, tiered)
+            elif error is None and future is None:
+                future = pool.submit(parse_page, html_content, url, keywords, tiered)
+            parsed_queue.put((i, url, name, formats, future, error, cache))
+        parsed_queue.put(_END)
+        writer.join()
+    
+    return summary
+
+
+def _split_options(argv):
+    """Sépare les arguments positionnels des options --nom[=valeur]."""
+    positional = []
+    options = {}
+    for arg in argv:
+        if arg.startswith('--'):
+            key, _, value = arg[2:].partition('=')
+            options[key] = value or True
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+def main_pipeline(listpath, keywords, options):
+    """Mode pipeline : traite toutes les pages d'un fichier .xlsx/.csv."""
+    from create_rss import read_csv, read_xlsx
+    
+    ext = os.path.splitext(listpath)[1].lower()
+    try:
+        tasks = read_csv(listpath) if ext == '.csv' else read_xlsx(listpath)
+    except Exception as e:
+        print(f"❌ Impossible de lire le fichier: {e}")
+        sys.exit(1)
+    
+    fetchers = int(options.get('fetchers', 4))
+    parsers = int(options['parsers']) if 'parsers' in options else None
+    
+    print(f"🚀 Pipeline : {len(tasks)} page(s), {fetchers} téléchargement(s) simultané(s)")
+    start = time.time()
+    if 'profile' in options:
+        clear_profiles()
+    summary = run_pipeline(tasks, keywords, fetchers=fetchers, parsers=parsers,
+                           profile='profile' in options,
+                           use_cache='no-cache' not in options and 'replay' not in options,
+                           max_items=int(options['max-items']) if 'max-items' in options else None,
+                           tiered='tiered' in options)
+    
+    print()
+    print(f"Résumé ({time.time() - start:.1f}s):")
+    print(f"  Traités : {len(summary['ok'])}")
+    print(f"  Échecs  : {len(summary['failed'])}")
+    if summary['tiers']:
+        print(f"  Extraction : {summary['tiers'].get('regex', 0)} par regex, "
+              f"{summary['tiers'].get('soup', 0)} par BeautifulSoup")
+    if summary['failed']:
+        print('Détails des échecs:')
+        for f in sorted(summary['failed']):
+            print(' ', f)
+    if 'profile' in options:
+        print_summary()
+    if not summary['ok']:
+        sys.exit(1)
 
 
 def main():
     """Point d'entrée principal."""
     # Récupérer les arguments
-    if len(sys.argv) >= 2:
-        page_url = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) >= 3 else None
-        keywords = sys.argv[3].split(',') if len(sys.argv) >= 4 else None
+    args, options = _split_options(sys.argv[1:])
+    # --record / --replay : instantanés des pages (voir snapshot_archive.py)
+    snapshot_archive.configure(options)
+    
+    if 'pipeline' in options:
+        listpath = options['pipeline'] if options['pipeline'] is not True else (args[0] if args else '')
+        if not listpath or not os.path.exists(listpath):
+            print(f"❌ Fichier de liste introuvable: {listpath}")
+            sys.exit(1)
+        keywords = options['keywords'].split(',') if 'keywords' in options else None
+        main_pipeline(listpath, keywords, options)
+        return
+    
+    if len(args) >= 1:
+        page_url = args[0]
+        output_file = args[1] if len(args) >= 2 else None
+        keywords = args[2].split(',') if len(args) >= 3 else None
     else:
         try:
             page_url = input("URL de la page index (liste des bulletins): ").strip()
@@ -404,8 +1307,22 @@ def main():
     if not urlparse(page_url).scheme:
         page_url = 'https://' + page_url
     
-    # Traiter la page
-    success, message = process_page_to_rss(page_url, output_file, keywords)
+    # Traiter la page (sous profilage avec --profile, voir profiling.py)
+    kwargs = dict(paginate='paginate' in options,
+                  max_pages=int(options.get('max-pages', 50)),
+                  formats=parse_formats(options.get('formats')),
+                  streaming='streaming' in options,
+                  use_cache='no-cache' not in options and 'replay' not in options,
+                  max_items=int(options['max-items']) if 'max-items' in options else None,
+                  tiered='tiered' in options)
+    if 'profile' in options:
+        clear_profiles()
+        success, message = run_profiled(build_output_path(page_url, output_file),
+                                        process_page_to_rss, page_url, output_file,
+                                        keywords, **kwargs)
+        print_summary()
+    else:
+        success, message = process_page_to_rss(page_url, output_file, keywords, **kwargs)
     
     print()
     if success:
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""dedupe.py
+Détection des bulletins en double d'un flux à l'autre (un même bulletin
+national lié depuis plusieurs pages régionales).
+
+Chaque item reçoit trois signatures :
+  - l'URL canonique (schéma, "www.", fragment, paramètres de suivi et ordre
+    des paramètres ignorés) ;
+  - une empreinte exacte du titre normalisé (accents, casse, ponctuation)
+    et du jour de publication ;
+  - un SimHash 64 bits du titre, découpé en 4 bandes de 16 bits : deux
+    titres à au plus MAX_DISTANCE bits d'écart partagent forcément une bande.
+
+Les signatures sont conservées dans un index SQLite persistant
+(index_doublons.sqlite) : chaque item est reconnu par quelques lectures
+de clé primaire, quel que soit le nombre de bulletins déjà vus. Un doublon
+reçoit le guid du premier item rencontré, si bien que le tableau de bord,
+les deltas et l'index de recherche ne le voient qu'une fois.
+
+Seuls le guid et l'URL canonique identifient un bulletin à coup sûr. Le
+titre (empreinte exacte ou SimHash) ne sert qu'à rapprocher des bulletins
+de flux différents : deux liens distincts d'un même flux au même titre
+(« Télécharger », « BSV n°12 » publié sur deux pages...) restent deux
+items. Les items sans date (marqués 'undated' par les extracteurs, date
+de repli = heure de génération) n'ont pas de signature de titre.
+
+Un item rapproché d'un autre flux garde dans la page d'origine son guid
+d'origine (empreinte de son URL) : les parcours paginés (crawl_paginated)
+comparent donc aussi les liens aux items connus, pas seulement les guid.
+
+La déduplication porte sur les sorties (guid, deltas, index), pas sur le
+travail d'extraction, et l'index n'est consulté qu'après celle-ci :
+  - create_rss_robust.py et create_rss_from_index.py ne téléchargent
+    aucune page par bulletin : tous les bulletins et leurs dates viennent
+    de la page index, qu'il faut analyser de toute façon pour les trouver ;
+  - create_rss.py fait un flux par page : la page est le contenu du flux et
+    doit être relue à chaque passage (sinon le flux resterait figé). Sur un
+    lot, elle n'est téléchargée qu'une fois (page_cache, indexé par la même
+    URL canonique que la clé 'u:' de cet index).
+
+Usage:
+    python dedupe.py                 (statistiques de l'index)
+    python dedupe.py <url...>        (affiche l'URL canonique)
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import unicodedata
+import email.utils
+from hashlib import md5
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'index_doublons.sqlite')
+
+# Paramètres d'URL sans incidence sur le contenu
+TRACKING_PARAMS = ('utm_', 'xtor', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+# Écart maximal (en bits) entre deux SimHash de titres quasi identiques
+MAX_DISTANCE = 3
+BANDS = 4
+BAND_BITS = 64 // BANDS
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS items (
+    guid TEXT PRIMARY KEY,
+    feed TEXT NOT NULL,
+    link TEXT,
+    simhash TEXT,
+    numbers TEXT,
+    first_seen INTEGER
+);
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    guid TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band TEXT NOT NULL,
+    guid TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_band ON bands(band);
+'''
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def canonical_url(url):
+    """URL canonique d'un bulletin (clé de comparaison, pas une URL à visiter)."""
+    parts = urlsplit((url or '').strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith(TRACKING_PARAMS))
+    return host + path + ('?' + urlencode(query) if query else '')
+
+
+def normalize_text(text):
+    """Mots d'un texte sans accents ni majuscules."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _WORD_RE.findall(text.casefold())
+
+
+def simhash(words):
+    """SimHash 64 bits d'une liste de mots (mots seuls et paires de mots)."""
+    features = words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(md5(feature.encode('utf-8')).digest()[:8], 'big')
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def publication_day(item):
+    """Jour de publication AAAA-MM-JJ d'un item ('' si illisible)."""
+    parsed = email.utils.parsedate_tz(item.get('pubDate') or '')
+    if parsed is None:
+        return ''
+    return time.strftime('%Y-%m-%d', time.gmtime(email.utils.mktime_tz(parsed)))
+
+
+def signatures(item):
+    """
+    Signatures d'un item.
+
+    Returns:
+        (clés exactes, simhash, numéros du titre, bandes LSH)
+    """
+    keys = []
+    if item.get('guid'):
+        keys.append('g:' + item['guid'])
+    if item.get('link'):
+        keys.append('u:' + canonical_url(item['link']))
+    words = normalize_text(item.get('title'))
+    day = publication_day(item)
+    # Date de repli : deux titres génériques du même passage auraient le même jour
+    if not words or not day or item.get('undated'):
+        return keys, 0, '', []
+    keys.append('f:' + md5(f"{' '.join(words)}|{day}".encode('utf-8')).hexdigest())
+    # Les numéros (n°16, 2025...) doivent être identiques : deux bulletins
+    # successifs ne diffèrent souvent que par eux
+    numbers = ' '.join(w for w in words if w.isdigit())
+    value = simhash(words)
+    mask = (1 << BAND_BITS) - 1
+    bands = [f'{i}:{day}:{value >> (i * BAND_BITS) & mask:04x}' for i in range(BANDS)]
+    return keys, value, numbers, bands
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _find(conn, keys, value, numbers, bands):
+    """
+    guid canonique d'un item déjà vu.
+
+    Returns:
+        (guid ou None, True si trouvé par le guid ou l'URL canonique,
+        False si trouvé par le titre seul)
+    """
+    for key in keys:
+        row = conn.execute('SELECT guid FROM keys WHERE key = ?', (key,)).fetchone()
+        if row:
+            return row[0], not key.startswith('f:')
+    for band in bands:
+        for guid, other, other_numbers in conn.execute(
+                'SELECT items.guid, items.simhash, items.numbers FROM bands '
+                'JOIN items ON items.guid = bands.guid WHERE bands.band = ?', (band,)):
+            if other_numbers == numbers and bin(value ^ int(other, 16)).count('1') <= MAX_DISTANCE:
+                return guid, False
+    return None, False
+
+
+def dedupe_items(feed_name, items, db_path=DB_PATH):
+    """
+    Remplace le guid des doublons par celui du premier bulletin rencontré et
+    retire les doublons internes au flux (même guid ou même URL canonique) ;
+    les nouveaux bulletins sont ajoutés à l'index.
+
+    Returns:
+        (items, nombre d'items reconnus comme doublons d'un autre flux)
+    """
+    try:
+        conn = connect(db_path)
+    except sqlite3.Error as e:
+        print(f"⚠️  Index des doublons indisponible: {e}")
+        return items, 0
+
+    result = []
+    seen = set()
+    duplicates = 0
+    now = int(time.time())
+    try:
+        with conn:
+            for it in items:
+                keys, value, numbers, bands = signatures(it)
+                if not keys:
+                    result.append(it)
+                    continue
+                guid, exact = _find(conn, keys, value, numbers, bands)
+                if guid is not None and not exact:
+                    # Titre seul : même bulletin uniquement s'il vient d'un autre
+                    # flux et n'a pas déjà été rapproché d'un item de ce flux
+                    row = conn.execute('SELECT feed FROM items WHERE guid = ?', (guid,)).fetchone()
+                    if row is None or row[0] == feed_name or guid in seen:
+                        guid = None
+                if guid is None:
+                    guid = it.get('guid') or md5(keys[0].encode('utf-8')).hexdigest()
+                    conn.execute('INSERT OR IGNORE INTO items VALUES (?, ?, ?, ?, ?, ?)',
+                                 (guid, feed_name, it.get('link'), f'{value:016x}', numbers, now))
+                    conn.executemany('INSERT INTO bands VALUES (?, ?)',
+                                     [(band, guid) for band in bands])
+                else:
+                    row = conn.execute('SELECT feed FROM items WHERE guid = ?', (guid,)).fetchone()
+                    if row and row[0] != feed_name:
+                        duplicates += 1
+                conn.executemany('INSERT OR IGNORE INTO keys VALUES (?, ?)',
+                                 [(key, guid) for key in keys])
+
+                if guid in seen:
+                    continue
+                seen.add(guid)
+                result.append(dict(it, guid=guid) if guid != it.get('guid') else it)
+    except sqlite3.Error as e:
+        print(f"⚠️  Index des doublons non mis à jour: {e}")
+        return items, 0
+    finally:
+        conn.close()
+    return result, duplicates
+
+
+def main():
+    if len(sys.argv) > 1:
+        for url in sys.argv[1:]:
+            print(f"{url}\n  -> {canonical_url(url)}")
+        return
+
+    if not os.path.exists(DB_PATH):
+        print(f"ℹ️  Index des doublons vide ({DB_PATH} absent)")
+        return
+    conn = connect()
+    try:
+        print(f"📚 {conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]} bulletin(s) distinct(s)")
+        for feed, count in conn.execute(
+                'SELECT feed, COUNT(*) FROM items GROUP BY feed ORDER BY feed'):
+            print(f"  📰 {feed} : {count}")
+        aliases = conn.execute(
+            "SELECT COUNT(*) FROM keys k JOIN items i ON i.guid = k.guid "
+            "WHERE k.key LIKE 'g:%' AND k.key != 'g:' || k.guid").fetchone()[0]
+        print(f"🔁 {aliases} doublon(s) rattaché(s) à un bulletin existant")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
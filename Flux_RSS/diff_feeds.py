@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""diff_feeds.py
+Différences entre deux versions des flux RSS, item par item.
+
+Chaque version est indexée en flux (guid -> empreinte des champs de l'item),
+puis les deux index sont comparés : O(n) par flux, mémoire proportionnelle
+au nombre de guid seulement.
+
+Usage:
+    python diff_feeds.py <ancien> <nouveau> [--json]
+        (ancien/nouveau : deux fichiers .xml ou deux dossiers)
+
+    python diff_feeds.py --snapshot[=dossier] [--json]
+        Compare liste_des_flux/ à la copie de la dernière exécution
+        (flux_precedents/ par défaut) puis met cette copie à jour ; à lancer
+        après chaque génération.
+"""
+
+import os
+import sys
+import glob
+import json
+import shutil
+import xml.etree.ElementTree as ET
+from hashlib import md5
+
+from feed_io import ITEM_FIELDS, iter_feed_items
+
+
+def index_feed(path):
+    """
+    Indexe un flux : guid -> (empreinte, titre).
+    Un flux absent ou illisible donne un index vide.
+    """
+    index = {}
+    if not path or not os.path.exists(path):
+        return index
+    try:
+        for item in iter_feed_items(path):
+            key = item.get('guid') or item.get('link')
+            if not key:
+                continue
+            fingerprint = md5('\x1f'.join(item.get(f, '') for f in ITEM_FIELDS)
+                              .encode('utf-8')).hexdigest()
+            index[key] = (fingerprint, item.get('title', ''))
+    except ET.ParseError:
+        pass
+    return index
+
+
+def diff_feed(old_path, new_path):
+    """
+    Compare deux versions d'un flux.
+
+    Returns:
+        dict avec added, removed, modified : listes de {'guid', 'title'}
+    """
+    old = index_feed(old_path)
+    new = index_feed(new_path)
+    result = {'added': [], 'removed': [], 'modified': []}
+    for guid, (fingerprint, title) in new.items():
+        previous = old.get(guid)
+        if previous is None:
+            result['added'].append({'guid': guid, 'title': title})
+        elif previous[0] != fingerprint:
+            result['modified'].append({'guid': guid, 'title': title})
+    for guid, (_, title) in old.items():
+        if guid not in new:
+            result['removed'].append({'guid': guid, 'title': title})
+    return result
+
+
+def diff_dirs(old_dir, new_dir):
+    """Compare tous les flux .xml de deux dossiers ; retourne {nom: diff} (flux modifiés seulement)."""
+    names = {os.path.basename(p) for d in (old_dir, new_dir)
+             for p in glob.glob(os.path.join(d, '*.xml'))}
+    changes = {}
+    for name in sorted(names):
+        result = diff_feed(os.path.join(old_dir, name), os.path.join(new_dir, name))
+        if any(result.values()):
+            changes[name] = result
+    return changes
+
+
+def update_snapshot(feeds_dir, snapshot_dir, changes):
+    """Recopie dans la copie de référence les seuls flux modifiés."""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    current = {os.path.basename(p) for p in glob.glob(os.path.join(feeds_dir, '*.xml'))}
+    for name in changes:
+        source = os.path.join(feeds_dir, name)
+        target = os.path.join(snapshot_dir, name)
+        if name in current:
+            shutil.copy2(source, target)
+        elif os.path.exists(target):
+            os.remove(target)
+
+
+def print_changes(changes):
+    """Affichage lisible des différences."""
+    if not changes:
+        print("✅ Aucun changement.")
+        return
+    for name, result in changes.items():
+        print(f"📰 {name} : +{len(result['added'])} "
+              f"-{len(result['removed'])} ~{len(result['modified'])}")
+        for label, symbol in (('added', '+'), ('removed', '-'), ('modified', '~')):
+            for item in result[label]:
+                print(f"   {symbol} {item['title'][:70]}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    if 'snapshot' in options:
+        feeds_dir = args[0] if args else os.path.join(base_dir, 'liste_des_flux')
+        snapshot_dir = options['snapshot'] or os.path.join(base_dir, 'flux_precedents')
+        changes = diff_dirs(snapshot_dir, feeds_dir)
+        update_snapshot(feeds_dir, snapshot_dir, changes)
+    elif len(args) == 2:
+        old, new = args
+        if os.path.isdir(old) and os.path.isdir(new):
+            changes = diff_dirs(old, new)
+        else:
+            result = diff_feed(old, new)
+            changes = {os.path.basename(new): result} if any(result.values()) else {}
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    if 'json' in options:
+        json.dump(changes, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_changes(changes)
+
+
+if __name__ == '__main__':
+    main()
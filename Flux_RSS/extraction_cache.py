@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""extraction_cache.py
+Cache des extractions, indexé par empreinte du contenu téléchargé.
+
+Beaucoup de pages DRAAF ne renvoient ni ETag ni Last-Modified : une requête
+conditionnelle ne sert à rien et la même page HTML est analysée à chaque
+exécution. Ici, l'empreinte SHA-256 du corps de la page (et des paramètres
+d'extraction) est conservée avec le résultat de l'extraction ; si la page
+n'a pas changé, les bulletins sont repris tels quels, sans BeautifulSoup ni
+regex. Le flux existant n'est pas réécrit si, en plus, rien de ce qui fixe
+le contenu des fichiers n'a changé depuis la dernière écriture (formats,
+--max-items, ttl et skipDays/skipHours de feed_hints, voir output_signature) ;
+sinon il est régénéré à partir des bulletins du cache.
+
+    cache_extraction/<md5 de l'URL>.json.gz
+
+Le dossier est borné (MAX_ENTRIES entrées, MAX_BYTES octets) : les entrées
+les moins récemment utilisées sont supprimées en premier.
+
+Usage:
+    python extraction_cache.py            (statistiques)
+    python extraction_cache.py --clear    (vide le cache)
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+from hashlib import md5, sha256
+
+from feed_io import write_atomic
+from feed_formats import EXTENSIONS
+from feed_hints import compute_hints
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, 'cache_extraction')
+MAX_ENTRIES = 500
+MAX_BYTES = 50 * 1024 * 1024
+# À incrémenter quand une fonction d'extraction change de résultat
+CACHE_VERSION = 2
+
+
+def content_digest(body, *params):
+    """Empreinte du corps de page et des paramètres qui influent sur l'extraction."""
+    h = sha256(f'{CACHE_VERSION}\x1f{json.dumps(params, ensure_ascii=False)}\x1f'.encode('utf-8'))
+    h.update(body.encode('utf-8', errors='surrogatepass') if isinstance(body, str) else body)
+    return h.hexdigest()
+
+
+def _entry_path(url, cache_dir):
+    return os.path.join(cache_dir, md5(url.encode('utf-8')).hexdigest() + '.json.gz')
+
+
+def lookup(url, digest, cache_dir=CACHE_DIR):
+    """Résultat mis en cache pour cette URL si l'empreinte est identique, sinon None."""
+    path = _entry_path(url, cache_dir)
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError, EOFError):
+        return None
+    if entry.get('digest') != digest:
+        return None
+    try:
+        # Date d'accès pour l'éviction LRU
+        os.utime(path)
+    except OSError:
+        pass
+    return entry['result']
+
+
+def store(url, digest, result, cache_dir=CACHE_DIR):
+    """Enregistre le résultat d'une extraction puis applique les limites du cache."""
+    os.makedirs(cache_dir, exist_ok=True)
+    entry = {'url': url, 'digest': digest, 'result': result}
+    content = json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_atomic(_entry_path(url, cache_dir), gzip.compress(content, mtime=0))
+    prune(cache_dir)
+
+
+def prune(cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    """Supprime les entrées les moins récemment utilisées au-delà des limites."""
+    entries = []
+    for path in glob.glob(os.path.join(cache_dir, '*.json.gz')):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    entries.sort(reverse=True)
+    total = 0
+    removed = 0
+    for count, (_, size, path) in enumerate(entries, start=1):
+        total += size
+        if count > max_entries or total > max_bytes:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def output_signature(items, formats=None, max_items=None):
+    """
+    Empreinte de ce qui, en plus des bulletins extraits, fixe le contenu des
+    fichiers écrits : formats demandés, limite --max-items et indications de
+    feed_hints (le ttl change avec le temps écoulé depuis le dernier
+    bulletin). Enregistrée avec l'extraction sous la clé 'outputs' après
+    chaque écriture du flux.
+
+    Les guid de dedupe.py n'y figurent pas : un bulletin déjà indexé garde
+    son guid quels que soient les autres flux.
+    """
+    params = [sorted(formats or ['rss']), max_items, compute_hints(items)]
+    return sha256(json.dumps(params, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def outputs_exist(output_path, formats=None):
+    """Vrai si le flux et tous les formats demandés existent déjà sur disque."""
+    base = output_path[:-len('.xml')] if output_path.endswith('.xml') else output_path
+    paths = [output_path] + [base + EXTENSIONS[f] for f in (formats or []) if f != 'rss']
+    return all(os.path.exists(p) for p in paths)
+
+
+def main():
+    if '--clear' in sys.argv[1:]:
+        removed = prune(max_entries=0)
+        print(f"🗑️  {removed} entrée(s) supprimée(s)")
+        return
+    paths = glob.glob(os.path.join(CACHE_DIR, '*.json.gz'))
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"📦 {len(paths)} entrée(s), {total / 1024:.0f} Ko "
+          f"(limites : {MAX_ENTRIES} entrées, {MAX_BYTES // (1024 * 1024)} Mo)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""feed_archive.py
+Taille limitée des flux et pages d'archives (RFC 5005, « Archived Feeds »).
+
+Avec --max-items=N (create_rss_robust.py, create_rss_from_index.py), le flux
+principal ne garde que les bulletins les plus récents ; les plus anciens
+sont déplacés, par pages de ARCHIVE_PAGE_SIZE bulletins, dans :
+
+    liste_des_flux/archives/Auvergne-1.xml    (la plus ancienne)
+    liste_des_flux/archives/Auvergne-2.xml
+    liste_des_flux/archives/Auvergne.json     (état : pages, guid archivés)
+
+Le flux principal pointe vers la page la plus récente
+(<atom:link rel="prev-archive">), chaque page vers la précédente ; les pages
+portent <fh:archive/>. Une page n'est écrite qu'une fois, complète, puis
+n'est plus jamais modifiée (les clients peuvent la garder en cache) : le
+flux principal contient donc entre N et N + ARCHIVE_PAGE_SIZE - 1 bulletins.
+
+La limite est mémorisée dans l'état du flux : les exécutions suivantes
+l'appliquent même sans l'option.
+
+Usage:
+    python feed_archive.py <liste_des_flux/Nom.xml>    (pages d'archives du flux)
+"""
+
+import os
+import sys
+import json
+import time
+import email.utils
+import xml.etree.ElementTree as ET
+
+from feed_io import pub_timestamp, write_atomic
+
+
+ARCHIVES_DIRNAME = 'archives'
+ARCHIVE_PAGE_SIZE = 50
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+FH_NS = 'http://purl.org/syndication/history/1.0'
+
+ET.register_namespace('atom', ATOM_NS)
+ET.register_namespace('fh', FH_NS)
+
+
+def archives_dir(feed_path):
+    return os.path.join(os.path.dirname(os.path.abspath(feed_path)), ARCHIVES_DIRNAME)
+
+
+def _feed_base(feed_path):
+    return os.path.splitext(os.path.basename(feed_path))[0]
+
+
+def archive_files(feed_path):
+    """Pages d'archives existantes d'un flux puis son fichier d'état (chemins)."""
+    directory = archives_dir(feed_path)
+    state_path = os.path.join(directory, _feed_base(feed_path) + '.json')
+    pages = [os.path.join(directory, page['file']) for page in load_state(feed_path)['pages']]
+    return [path for path in pages + [state_path] if os.path.exists(path)]
+
+
+def load_state(feed_path):
+    """État des archives d'un flux (pages écrites, guid archivés, limite)."""
+    path = os.path.join(archives_dir(feed_path), _feed_base(feed_path) + '.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'max_items': None, 'pages': [], 'guids': []}
+
+
+def add_archive_link(channel, rel, href):
+    """Ajoute un lien RFC 5005 (<atom:link rel=... href=...>) à un <channel>."""
+    ET.SubElement(channel, f'{{{ATOM_NS}}}link', rel=rel, href=href)
+
+
+def render_page(items, number, feed_name, channel_title, channel_link, channel_desc,
+                category=None, author=None):
+    """XML d'une page d'archives (les liens sont relatifs au dossier archives/)."""
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = f"{channel_title} (archives {number})"
+    ET.SubElement(channel, 'link').text = channel_link
+    ET.SubElement(channel, 'description').text = channel_desc
+    ET.SubElement(channel, 'lastBuildDate').text = email.utils.formatdate(time.time(), usegmt=True)
+    ET.SubElement(channel, f'{{{FH_NS}}}archive')
+    add_archive_link(channel, 'current', f'../{feed_name}')
+    if number > 1:
+        add_archive_link(channel, 'prev-archive', f'{_feed_base(feed_name)}-{number - 1}.xml')
+    if category:
+        ET.SubElement(channel, 'category').text = category
+
+    for it in items:
+        item = ET.SubElement(channel, 'item')
+        ET.SubElement(item, 'title').text = it.get('title')
+        ET.SubElement(item, 'link').text = it.get('link')
+        ET.SubElement(item, 'description').text = it.get('description')
+        ET.SubElement(item, 'pubDate').text = it.get('pubDate')
+        if author or it.get('author'):
+            ET.SubElement(item, 'author').text = author or it.get('author')
+        if category or it.get('category'):
+            ET.SubElement(item, 'category').text = category or it.get('category')
+        if it.get('guid'):
+            ET.SubElement(item, 'guid').text = it.get('guid')
+
+    return ET.tostring(rss, encoding='utf-8', xml_declaration=True)
+
+
+def archive_items(feed_path, items, max_items, channel_title, channel_link, channel_desc,
+                  category=None, author=None, page_size=ARCHIVE_PAGE_SIZE):
+    """
+    Retire du flux les bulletins déjà archivés et archive par pages complètes
+    les plus anciens au-delà de max_items (None : limite mémorisée, s'il y en a).
+
+    Returns:
+        (items du flux principal, href de la page prev-archive ou None)
+    """
+    state = load_state(feed_path)
+    if max_items is None:
+        max_items = state.get('max_items')
+    archived = set(state['guids'])
+    remaining = [it for it in items if it.get('guid') not in archived]
+    pages_before = len(state['pages'])
+
+    if max_items and len(remaining) > max_items:
+        count = (len(remaining) - max_items) // page_size * page_size
+        # Les plus anciens d'abord (ordre stable pour les dates identiques)
+        oldest = sorted(remaining, key=pub_timestamp)[:count]
+        directory = archives_dir(feed_path)
+        os.makedirs(directory, exist_ok=True)
+        feed_name = os.path.basename(feed_path)
+        for start in range(0, count, page_size):
+            chunk = oldest[start:start + page_size]
+            number = len(state['pages']) + 1
+            page_name = f'{_feed_base(feed_path)}-{number}.xml'
+            chunk.sort(key=pub_timestamp, reverse=True)
+            write_atomic(os.path.join(directory, page_name),
+                         render_page(chunk, number, feed_name, channel_title, channel_link,
+                                     channel_desc, category, author))
+            state['pages'].append({'file': page_name, 'items': len(chunk),
+                                   'newest': chunk[0].get('pubDate')})
+            state['guids'].extend(it.get('guid') for it in chunk)
+        moved = {id(it) for it in oldest}
+        remaining = [it for it in remaining if id(it) not in moved]
+        print(f"🗄️  {count} bulletin(s) archivé(s) ({len(state['pages']) - pages_before} page(s))")
+
+    if len(state['pages']) != pages_before or max_items != state.get('max_items'):
+        state['max_items'] = max_items
+        os.makedirs(archives_dir(feed_path), exist_ok=True)
+        write_atomic(os.path.join(archives_dir(feed_path), _feed_base(feed_path) + '.json'),
+                     json.dumps(state, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    prev_archive = None
+    if state['pages']:
+        prev_archive = f"{ARCHIVES_DIRNAME}/{state['pages'][-1]['file']}"
+    return remaining, prev_archive
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    feed_path = sys.argv[1]
+    state = load_state(feed_path)
+    if not state['pages']:
+        print(f"ℹ️  Aucune page d'archives pour {os.path.basename(feed_path)}")
+        return
+    print(f"🗄️  {os.path.basename(feed_path)} : {len(state['pages'])} page(s), "
+          f"{len(state['guids'])} bulletin(s) archivé(s), limite {state['max_items']}")
+    for page in reversed(state['pages']):
+        print(f"  {page['file']:40} {page['items']:>4} bulletin(s), le plus récent : {page['newest']}")
+
+
+if __name__ == '__main__':
+    main()
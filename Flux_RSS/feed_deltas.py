@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""feed_deltas.py
+Flux « delta » : à chaque génération qui change un flux, un petit fichier
+JSON ne contenant que les items ajoutés (et les guid retirés) est publié,
+numéroté par un identifiant de build croissant.
+
+    liste_des_flux/deltas/manifest.json
+    liste_des_flux/deltas/Auvergne/41.json
+
+manifest.json :
+    {"build": 41,
+     "feeds": {"Auvergne.xml": {"build": 41, "since": 12, "deltas": [17, 30, 41]}}}
+
+Un client qui a déjà tout vu jusqu'au build N lit le manifeste ; pour chaque
+flux dont "build" > N, il applique les deltas > N si N >= "since", sinon
+(deltas trop anciens supprimés) il recharge le flux complet.
+
+Usage:
+    python feed_deltas.py [build_N]     (affiche les changements depuis le build N)
+"""
+
+import os
+import sys
+import json
+import time
+import email.utils
+from contextlib import contextmanager
+
+from feed_io import write_atomic
+
+
+DELTAS_DIRNAME = 'deltas'
+# Nombre de deltas conservés par flux
+KEEP_DELTAS = 50
+DELTA_FIELDS = ('title', 'link', 'description', 'pubDate', 'guid', 'category', 'author')
+
+
+def deltas_dir(feeds_dir):
+    return os.path.join(feeds_dir, DELTAS_DIRNAME)
+
+
+@contextmanager
+def manifest_lock(directory, timeout=30):
+    """Verrou inter-processus (fichier créé en exclusif) autour du manifeste."""
+    lock_path = os.path.join(directory, 'manifest.lock')
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # Verrou abandonné par un processus interrompu
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Verrou occupé: {lock_path}")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(lock_path)
+
+
+def load_manifest(directory):
+    path = os.path.join(directory, 'manifest.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'build': 0, 'feeds': {}}
+
+
+def publish_delta(feed_path, previous_guids, items):
+    """
+    Publie le delta d'un flux qui vient d'être écrit.
+
+    Args:
+        feed_path: Chemin du flux RSS (liste_des_flux/Nom.xml)
+        previous_guids: guid du flux avant réécriture (None si nouveau flux)
+        items: Items du nouveau flux
+
+    Returns:
+        Numéro de build attribué, ou None si le contenu n'a pas changé
+    """
+    previous_guids = previous_guids or set()
+    current_guids = {it.get('guid') for it in items}
+    added = [{k: it[k] for k in DELTA_FIELDS if it.get(k)}
+             for it in items if it.get('guid') not in previous_guids]
+    removed = sorted(g for g in previous_guids if g not in current_guids)
+    if not added and not removed:
+        return None
+
+    feeds_dir = os.path.dirname(os.path.abspath(feed_path))
+    feed_name = os.path.basename(feed_path)
+    directory = deltas_dir(feeds_dir)
+    feed_dir = os.path.join(directory, os.path.splitext(feed_name)[0])
+    os.makedirs(feed_dir, exist_ok=True)
+
+    with manifest_lock(directory):
+        manifest = load_manifest(directory)
+        build = manifest['build'] + 1
+        entry = manifest['feeds'].setdefault(feed_name, {'build': 0, 'since': 0, 'deltas': []})
+
+        delta = {
+            'feed': feed_name,
+            'build': build,
+            'previous_build': entry['build'],
+            'generated': email.utils.formatdate(time.time(), usegmt=True),
+            'items': added,
+            'removed': removed,
+        }
+        write_atomic(os.path.join(feed_dir, f'{build}.json'),
+                     json.dumps(delta, ensure_ascii=False).encode('utf-8'))
+
+        entry['build'] = build
+        entry['deltas'].append(build)
+        # Élaguer les plus anciens : "since" = build couvert par le plus ancien delta conservé
+        while len(entry['deltas']) > KEEP_DELTAS:
+            oldest = entry['deltas'].pop(0)
+            entry['since'] = oldest
+            try:
+                os.remove(os.path.join(feed_dir, f'{oldest}.json'))
+            except OSError:
+                pass
+
+        manifest['build'] = build
+        manifest['updated'] = delta['generated']
+        write_atomic(os.path.join(directory, 'manifest.json'),
+                     json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+    return build
+
+
+def changes_since(feeds_dir, since_build):
+    """
+    Rassemble les changements publiés après `since_build`.
+
+    Returns:
+        dict {nom_flux: {'items': [...], 'removed': [...]} ou {'reload': True}}
+    """
+    directory = deltas_dir(feeds_dir)
+    manifest = load_manifest(directory)
+    result = {}
+    for feed_name, entry in manifest['feeds'].items():
+        if entry['build'] <= since_build:
+            continue
+        if since_build < entry['since']:
+            result[feed_name] = {'reload': True}
+            continue
+        feed_dir = os.path.join(directory, os.path.splitext(feed_name)[0])
+        items, removed = [], []
+        for build in entry['deltas']:
+            if build <= since_build:
+                continue
+            with open(os.path.join(feed_dir, f'{build}.json'), encoding='utf-8') as f:
+                delta = json.load(f)
+            items.extend(delta['items'])
+            removed.extend(delta['removed'])
+        result[feed_name] = {'items': items, 'removed': removed}
+    return result
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    feeds_dir = os.path.join(base_dir, 'liste_des_flux')
+    since = int(sys.argv[1]) if len(sys.argv) >= 2 else 0
+
+    manifest = load_manifest(deltas_dir(feeds_dir))
+    print(f"📦 Build courant : {manifest['build']}")
+    for feed_name, change in changes_since(feeds_dir, since).items():
+        if change.get('reload'):
+            print(f"  🔄 {feed_name} : deltas expirés, recharger le flux complet")
+        else:
+            print(f"  📰 {feed_name} : +{len(change['items'])} -{len(change['removed'])}")
+            for item in change['items']:
+                print(f"     + {item.get('title', '')[:70]}")
+
+
+if __name__ == '__main__':
+    main()
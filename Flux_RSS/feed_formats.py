@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""feed_formats.py
+Sorties Atom 1.0 et JSON Feed 1.1, en plus du RSS 2.0 produit par
+make_rss / generate_rss.
+
+Les formats sont rendus depuis la même liste d'items en mémoire (celle
+passée à make_rss), en un seul parcours pour tous les formats demandés :
+aucune relecture du RSS produit.
+
+Les fichiers sont écrits à côté du flux RSS :
+    liste_des_flux/Auvergne.xml   (RSS)
+    liste_des_flux/Auvergne.atom  (Atom)
+    liste_des_flux/Auvergne.json  (JSON Feed)
+"""
+
+import os
+import json
+import email.utils
+from xml.sax.saxutils import escape, quoteattr
+from datetime import datetime, timezone
+
+from feed_io import COMPRESSED_SUFFIXES, save_feed
+
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+JSON_FEED_VERSION = 'https://jsonfeed.org/version/1.1'
+
+# Extension de fichier de chaque format
+EXTENSIONS = {'rss': '.xml', 'atom': '.atom', 'json': '.json'}
+# Formats rendus ici (le RSS reste produit par make_rss / generate_rss)
+EXTRA_FORMATS = ('atom', 'json')
+
+
+def parse_formats(value):
+    """
+    Convertit 'rss,atom,json' (option --formats ou colonne C du .xlsx) en
+    liste de formats valides ; 'rss' est toujours inclus.
+    """
+    formats = ['rss']
+    for name in (value or '').replace(';', ',').split(','):
+        name = name.strip().lower()
+        if name in EXTENSIONS and name not in formats:
+            formats.append(name)
+    return formats
+
+
+def rfc3339(pub_date):
+    """Convertit une date RFC 822 (pubDate) en RFC 3339, ou None."""
+    if not pub_date:
+        return None
+    try:
+        dt = email.utils.parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+def render_formats(formats, channel_title, channel_link, channel_desc, items,
+                   category=None, author=None):
+    """
+    Rend les formats demandés (parmi EXTRA_FORMATS) en un seul parcours des items.
+
+    Returns:
+        dict {format: bytes}
+    """
+    want_atom = 'atom' in formats
+    want_json = 'json' in formats
+    now = datetime.now(timezone.utc).isoformat()
+
+    # Atom : texte construit directement (échappement XML), nettement plus
+    # rapide que de passer par un arbre ElementTree
+    entries = []
+    json_items = []
+    latest = None
+    for it in items:
+        item_author = author or it.get('author')
+        item_category = category or it.get('category')
+        published = rfc3339(it.get('pubDate'))
+        if published and (latest is None or published > latest):
+            latest = published
+        item_id = it.get('link') or it.get('guid')
+
+        if want_atom:
+            parts = [
+                '<entry><title>', escape(it.get('title') or ''), '</title>',
+                '<id>', escape(item_id or ''), '</id>',
+                '<link href=', quoteattr(it.get('link') or ''), ' />',
+                '<updated>', published or now, '</updated>',
+            ]
+            if published:
+                parts += ['<published>', published, '</published>']
+            if it.get('description'):
+                parts += ['<summary>', escape(it['description']), '</summary>']
+            if item_author:
+                parts += ['<author><name>', escape(item_author), '</name></author>']
+            if item_category:
+                parts += ['<category term=', quoteattr(item_category), ' />']
+            parts.append('</entry>')
+            entries.append(''.join(parts))
+
+        if want_json:
+            json_item = {
+                'id': it.get('guid') or item_id,
+                'url': it.get('link'),
+                'title': it.get('title'),
+                'content_text': it.get('description') or it.get('title') or '',
+            }
+            if published:
+                json_item['date_published'] = published
+            if item_author:
+                json_item['authors'] = [{'name': item_author}]
+            if item_category:
+                json_item['tags'] = [item_category]
+            json_items.append(json_item)
+
+    rendered = {}
+    if want_atom:
+        # Atom exige un auteur : celui du canal, à défaut le titre du flux
+        header = ''.join([
+            "<?xml version='1.0' encoding='utf-8'?>\n",
+            f'<feed xmlns="{ATOM_NS}">',
+            '<title>', escape(channel_title or ''), '</title>',
+            '<id>', escape(channel_link or ''), '</id>',
+            '<link href=', quoteattr(channel_link or ''), ' />',
+            '<subtitle>', escape(channel_desc or ''), '</subtitle>',
+            '<updated>', latest or now, '</updated>',
+            '<author><name>', escape(author or channel_title or ''), '</name></author>',
+        ])
+        rendered['atom'] = (header + ''.join(entries) + '</feed>').encode('utf-8')
+    if want_json:
+        document = {
+            'version': JSON_FEED_VERSION,
+            'title': channel_title,
+            'home_page_url': channel_link,
+            'description': channel_desc,
+            'language': 'fr',
+            'items': json_items,
+        }
+        if author:
+            document['authors'] = [{'name': author}]
+        # Sans indentation : l'encodeur C de json est utilisé
+        rendered['json'] = json.dumps(document, ensure_ascii=False,
+                                      separators=(',', ':')).encode('utf-8')
+    return rendered
+
+
+def write_formats(rss_path, formats, channel_title, channel_link, channel_desc,
+                  items, category=None, author=None):
+    """
+    Écrit les formats supplémentaires demandés à côté du flux RSS `rss_path`
+    et supprime ceux qui ne sont plus demandés (avec leurs variantes
+    .gz/.br), pour ne pas servir un flux figé.
+    Retourne la liste des fichiers écrits.
+    """
+    extra = [f for f in formats if f in EXTRA_FORMATS]
+    base = rss_path[:-len('.xml')] if rss_path.endswith('.xml') else rss_path
+    for name in EXTRA_FORMATS:
+        if name in extra:
+            continue
+        for path in [base + EXTENSIONS[name]] + [base + EXTENSIONS[name] + suffix
+                                                 for suffix in COMPRESSED_SUFFIXES]:
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"🗑️  Format retiré: {os.path.basename(path)}")
+    if not extra:
+        return []
+    rendered = render_formats(extra, channel_title, channel_link, channel_desc,
+                              items, category, author)
+    written = []
+    for name, content in rendered.items():
+        path = base + EXTENSIONS[name]
+        save_feed(path, content)
+        written.append(path)
+    return written
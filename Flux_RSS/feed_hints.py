@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""feed_hints.py
+Indications de fréquence de lecture pour les clients des flux.
+
+D'après les dates de publication des bulletins d'un flux :
+  - <ttl> : minutes pendant lesquelles le flux peut être gardé en cache,
+    10 % du temps écoulé depuis la dernière publication (même règle que
+    scheduler.py), entre MIN_TTL et MAX_TTL ;
+  - <skipDays> : jours de la semaine (GMT, comme skipHours selon RSS 2.0)
+    sans aucune publication observée ;
+  - <skipHours> : heures (GMT) sans publication, si les dates sont assez
+    précises (pas seulement des jours) ;
+  - Nom.xml.meta : {"max_age": ...} lu par feed_server.py pour l'en-tête
+    Cache-Control des flux (.xml, .atom, .json).
+
+skipDays et skipHours ne sont émis qu'avec au moins MIN_HISTORY
+publications observées.
+
+Usage:
+    python feed_hints.py <liste_des_flux/Nom.xml>
+"""
+
+import os
+import sys
+import json
+import time
+import xml.etree.ElementTree as ET
+
+from feed_io import COMPRESSED_SUFFIXES, iter_feed_items, pub_timestamp, write_atomic
+
+
+# Part du temps écoulé depuis la dernière publication
+FRESHNESS_FACTOR = 0.1
+MIN_TTL = 60
+MAX_TTL = 24 * 60
+MIN_HISTORY = 8
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+def freshness_interval(last_change, now, min_interval, max_interval):
+    """FRESHNESS_FACTOR x âge du dernier changement, borné (en secondes)."""
+    return max(min_interval, min(max_interval, FRESHNESS_FACTOR * (now - last_change)))
+
+
+def compute_hints(items, now=None):
+    """
+    Returns:
+        {'ttl': minutes, 'skip_days': [...], 'skip_hours': [...]}
+    """
+    now = time.time() if now is None else now
+    stamps = [t for t in (pub_timestamp(it) for it in items) if 0 < t <= now]
+    if not stamps:
+        return {'ttl': MIN_TTL, 'skip_days': [], 'skip_hours': []}
+    ttl = int(freshness_interval(max(stamps), now, MIN_TTL * 60, MAX_TTL * 60) // 60)
+
+    skip_days = []
+    # Jours GMT (RSS 2.0). Une date seule est convertie depuis minuit local :
+    # la publication a pu avoir lieu à toute heure de ce jour local, qui
+    # couvre deux jours GMT hors fuseau UTC
+    days = {time.gmtime(t)[:3] for t in stamps}
+    if len(days) >= MIN_HISTORY:
+        seen = set()
+        for t in stamps:
+            seen.add(time.gmtime(t).tm_wday)
+            if time.localtime(t)[3:6] == (0, 0, 0):
+                seen.add(time.gmtime(t + 86399).tm_wday)
+        skip_days = [DAYS[d] for d in range(7) if d not in seen]
+
+    skip_hours = []
+    # Une heure ronde à la seconde près vient en général d'une date sans heure ;
+    # des items à la même seconde, d'une date de repli (heure de génération)
+    timed = {t for t in stamps if t % 3600}
+    if len(timed) >= MIN_HISTORY:
+        seen = {time.gmtime(t).tm_hour for t in timed}
+        skip_hours = [h for h in range(24) if h not in seen]
+    return {'ttl': ttl, 'skip_days': skip_days, 'skip_hours': skip_hours}
+
+
+def add_hints(channel, items, now=None):
+    """Ajoute <ttl>, <skipHours> et <skipDays> au <channel> d'un flux RSS."""
+    hints = compute_hints(items, now)
+    ET.SubElement(channel, 'ttl').text = str(hints['ttl'])
+    if hints['skip_hours']:
+        skip = ET.SubElement(channel, 'skipHours')
+        for hour in hints['skip_hours']:
+            ET.SubElement(skip, 'hour').text = str(hour)
+    if hints['skip_days']:
+        skip = ET.SubElement(channel, 'skipDays')
+        for day in hints['skip_days']:
+            ET.SubElement(skip, 'day').text = day
+    return hints
+
+
+def meta_path(path):
+    """Fichier .meta associé à un flux, quel que soit son format (.xml, .atom, .json)."""
+    if path.endswith(COMPRESSED_SUFFIXES):
+        path = path[:-3]
+    return os.path.splitext(path)[0] + '.xml.meta'
+
+
+def write_meta(feed_path, items, now=None):
+    """Écrit Nom.xml.meta (durée de cache HTTP du flux, en secondes)."""
+    hints = compute_hints(items, now)
+    write_atomic(meta_path(feed_path), json.dumps({'max_age': hints['ttl'] * 60}).encode('utf-8'))
+    return hints
+
+
+def read_max_age(path):
+    """max_age du fichier .meta d'un flux, ou None."""
+    try:
+        with open(meta_path(path), encoding='utf-8') as f:
+            return int(json.load(f)['max_age'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    items = list(iter_feed_items(sys.argv[1]))
+    hints = compute_hints(items)
+    print(f"📰 {os.path.basename(sys.argv[1])} : {len(items)} bulletin(s)")
+    print(f"  ttl       : {hints['ttl']} min")
+    print(f"  skipDays  : {', '.join(hints['skip_days']) or '-'}")
+    print(f"  skipHours : {', '.join(map(str, hints['skip_hours'])) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
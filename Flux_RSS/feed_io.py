@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""feed_io.py
+Fonctions communes de lecture et d'écriture des flux RSS générés dans
+liste_des_flux/.
+
+La lecture se fait en flux (iterparse) : chaque <item> est converti en dict
+puis libéré, la mémoire reste donc constante quelle que soit la taille du
+fichier.
+
+L'écriture (save_feed) est atomique et produit à côté de chaque flux ses
+variantes précompressées .gz (et .br si le module brotli est installé),
+servies telles quelles par feed_server.py.
+"""
+
+import os
+import gzip
+import email.utils
+import xml.etree.ElementTree as ET
+
+try:
+    import brotli
+    _HAS_BROTLI = True
+except ImportError:
+    _HAS_BROTLI = False
+
+
+ITEM_FIELDS = ('title', 'link', 'description', 'pubDate', 'guid',
+               'category', 'author')
+# Variantes précompressées écrites par save_feed à côté de chaque fichier
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def iter_feed_items(path):
+    """
+    Parcourt les items d'un flux RSS sans charger tout le document.
+
+    Yields:
+        dict avec title, link, description, pubDate, guid (+ category, author
+        si présents), dans l'ordre du fichier
+    """
+    channel = None
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'channel':
+                channel = elem
+            continue
+        if elem.tag != 'item':
+            continue
+        item = {}
+        for child in elem:
+            if child.tag in ITEM_FIELDS:
+                item[child.tag] = (child.text or '').strip()
+        yield item
+        # Libérer les items déjà traités
+        if channel is not None:
+            del channel[:]
+
+
+def load_feed_items(path):
+    """Charge la liste des items d'un flux existant ([] si absent ou invalide)."""
+    if not os.path.exists(path):
+        return []
+    try:
+        return list(iter_feed_items(path))
+    except ET.ParseError:
+        return []
+
+
+def load_guids(path):
+    """Retourne l'ensemble des guid d'un flux existant (vide si absent ou invalide)."""
+    return {item['guid'] for item in load_feed_items(path) if item.get('guid')}
+
+
+def pub_timestamp(item):
+    """Timestamp de la pubDate d'un item (0 si absente ou illisible)."""
+    parsed = email.utils.parsedate_tz(item.get('pubDate') or '')
+    if parsed is None:
+        return 0
+    return email.utils.mktime_tz(parsed)
+
+
+def merge_items(new_items, previous_items):
+    """
+    Fusionne les nouveaux items avec ceux d'un flux précédent.
+    Les nouveaux items priment en cas de guid identique ; le résultat est
+    trié par date (plus récent en premier).
+    """
+    merged = list(new_items)
+    guids = {it.get('guid') for it in merged}
+    merged.extend(it for it in previous_items if it.get('guid') not in guids)
+    merged.sort(key=pub_timestamp, reverse=True)
+    return merged
+
+
+def write_atomic(path, content):
+    """Écrit un fichier via un fichier temporaire + os.replace (jamais de fichier tronqué)."""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def save_feed(path, content):
+    """
+    Enregistre un flux et ses variantes précompressées.
+
+    Args:
+        path: Chemin du fichier (ex: liste_des_flux/Auvergne.xml)
+        content: Contenu sérialisé (bytes)
+    """
+    write_atomic(path, content)
+    # mtime=0 : même contenu => même .gz, octet pour octet
+    write_atomic(path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+    if _HAS_BROTLI:
+        write_atomic(path + '.br', brotli.compress(content, quality=11))
+    elif os.path.exists(path + '.br'):
+        # Variante devenue obsolète : ne pas la laisser servir
+        os.remove(path + '.br')
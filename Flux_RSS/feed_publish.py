@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""feed_publish.py
+Étape commune d'écriture d'un flux généré, utilisée par create_rss.py,
+create_rss_from_index.py et create_rss_robust.py (shard_runner.py reprend
+les étapes 3 à 6, via publish_changes, pour les flux copiés depuis un lot) :
+
+  1. flux RSS + variantes .gz/.br (feed_io.save_feed), précédé de sa durée
+     de cache HTTP (Nom.xml.meta, feed_hints) ;
+  2. formats supplémentaires Atom / JSON Feed (feed_formats) ;
+  3. delta des items ajoutés/retirés (feed_deltas) ;
+  4. mise à jour de l'index de recherche (search_index) ;
+  5. ajout des nouveaux bulletins à l'archive Parquet (archive_export) ;
+  6. notification du changement aux consommateurs (notify).
+"""
+
+import os
+import sqlite3
+
+from feed_io import COMPRESSED_SUFFIXES, load_guids, save_feed
+from feed_formats import EXTENSIONS, write_formats
+from feed_hints import meta_path, write_meta
+from feed_deltas import publish_delta
+from search_index import update_index
+from archive_export import append_items
+from notify import FEEDS_DIR, notify_change
+
+
+def feed_files(output_path):
+    """
+    Fichiers qu'écrit publish_feed pour le flux output_path (Nom.xml), qu'ils
+    existent ou non : .meta, autres formats puis flux RSS, chacun suivi de
+    ses variantes précompressées.
+    """
+    base = output_path[:-len('.xml')] if output_path.endswith('.xml') else output_path
+    paths = [meta_path(output_path)]
+    for ext in sorted(EXTENSIONS.values(), key=lambda ext: ext == '.xml'):
+        paths.append(base + ext)
+        paths.extend(base + ext + suffix for suffix in COMPRESSED_SUFFIXES)
+    return paths
+
+
+def publish_feed(output_path, rss_content, items, channel_title, channel_link,
+                 channel_desc, category=None, author=None, formats=None, write_only=False):
+    """
+    Écrit un flux et ses sorties associées.
+
+    Args:
+        write_only: n'écrire que les fichiers du flux (étapes 1 et 2), sans
+            delta, index, archive Parquet ni notification : lots de
+            shard_runner.py, publiés ensuite par merge_shards
+
+    Returns:
+        Numéro de build du delta publié, ou None si les items n'ont pas changé
+        (toujours None avec write_only)
+    """
+    previous_guids = load_guids(output_path)
+    # Avant le flux : feed_server relit le .meta quand le flux change
+    write_meta(output_path, items)
+    save_feed(output_path, rss_content)
+    write_formats(output_path, formats or [], channel_title, channel_link,
+                  channel_desc, items, category, author)
+    if write_only:
+        return None
+    return publish_changes(output_path, items, previous_guids, category, author)
+
+
+def publish_changes(output_path, items, previous_guids, category=None, author=None,
+                    feeds_dir=FEEDS_DIR):
+    """
+    Publie les changements d'un flux déjà écrit : delta, index de recherche,
+    archive Parquet et notification (items du flux et guid de sa version
+    précédente).
+
+    Returns:
+        Numéro de build du delta publié, ou None si les items n'ont pas changé
+    """
+    build = publish_delta(output_path, previous_guids, items)
+    try:
+        update_index(os.path.basename(output_path), items, category, author)
+    except sqlite3.Error as e:
+        # L'index est un plus : ne jamais faire échouer la génération du flux
+        print(f"⚠️  Index de recherche non mis à jour: {e}")
+    added = [it for it in items if it.get('guid') not in previous_guids]
+    append_items(os.path.basename(output_path), added, category, author)
+    if build is not None:
+        removed = previous_guids - {it.get('guid') for it in items}
+        notify_change(output_path, build, len(added), len(removed), feeds_dir=feeds_dir)
+    return build
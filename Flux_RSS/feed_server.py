@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""feed_server.py
+Serveur HTTP statique pour les flux RSS, à utiliser à la place de
+`python -m http.server`.
+
+Par rapport à http.server :
+  - ETag fort calculé depuis le contenu (sha256) et réponses 304 sur
+    If-None-Match / If-Modified-Since ;
+  - en-tête Cache-Control (max-age propre à chaque flux si le générateur a
+    écrit Nom.xml.meta, voir feed_hints.py, sinon --max-age) ;
+  - envoi des variantes précompressées .br / .gz écrites par
+    feed_io.save_feed (compression gzip à la volée si absente) ;
+  - contenu et empreintes gardés en mémoire tant que le fichier ne change pas.
+
+Usage:
+    python feed_server.py [dossier_racine] [port] [--max-age=60]
+
+Exemple (depuis le dossier "Flux affichage") :
+    python ../Flux_RSS/feed_server.py . 8000
+"""
+
+import os
+import sys
+import gzip
+import hashlib
+import threading
+import email.utils
+import http.server
+from functools import partial
+from io import BytesIO
+
+from feed_hints import read_max_age
+
+
+DEFAULT_MAX_AGE = 60
+
+# Types servis en priorité (les autres passent par mimetypes)
+CONTENT_TYPES = {
+    '.xml': 'application/xml; charset=utf-8',
+    '.atom': 'application/atom+xml; charset=utf-8',
+    '.json': 'application/feed+json; charset=utf-8',
+}
+
+# Types qui valent la peine d'être compressés
+COMPRESSIBLE = ('.xml', '.atom', '.html', '.htm', '.css', '.js', '.json', '.txt')
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_entry(path):
+    """
+    Retourne les informations de cache d'un fichier (contenu, ETag, variantes).
+    Le cache est invalidé dès que la taille ou la date de modification change.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        entry = _cache.get(path)
+    if entry and entry['key'] == key:
+        return entry
+
+    with open(path, 'rb') as f:
+        body = f.read()
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    entry = {
+        'key': key,
+        'body': body,
+        'hash': digest,
+        'mtime': st.st_mtime,
+        'max_age': read_max_age(path),
+        'variants': {},
+    }
+
+    if path.endswith(COMPRESSIBLE):
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            variant = path + suffix
+            try:
+                vst = os.stat(variant)
+            except OSError:
+                continue
+            # Une variante plus ancienne que le fichier est périmée
+            if vst.st_mtime_ns >= st.st_mtime_ns:
+                with open(variant, 'rb') as f:
+                    entry['variants'][encoding] = f.read()
+        if 'gzip' not in entry['variants']:
+            entry['variants']['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+
+    with _cache_lock:
+        _cache[path] = entry
+    return entry
+
+
+def accepted_encodings(header):
+    """Liste des encodages acceptés par le client (q=0 exclu)."""
+    accepted = set()
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+class FeedRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Gestionnaire de requêtes avec ETag, 304 et variantes précompressées."""
+
+    protocol_version = 'HTTP/1.1'
+    # Connexions persistantes : en-têtes et corps partent sans attendre l'ACK
+    disable_nagle_algorithm = True
+    max_age = DEFAULT_MAX_AGE
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            # Répertoires, index.html, 404 : comportement standard
+            return super().send_head()
+
+        try:
+            entry = load_entry(path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+
+        encoding = None
+        if entry['variants']:
+            accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+            for candidate in ('br', 'gzip'):
+                if candidate in accepted and candidate in entry['variants']:
+                    encoding = candidate
+                    break
+
+        body = entry['variants'][encoding] if encoding else entry['body']
+        etag = f'"{entry["hash"]}-{encoding}"' if encoding else f'"{entry["hash"]}"'
+
+        if self.not_modified(entry):
+            self.send_response(304)
+            self.send_common_headers(entry, etag)
+            self.end_headers()
+            return None
+
+        self.send_response(200)
+        self.send_header('Content-Type', self.content_type(path))
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_common_headers(entry, etag)
+        self.end_headers()
+        return BytesIO(body)
+
+    def not_modified(self, entry):
+        """Vrai si la copie du client est à jour (If-None-Match prioritaire)."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            if if_none_match.strip() == '*':
+                return True
+            for tag in if_none_match.split(','):
+                # Toutes les variantes d'un même contenu partagent le hash
+                tag = tag.strip().removeprefix('W/').strip('"')
+                if tag.split('-')[0] == entry['hash']:
+                    return True
+            return False
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(entry['mtime']) <= since
+        return False
+
+    def send_common_headers(self, entry, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(entry['mtime']))
+        self.send_header('Cache-Control', f"public, max-age={entry['max_age'] or self.max_age}")
+        if entry['variants']:
+            self.send_header('Vary', 'Accept-Encoding')
+
+    def content_type(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        return CONTENT_TYPES.get(ext) or self.guess_type(path)
+
+    def log_message(self, format, *args):
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+
+def make_server(root='.', port=8000, max_age=DEFAULT_MAX_AGE, quiet=False):
+    """Crée (sans le démarrer) un serveur multi-thread servant `root`."""
+    handler_class = type('ConfiguredFeedRequestHandler', (FeedRequestHandler,),
+                         {'max_age': max_age})
+    handler = partial(handler_class, directory=os.path.abspath(root))
+    server = http.server.ThreadingHTTPServer(('', port), handler)
+    server.quiet = quiet
+    return server
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    root = args[0] if len(args) >= 1 else '.'
+    port = int(args[1]) if len(args) >= 2 else 8000
+    max_age = int(options.get('max-age') or DEFAULT_MAX_AGE)
+
+    if not os.path.isdir(root):
+        print(f"❌ Dossier introuvable: {root}")
+        sys.exit(1)
+
+    server = make_server(root, port, max_age)
+    print(f"🌐 Flux servis depuis {os.path.abspath(root)}")
+    print(f"   http://localhost:{port}/  (Ctrl+C pour arrêter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nArrêt du serveur.")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""notify.py
+Notifications de changement des flux : les consommateurs de
+liste_des_flux/*.xml n'ont plus à tout relire à intervalle fixe.
+
+Quand une génération change réellement les items d'un flux (nouveau build
+dans feed_deltas), publish_feed appelle notify_change, qui :
+
+  1. ajoute l'événement au journal liste_des_flux/deltas/changements.jsonl
+     (une ligne JSON par changement, fichier en ajout seul) ;
+  2. prévient un hub WebSub (requête « hub.mode=publish ») si "hub" et
+     "base_url" sont configurés ;
+  3. envoie l'événement en JSON (POST) à chaque URL de "webhooks", signé
+     (en-tête X-Hub-Signature, HMAC-SHA256) si "secret" est renseigné.
+
+Configuration facultative dans notifications.json (à côté du script, voir
+notifications.exemple.json) :
+
+    {"base_url": "https://exemple.fr/flux/",
+     "hub": "https://pubsubhubbub.appspot.com/",
+     "webhooks": ["http://localhost:8800/"],
+     "secret": "..."}
+
+Seuls les flux de liste_des_flux/ sont notifiés (pas les dossiers de
+travail de shard_runner.py). Une notification en échec est signalée mais
+ne fait jamais échouer la génération.
+
+Usage:
+    python notify.py --listen[=8800]     (récepteur de test : affiche les notifications reçues)
+    python notify.py [N]                 (N derniers changements du journal, 20 par défaut)
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import hashlib
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode, urljoin, parse_qs
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from feed_deltas import deltas_dir
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BASE_DIR, 'notifications.json')
+FEEDS_DIR = os.path.join(BASE_DIR, 'liste_des_flux')
+LOG_NAME = 'changements.jsonl'
+TIMEOUT = 5
+
+
+def load_config(path=CONFIG_PATH):
+    """Configuration des notifications ({} si le fichier est absent)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Configuration des notifications illisible ({path}): {e}")
+        return {}
+
+
+def _post(url, body, content_type, secret=None):
+    headers = {'Content-Type': content_type, 'User-Agent': 'Flux_RSS notify'}
+    if secret:
+        digest = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        headers['X-Hub-Signature'] = f'sha256={digest}'
+    req = urllib.request.Request(url, data=body, headers=headers, method='POST')
+    with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
+        return resp.status
+
+
+def notify_change(feed_path, build, added, removed, config=None, feeds_dir=FEEDS_DIR):
+    """
+    Signale qu'un flux a changé (build de feed_deltas, nombre d'items
+    ajoutés et retirés). Retourne l'événement, ou None si le flux n'est pas
+    dans feeds_dir.
+    """
+    directory = os.path.dirname(os.path.abspath(feed_path))
+    if os.path.normcase(directory) != os.path.normcase(os.path.abspath(feeds_dir)):
+        return None
+    config = load_config() if config is None else config
+    feed_name = os.path.basename(feed_path)
+    event = {
+        'feed': feed_name,
+        'build': build,
+        'added': added,
+        'removed': removed,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+    if config.get('base_url'):
+        event['url'] = urljoin(config['base_url'], feed_name)
+
+    # Journal : une ligne par événement, écrite d'un seul write (mode ajout)
+    try:
+        log_dir = deltas_dir(directory)
+        os.makedirs(log_dir, exist_ok=True)
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with open(os.path.join(log_dir, LOG_NAME), 'a', encoding='utf-8') as f:
+            f.write(line)
+    except OSError as e:
+        print(f"⚠️  Journal des changements non mis à jour: {e}")
+
+    targets = []
+    if config.get('hub') and event.get('url'):
+        targets.append((config['hub'], urlencode({'hub.mode': 'publish', 'hub.url': event['url']}).encode('ascii'),
+                        'application/x-www-form-urlencoded', None))
+    body = json.dumps(event, ensure_ascii=False).encode('utf-8')
+    for url in config.get('webhooks', []):
+        targets.append((url, body, 'application/json', config.get('secret')))
+    sent = 0
+    for url, data, content_type, secret in targets:
+        try:
+            _post(url, data, content_type, secret)
+            sent += 1
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"⚠️  Notification non envoyée à {url}: {e}")
+    if sent:
+        print(f"📣 Changement notifié ({sent}/{len(targets)} destinataire(s))")
+    return event
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    """Récepteur de test : affiche les pings WebSub et les webhooks reçus."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            params = parse_qs(body.decode('utf-8'))
+            print(f"📥 WebSub {params.get('hub.mode', ['?'])[0]} : {params.get('hub.url', ['?'])[0]}")
+        else:
+            signature = self.headers.get('X-Hub-Signature')
+            print(f"📥 Webhook{' signé' if signature else ''} : {body.decode('utf-8', 'replace')}")
+        sys.stdout.flush()
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if 'listen' in options:
+        port = int(options['listen'] or 8800)
+        print(f"👂 Récepteur de notifications sur http://localhost:{port}/ (Ctrl+C pour arrêter)")
+        try:
+            HTTPServer(('127.0.0.1', port), _Receiver).serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    count = int(args[0]) if args else 20
+    path = os.path.join(deltas_dir(FEEDS_DIR), LOG_NAME)
+    if not os.path.exists(path):
+        print(f"ℹ️  Aucun changement enregistré ({path} absent)")
+        return
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()[-count:]
+    for line in lines:
+        event = json.loads(line)
+        print(f"  {event['time']}  build {event['build']:>5}  {event['feed']}  "
+              f"+{event['added']} -{event['removed']}")
+
+
+if __name__ == '__main__':
+    main()
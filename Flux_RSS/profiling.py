@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""profiling.py
+Mode --profile des générateurs (create_rss.py, create_rss_from_index.py,
+create_rss_robust.py) : pour savoir si un flux lent l'est à cause du
+réseau, de BeautifulSoup, de apparent_encoding ou des expressions
+régulières.
+
+Pour chaque flux, dans profilage/ :
+    <flux>.pstats      profil cProfile (snakeviz, python -m pstats...)
+    <flux>.memoire.txt principales allocations (tracemalloc)
+et pour l'exécution complète :
+    resume.txt         fonctions les plus lentes, tous flux confondus
+
+Usage:
+    python create_rss.py Site.xlsx --profile
+    python profiling.py [dossier]     (refait le résumé des .pstats existants)
+"""
+
+import os
+import io
+import re
+import sys
+import glob
+import time
+import pstats
+import cProfile
+import tracemalloc
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_DIR = os.path.join(BASE_DIR, 'profilage')
+# Nombre de lignes des rapports
+TOP = 25
+# Allocations du profilage lui-même, exclues du rapport mémoire
+_NOISE = (
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+)
+
+
+def _safe_name(name):
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', os.path.splitext(os.path.basename(name))[0]) or 'flux'
+
+
+def run_profiled(name, func, *args, **kwargs):
+    """
+    Exécute func(*args, **kwargs) sous cProfile et tracemalloc, puis écrit
+    profilage/<name>.pstats et profilage/<name>.memoire.txt.
+
+    Fonction de niveau module : utilisable dans un ProcessPoolExecutor.
+    Retourne le résultat de func.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    label = _safe_name(name)
+    base = os.path.join(PROFILE_DIR, label)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot().filter_traces(_NOISE)
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        profiler.dump_stats(base + '.pstats')
+        after = tracemalloc.take_snapshot().filter_traces(_NOISE)
+        peak = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        with open(base + '.memoire.txt', 'w', encoding='utf-8') as f:
+            f.write(f"{label} : {elapsed:.2f}s, pic mémoire {peak / 1024 / 1024:.1f} Mo\n\n")
+            f.write(f"Principales allocations (top {TOP}) :\n")
+            for stat in after.compare_to(before, 'lineno')[:TOP]:
+                f.write(f"  {stat}\n")
+        print(f"⏱️  {label} : {elapsed:.2f}s, pic mémoire {peak / 1024 / 1024:.1f} Mo "
+              f"-> {os.path.relpath(base, BASE_DIR)}.pstats")
+
+
+def write_summary(directory=PROFILE_DIR):
+    """
+    Agrège les profils du dossier et écrit resume.txt (fonctions triées par
+    temps propre puis par temps cumulé). Retourne les statistiques agrégées,
+    ou None s'il n'y a aucun profil.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, '*.pstats')))
+    if not paths:
+        return None
+    out = io.StringIO()
+    out.write(f"{len(paths)} profil(s) : {', '.join(os.path.basename(p) for p in paths)}\n")
+    stats = pstats.Stats(*paths, stream=out)
+    stats.strip_dirs()
+    for key, label in (('tottime', 'temps propre'), ('cumulative', 'temps cumulé')):
+        out.write(f"\n=== Fonctions les plus lentes ({label}) ===\n")
+        stats.sort_stats(key).print_stats(TOP)
+    with open(os.path.join(directory, 'resume.txt'), 'w', encoding='utf-8') as f:
+        f.write(out.getvalue())
+    return stats
+
+
+def clear_profiles(directory=PROFILE_DIR):
+    """Supprime les profils d'une exécution précédente (le résumé ne porte que sur celle-ci)."""
+    for pattern in ('*.pstats', '*.memoire.txt'):
+        for path in glob.glob(os.path.join(directory, pattern)):
+            os.remove(path)
+
+
+def print_summary(directory=PROFILE_DIR, lines=15):
+    """Écrit resume.txt et affiche les fonctions les plus coûteuses en temps propre."""
+    stats = write_summary(directory)
+    if stats is None:
+        print("ℹ️  Aucun profil à résumer.")
+        return
+    print()
+    print("=" * 70)
+    print("  ⏱️  Fonctions les plus lentes (tous flux, temps propre / cumulé)")
+    print("=" * 70)
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:lines]
+    for (filename, line, func), (_, calls, own, cumulative, _) in rows:
+        print(f"  {own:8.3f}s {cumulative:8.3f}s {calls:>8}  {func} ({filename}:{line})")
+    print(f"📄 Détail : {os.path.join(directory, 'resume.txt')}")
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) >= 2 else PROFILE_DIR
+    print_summary(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""publish_feeds.py
+Publication des flux générés vers le tableau de bord (et d'autres dossiers).
+
+Les générateurs écrivent dans Flux_RSS/liste_des_flux/ alors que
+« Flux affichage/index.html » lit « Flux affichage/liste_des_flux/ ». Ce
+script recopie dans chaque dossier cible les seuls fichiers modifiés
+(flux, variantes .gz/.br, .meta, formats Atom/JSON, deltas, archives) :
+
+  - l'empreinte SHA-256 de chaque fichier source n'est recalculée que si sa
+    taille ou sa date a changé (cache dans publication.json, par source) ;
+  - publication.json garde aussi, par cible, l'empreinte de chaque fichier
+    publié : seuls les fichiers dont l'empreinte diffère sont copiés ;
+  - chaque copie est atomique (fichier temporaire dans la cible puis
+    renommage) : le tableau de bord ne lit jamais un flux à moitié copié ;
+  - les manifest.json (deltas) sont copiés en dernier, après les fichiers
+    qu'ils annoncent ;
+  - un fichier publié puis supprimé de la source est retiré de la cible
+    (les autres fichiers de la cible ne sont jamais touchés).
+
+--verify recalcule les empreintes des fichiers des cibles (après une
+modification à la main, par exemple).
+
+Usage:
+    python publish_feeds.py [dossier_cible ...] [--source=liste_des_flux] [--verify]
+    (cible par défaut : ../Flux affichage/liste_des_flux)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+from hashlib import sha256
+
+from feed_io import write_atomic
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(BASE_DIR, 'liste_des_flux')
+DEFAULT_TARGET = os.path.join(os.path.dirname(BASE_DIR), 'Flux affichage', 'liste_des_flux')
+STATE_PATH = os.path.join(BASE_DIR, 'publication.json')
+# Fichiers annonçant les autres : publiés après eux
+LAST_NAMES = ('manifest.json',)
+# Fichiers temporaires de write_atomic / copy_atomic (Nom.xml.tmp1234)
+TMP_RE = re.compile(r'\.tmp\d+$')
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'sources': {}, 'targets': {}}
+
+
+def save_state(state, path=STATE_PATH):
+    write_atomic(path, json.dumps(state, ensure_ascii=False, indent=1).encode('utf-8'))
+
+
+def file_digest(path):
+    h = sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_sources(source_dir, cache):
+    """
+    Empreintes des fichiers de source_dir, par chemin relatif (séparateur /).
+    cache ({chemin: [taille, mtime_ns, empreinte]}) est mis à jour : seuls les
+    fichiers nouveaux ou modifiés sont relus.
+
+    Returns:
+        ({chemin: empreinte}, nombre de fichiers relus)
+    """
+    digests = {}
+    hashed = 0
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            # Fichiers temporaires de write_atomic en cours d'écriture
+            if TMP_RE.search(name):
+                continue
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, source_dir).replace(os.sep, '/')
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = cache.get(rel)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                digests[rel] = cached[2]
+                continue
+            try:
+                digest = file_digest(path)
+            except OSError:
+                continue
+            cache[rel] = [st.st_size, st.st_mtime_ns, digest]
+            digests[rel] = digest
+            hashed += 1
+    for rel in set(cache) - set(digests):
+        del cache[rel]
+    return digests, hashed
+
+
+def copy_atomic(src, dst):
+    """Copie src vers dst via un fichier temporaire du même dossier, date de src conservée."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp_path = f"{dst}.tmp{os.getpid()}"
+    shutil.copyfile(src, tmp_path)
+    st = os.stat(src)
+    # Last-Modified servi par feed_server.py : date de génération du flux
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp_path, dst)
+
+
+def publish(source_dir, target_dir, digests, published, verify=False):
+    """
+    Met target_dir à jour d'après les empreintes de la source.
+    published ({chemin: empreinte} déjà publiés dans cette cible) est mis à jour.
+
+    Returns:
+        (copiés, supprimés)
+    """
+    if verify:
+        for rel in list(published):
+            path = os.path.join(target_dir, rel)
+            published[rel] = file_digest(path) if os.path.exists(path) else None
+
+    for rel in digests:
+        path = os.path.join(target_dir, rel)
+        if rel not in published and os.path.exists(path):
+            # Fichier déjà présent avant la première publication (copie à la main)
+            published[rel] = file_digest(path)
+
+    changed = [rel for rel, digest in digests.items()
+               if published.get(rel) != digest
+               or not os.path.exists(os.path.join(target_dir, rel))]
+    changed.sort(key=lambda rel: (os.path.basename(rel) in LAST_NAMES, rel))
+    for rel in changed:
+        copy_atomic(os.path.join(source_dir, rel), os.path.join(target_dir, rel))
+        published[rel] = digests[rel]
+
+    removed = 0
+    for rel in sorted(set(published) - set(digests)):
+        try:
+            os.remove(os.path.join(target_dir, rel))
+            removed += 1
+        except FileNotFoundError:
+            pass
+        del published[rel]
+    return len(changed), removed
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    source_dir = os.path.abspath(options.get('source') or SOURCE_DIR)
+    targets = [os.path.abspath(t) for t in args] or [DEFAULT_TARGET]
+    if not os.path.isdir(source_dir):
+        print(f"❌ Dossier source introuvable: {source_dir}")
+        sys.exit(1)
+
+    start = time.time()
+    state = load_state()
+    digests, hashed = scan_sources(source_dir, state.setdefault('sources', {}).setdefault(source_dir, {}))
+    print(f"📦 {len(digests)} fichier(s) dans {source_dir} ({hashed} relu(s))")
+    failed = False
+    for target_dir in targets:
+        published = state.setdefault('targets', {}).setdefault(target_dir, {})
+        try:
+            copied, removed = publish(source_dir, target_dir, digests, published,
+                                      verify='verify' in options)
+        except OSError as e:
+            # Fichiers déjà copiés ou supprimés : enregistrés dans published
+            save_state(state)
+            print(f"❌ {target_dir} : {e}")
+            failed = True
+            continue
+        print(f"🚚 {target_dir} : {copied} copié(s), {removed} supprimé(s), "
+              f"{len(digests) - copied} inchangé(s)")
+    save_state(state)
+    print(f"✅ Publication terminée ({time.time() - start:.2f}s)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
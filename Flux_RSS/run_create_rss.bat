@@ -11,7 +11,8 @@ if not exist "Site.xlsx" (
 )
 REM Créer le sous-dossier de sortie si besoin (mkdir ignore s'il existe)
 mkdir "%~dp0liste_des_flux" 2>nul
-python "%~dp0create_rss.py" "%~dp0Site.xlsx"
+REM Options transmises au script, ex. : run_create_rss.bat --profile
+python "%~dp0create_rss.py" "%~dp0Site.xlsx" %*
 IF %ERRORLEVEL% NEQ 0 (
 	echo Une erreur est survenue.
 )
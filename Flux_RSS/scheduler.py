@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""scheduler.py
+Rafraîchissement des flux à intervalle adaptatif.
+
+Les BSV sont hebdomadaires en saison et presque muets l'hiver : relire toutes
+les pages au même rythme gaspille l'essentiel des téléchargements. Ce script
+est lancé souvent (Planificateur de tâches, update_flux_rss.bat) et ne
+régénère (create_rss_robust.py) que les flux dont l'échéance est passée.
+
+Pour chaque flux, planification.json garde l'historique des changements :
+dates des bulletins à la première génération, puis dates auxquelles de
+nouveaux bulletins ont été détectés. L'intervalle suivant vaut
+
+    FRESHNESS_FACTOR x temps écoulé depuis le dernier changement (feed_hints)
+
+borné par --min-interval et --max-interval (en heures) : un flux actif est
+relu toutes les quelques heures, un flux en sommeil depuis des semaines
+une fois par --max-interval ; dès qu'un nouveau bulletin est détecté,
+l'intervalle retombe au minimum.
+
+Les options de génération de create_rss_robust.py (--formats, --record,
+--replay, --no-cache, --max-items, --tiered, --paginate, --max-pages,
+--streaming, --profile) sont appliquées à chaque flux régénéré ; --formats
+s'ajoute aux formats de la colonne C. Toute autre option est une erreur.
+Avec --profile, les profils des flux relus s'ajoutent à ceux de profilage/
+(ceux de create_rss_robust.py lancé juste avant par update_flux_rss.bat).
+
+Usage:
+    python scheduler.py <liste.csv|liste.xlsx> [--min-interval=2] [--max-interval=168]
+    python scheduler.py <liste.csv|liste.xlsx> --plan     (échéances, sans rien télécharger)
+    python scheduler.py <liste.csv|liste.xlsx> --force    (tous les flux, maintenant)
+    python scheduler.py <liste.csv|liste.xlsx> --tiered --formats=atom   (options de génération)
+"""
+
+import os
+import sys
+import json
+import time
+
+import snapshot_archive
+from feed_io import load_feed_items, pub_timestamp, write_atomic
+from feed_hints import freshness_interval
+from feed_formats import parse_formats
+from profiling import run_profiled, print_summary
+from create_rss import read_csv, read_xlsx
+from create_rss_robust import process_page_to_rss, build_output_path
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(BASE_DIR, 'planification.json')
+MIN_INTERVAL = 2 * 3600
+MAX_INTERVAL = 7 * 24 * 3600
+# Changements conservés par flux
+KEEP_CHANGES = 20
+SCHEDULER_OPTIONS = ('min-interval', 'max-interval', 'plan', 'force')
+# Options de create_rss_robust.py appliquées à chaque génération
+GENERATOR_OPTIONS = ('formats', 'record', 'replay', 'no-cache', 'max-items', 'tiered',
+                     'paginate', 'max-pages', 'streaming', 'profile')
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=STATE_PATH):
+    write_atomic(path, json.dumps(state, ensure_ascii=False, indent=1).encode('utf-8'))
+
+
+def publication_times(items, now):
+    """Dates de publication distinctes (au jour près) des items, hors dates futures."""
+    days = {int(pub_timestamp(it)) // 86400 * 86400 for it in items}
+    return sorted(t for t in days if 0 < t <= now)[-KEEP_CHANGES:]
+
+
+def next_interval(changes, now, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+    """Intervalle avant la prochaine lecture, d'après les dates de changement."""
+    if not changes:
+        return min_interval
+    return freshness_interval(changes[-1], now, min_interval, max_interval)
+
+
+def record_check(entry, items, previous_guids, now, min_interval, max_interval):
+    """Met à jour l'historique d'un flux après une lecture ; retourne True s'il a changé."""
+    changes = entry.setdefault('changes', [])
+    changed = False
+    if not changes and not previous_guids:
+        # Première lecture : l'historique part des dates des bulletins
+        changes.extend(publication_times(items, now))
+    elif any(it.get('guid') not in previous_guids for it in items):
+        changes.append(now)
+        changed = True
+    del changes[:-KEEP_CHANGES]
+    entry['last_check'] = now
+    entry['interval'] = next_interval(changes, now, min_interval, max_interval)
+    entry['next_check'] = now + entry['interval']
+    entry['checks'] = entry.get('checks', 0) + 1
+    return changed
+
+
+def generator_kwargs(options):
+    """Arguments de process_page_to_rss d'après les options de génération."""
+    return dict(paginate='paginate' in options,
+                max_pages=int(options.get('max-pages') or 50),
+                streaming='streaming' in options,
+                use_cache='no-cache' not in options and 'replay' not in options,
+                max_items=int(options['max-items']) if options.get('max-items') else None,
+                tiered='tiered' in options)
+
+
+def _duration(seconds):
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f} j"
+    return f"{seconds / 3600:.1f} h"
+
+
+def run(tasks, state, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, force=False,
+        options=None):
+    """
+    Régénère les flux dont l'échéance est passée, avec les options de
+    génération `options` (voir GENERATOR_OPTIONS). Retourne (lus, changés, sautés).
+    """
+    options = options or {}
+    kwargs = generator_kwargs(options)
+    checked = changed = skipped = 0
+    for url, name, formats in tasks:
+        if not url:
+            continue
+        output_path = build_output_path(url, name or None)
+        key = os.path.basename(output_path)
+        entry = state.setdefault(key, {'url': url})
+        now = time.time()
+        if not force and entry.get('next_check', 0) > now:
+            skipped += 1
+            continue
+
+        previous_guids = {it.get('guid') for it in load_feed_items(output_path)}
+        formats = parse_formats(','.join(formats + [options.get('formats') or '']))
+        if 'profile' in options:
+            success, message = run_profiled(output_path, process_page_to_rss, url, name or None,
+                                            formats=formats, **kwargs)
+        else:
+            success, message = process_page_to_rss(url, name or None, formats=formats, **kwargs)
+        checked += 1
+        if not success:
+            # Page inaccessible : nouvel essai au plus tôt
+            print(f"❌ {key} : {message}")
+            entry['last_check'] = now
+            entry['next_check'] = now + min_interval
+            continue
+        if record_check(entry, load_feed_items(output_path), previous_guids, time.time(),
+                        min_interval, max_interval):
+            changed += 1
+        print(f"🗓️  {key} : prochaine lecture dans {_duration(entry['interval'])}")
+    return checked, changed, skipped
+
+
+def print_plan(tasks, state):
+    now = time.time()
+    print(f"  {'Flux':35} {'Intervalle':>10} {'Échéance':>12} {'Dernier changement':>20}")
+    for url, name, _ in tasks:
+        if not url:
+            continue
+        key = os.path.basename(build_output_path(url, name or None))
+        entry = state.get(key, {})
+        due = entry.get('next_check', 0) - now
+        changes = entry.get('changes') or []
+        print(f"  {key:35} {_duration(entry.get('interval', 0)):>10} "
+              f"{'maintenant' if due <= 0 else 'dans ' + _duration(due):>12} "
+              f"{time.strftime('%d/%m/%Y', time.localtime(changes[-1])) if changes else '-':>20}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    unknown = [name for name in options if name not in SCHEDULER_OPTIONS + GENERATOR_OPTIONS]
+    if unknown:
+        print(f"❌ Option(s) non prise(s) en charge : {', '.join('--' + name for name in unknown)}")
+        print(f"   Options de génération transmises : {', '.join('--' + name for name in GENERATOR_OPTIONS)}")
+        sys.exit(1)
+    listpath = args[0]
+    try:
+        tasks = read_csv(listpath) if listpath.lower().endswith('.csv') else read_xlsx(listpath)
+    except Exception as e:
+        print(f"❌ Impossible de lire le fichier: {e}")
+        sys.exit(1)
+    min_interval = float(options.get('min-interval') or MIN_INTERVAL / 3600) * 3600
+    max_interval = float(options.get('max-interval') or MAX_INTERVAL / 3600) * 3600
+
+    state = load_state()
+    if 'plan' in options:
+        print_plan(tasks, state)
+        return
+    # --record / --replay : instantanés des pages (voir snapshot_archive.py)
+    snapshot_archive.configure(options)
+    start = time.time()
+    try:
+        checked, changed, skipped = run(tasks, state, min_interval, max_interval,
+                                        force='force' in options, options=options)
+    finally:
+        save_state(state)
+    if 'profile' in options:
+        print_summary()
+    print()
+    print(f"✅ {checked} flux relu(s), {changed} avec nouveaux bulletins, "
+          f"{skipped} pas encore à échéance ({time.time() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
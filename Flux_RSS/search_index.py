@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""search_index.py
+Index de recherche plein texte (SQLite FTS5) sur tous les bulletins générés.
+
+L'index est mis à jour à chaque écriture de flux (feed_publish) avec les
+items extraits par extract_bulletins_smart / extract_bulletins_from_index :
+seuls les bulletins nouveaux ou modifiés sont réécrits. La recherche ignore
+accents et majuscules ("mildiou", "Mildiou", "MILDIOU" ; "fevrier" trouve
+"février") et les résultats sont classés par pertinence (bm25).
+
+Usage:
+    python search_index.py <mots...> [--limit=20] [--feed=Auvergne.xml]
+    python search_index.py --rebuild      (réindexe tout liste_des_flux/)
+"""
+
+import os
+import sys
+import glob
+import time
+import sqlite3
+from hashlib import md5
+
+from feed_io import iter_feed_items, pub_timestamp
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'index_recherche.sqlite')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS bulletins (
+    guid TEXT PRIMARY KEY,
+    feed TEXT NOT NULL,
+    title TEXT,
+    link TEXT,
+    description TEXT,
+    pubDate TEXT,
+    ts INTEGER,
+    category TEXT,
+    author TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS bulletins_feed ON bulletins(feed);
+CREATE VIRTUAL TABLE IF NOT EXISTS bulletins_fts USING fts5(
+    title, description, category,
+    content='bulletins', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS bulletins_ai AFTER INSERT ON bulletins BEGIN
+    INSERT INTO bulletins_fts(rowid, title, description, category)
+    VALUES (new.rowid, new.title, new.description, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS bulletins_ad AFTER DELETE ON bulletins BEGIN
+    INSERT INTO bulletins_fts(bulletins_fts, rowid, title, description, category)
+    VALUES ('delete', old.rowid, old.title, old.description, old.category);
+END;
+CREATE TRIGGER IF NOT EXISTS bulletins_au AFTER UPDATE ON bulletins BEGIN
+    INSERT INTO bulletins_fts(bulletins_fts, rowid, title, description, category)
+    VALUES ('delete', old.rowid, old.title, old.description, old.category);
+    INSERT INTO bulletins_fts(rowid, title, description, category)
+    VALUES (new.rowid, new.title, new.description, new.category);
+END;
+'''
+
+UPSERT = '''
+INSERT INTO bulletins (guid, feed, title, link, description, pubDate, ts,
+                       category, author, content_hash)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(guid) DO UPDATE SET
+    feed = excluded.feed, title = excluded.title, link = excluded.link,
+    description = excluded.description, pubDate = excluded.pubDate,
+    ts = excluded.ts, category = excluded.category, author = excluded.author,
+    content_hash = excluded.content_hash
+WHERE bulletins.content_hash != excluded.content_hash
+'''
+
+
+def connect(db_path=DB_PATH):
+    """Ouvre la base et crée le schéma si besoin (lève sqlite3.Error sans FTS5)."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def update_index(feed_name, items, category=None, author=None, db_path=DB_PATH):
+    """
+    Ajoute ou met à jour les bulletins d'un flux dans l'index.
+
+    Returns:
+        Nombre de bulletins insérés ou modifiés
+    """
+    rows = []
+    for it in items:
+        if not it.get('guid'):
+            continue
+        values = (
+            it.get('title'), it.get('link'), it.get('description'), it.get('pubDate'),
+            category or it.get('category'), author or it.get('author'),
+        )
+        content_hash = md5('\x1f'.join(v or '' for v in values).encode('utf-8')).hexdigest()
+        rows.append((it['guid'], feed_name, values[0], values[1], values[2], values[3],
+                     int(pub_timestamp(it)), values[4], values[5], content_hash))
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(UPSERT, rows)
+            return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def match_expression(query):
+    """Transforme une saisie libre en requête FTS5 (tous les mots, préfixes acceptés)."""
+    terms = [t.replace('"', '""') for t in query.split() if t.strip('"')]
+    return ' '.join(f'"{t}"*' for t in terms)
+
+
+def search(query, limit=20, feed=None, db_path=DB_PATH):
+    """
+    Recherche plein texte.
+
+    Returns:
+        Liste de dict (feed, title, link, pubDate, score), du plus pertinent au moins pertinent
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    sql = '''
+        SELECT b.feed, b.title, b.link, b.pubDate,
+               bm25(bulletins_fts, 10.0, 1.0, 2.0) AS score
+        FROM bulletins_fts JOIN bulletins b ON b.rowid = bulletins_fts.rowid
+        WHERE bulletins_fts MATCH ?
+    '''
+    params = [expression]
+    if feed:
+        sql += ' AND b.feed = ?'
+        params.append(feed)
+    sql += ' ORDER BY score, b.ts DESC LIMIT ?'
+    params.append(limit)
+
+    conn = connect(db_path)
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+    finally:
+        conn.close()
+
+
+def rebuild(feeds_dir, db_path=DB_PATH):
+    """Indexe tous les flux .xml d'un dossier ; retourne le nombre de bulletins indexés."""
+    total = 0
+    for path in sorted(glob.glob(os.path.join(feeds_dir, '*.xml'))):
+        items = list(iter_feed_items(path))
+        update_index(os.path.basename(path), items, db_path=db_path)
+        total += len(items)
+    return total
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    try:
+        if 'rebuild' in options:
+            feeds_dir = args[0] if args else os.path.join(BASE_DIR, 'liste_des_flux')
+            count = rebuild(feeds_dir)
+            print(f"✅ {count} bulletin(s) indexé(s) dans {DB_PATH}")
+            return
+
+        if not args:
+            print(__doc__)
+            sys.exit(1)
+
+        start = time.perf_counter()
+        results = search(' '.join(args), int(options.get('limit') or 20), options.get('feed'))
+        elapsed = (time.perf_counter() - start) * 1000
+    except sqlite3.Error as e:
+        print(f"❌ Index de recherche indisponible: {e}")
+        sys.exit(1)
+
+    print(f"🔎 {len(results)} résultat(s) en {elapsed:.1f} ms")
+    for i, r in enumerate(results, 1):
+        print(f"  {i}. [{os.path.splitext(r['feed'])[0]}] {r['title']}")
+        print(f"     📅 {r['pubDate']}  🔗 {r['link']}")
+
+
+if __name__ == '__main__':
+    main()
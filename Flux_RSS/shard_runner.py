@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""shard_runner.py
+Exécution de create_rss.py répartie sur plusieurs machines (ou processus).
+
+La liste des flux (Site.xlsx / .csv) est découpée en N lots (« shards ») de
+façon déterministe : chaque URL va dans le lot md5(hôte) % N. Toutes les
+pages d'un même site sont donc traitées par la même machine, l'une après
+l'autre, comme dans une exécution unique. Chaque lot écrit seulement ses
+flux (sans delta, index de recherche, archive Parquet ni notification, qui
+resteraient sur la machine du lot) et un manifeste partiel dans son propre
+dossier :
+
+    shards/shard-<k>-of-<N>/liste_des_flux/*.xml
+    shards/shard-<k>-of-<N>/manifest.json
+
+Une fois les dossiers des lots rapatriés sur une même machine (copie,
+rsync...), « merge » copie les flux et leurs pages d'archives dans
+liste_des_flux/, puis publie les deltas (liste_des_flux/deltas/manifest.json),
+met à jour l'index de recherche et l'archive Parquet et envoie les
+notifications de changement (feed_publish.publish_changes), comme si tout
+avait été généré ici.
+
+Usage:
+    python shard_runner.py plan  Site.xlsx --shards=4           (répartition)
+    python shard_runner.py run   Site.xlsx --shards=4 --shard=0 (sur chaque machine)
+    python shard_runner.py merge [--shards=4]                   (assemblage)
+    python shard_runner.py local Site.xlsx --shards=4           (N processus locaux + merge)
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import platform
+import subprocess
+from hashlib import md5
+from urllib.parse import urlparse
+
+from create_rss import read_csv, read_xlsx, process_single
+from feed_io import load_feed_items, load_guids, write_atomic
+from feed_archive import archive_files, archives_dir
+from feed_publish import feed_files, publish_changes
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARDS_DIR = os.path.join(BASE_DIR, 'shards')
+FEEDS_DIR = os.path.join(BASE_DIR, 'liste_des_flux')
+
+
+def shard_of(url, shards):
+    """Numéro de lot d'une URL : même hôte, même lot, sur toutes les machines."""
+    if not urlparse(url).scheme:
+        url = 'http://' + url
+    host = (urlparse(url).hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return int(md5(host.encode('utf-8')).hexdigest(), 16) % shards
+
+
+def read_tasks(listpath):
+    ext = os.path.splitext(listpath)[1].lower()
+    return read_csv(listpath) if ext == '.csv' else read_xlsx(listpath)
+
+
+def tasks_digest(tasks):
+    """Empreinte de la liste : tous les lots doivent partir de la même."""
+    return md5(json.dumps(tasks, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def shard_dir(shard, shards, root=SHARDS_DIR):
+    return os.path.join(root, f'shard-{shard}-of-{shards}')
+
+
+def run_shard(tasks, shard, shards, root=SHARDS_DIR):
+    """
+    Génère les flux du lot `shard` dans son dossier et écrit son manifeste
+    partiel. Retourne le manifeste.
+    """
+    directory = shard_dir(shard, shards, root)
+    outdir = os.path.join(directory, 'liste_des_flux')
+    os.makedirs(outdir, exist_ok=True)
+    manifest = {
+        'shard': shard,
+        'shards': shards,
+        'tasks_digest': tasks_digest(tasks),
+        'node': platform.node(),
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'feeds': [],
+        'failed': [],
+    }
+    page_cache = {}
+    for i, (url, name, formats) in enumerate(tasks, start=1):
+        if not url or shard_of(url, shards) != shard:
+            continue
+        try:
+            ok, info = process_single(url, name, formats, page_cache, outdir=outdir,
+                                      write_only=True)
+        except Exception as e:
+            ok, info = False, f'Exception: {e}'
+        if ok:
+            # Catégorie et auteur du flux, pour la publication au merge
+            first = next(iter(load_feed_items(info)), {})
+            manifest['feeds'].append({'index': i, 'url': url, 'file': os.path.basename(info),
+                                      'category': first.get('category'),
+                                      'author': first.get('author')})
+            print(f'[{i}] OK -> {info}')
+        else:
+            manifest['failed'].append({'index': i, 'url': url, 'error': info})
+            print(f'[{i}] ERREUR -> {info}')
+    manifest['finished'] = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    write_atomic(os.path.join(directory, 'manifest.json'),
+                 json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+    return manifest
+
+
+def load_manifests(shards=None, root=SHARDS_DIR):
+    """Manifestes partiels présents, par numéro de lot (N déduit s'il est unique)."""
+    if shards is None:
+        counts = {int(os.path.basename(p).rsplit('-of-', 1)[1])
+                  for p in glob.glob(os.path.join(root, 'shard-*-of-*'))}
+        if len(counts) != 1:
+            raise ValueError(f"Nombre de lots ambigu ({sorted(counts) or 'aucun lot'}) : préciser --shards=N")
+        shards = counts.pop()
+    manifests = {}
+    for shard in range(shards):
+        path = os.path.join(shard_dir(shard, shards, root), 'manifest.json')
+        try:
+            with open(path, encoding='utf-8') as f:
+                manifests[shard] = json.load(f)
+        except (OSError, ValueError):
+            pass
+    return shards, manifests
+
+
+def merge_shards(shards=None, root=SHARDS_DIR, feeds_dir=FEEDS_DIR):
+    """
+    Assemble les lots dans feeds_dir : copie des flux et de leurs archives,
+    puis même publication qu'après une génération locale (publish_changes).
+    Retourne le résumé écrit dans shards/merge.json.
+    """
+    shards, manifests = load_manifests(shards, root)
+    missing = [k for k in range(shards) if k not in manifests]
+    digests = {m['tasks_digest'] for m in manifests.values()}
+    if len(digests) > 1:
+        print("⚠️  Les lots ne sont pas partis de la même liste de flux")
+
+    os.makedirs(feeds_dir, exist_ok=True)
+    summary = {'shards': shards, 'missing': missing, 'feeds': [], 'failed': [],
+               'merged': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+    for shard, manifest in sorted(manifests.items()):
+        src_dir = os.path.join(shard_dir(shard, shards, root), 'liste_des_flux')
+        summary['failed'].extend(dict(f, shard=shard) for f in manifest['failed'])
+        for feed in manifest['feeds']:
+            name = feed['file']
+            src = os.path.join(src_dir, name)
+            dst = os.path.join(feeds_dir, name)
+            if not os.path.exists(src):
+                summary['failed'].append(dict(feed, shard=shard, error='flux absent du lot'))
+                continue
+            previous_guids = load_guids(dst)
+            # Pages d'archives (RFC 5005) avant le flux qui pointe vers elles
+            for path in archive_files(src):
+                os.makedirs(archives_dir(dst), exist_ok=True)
+                with open(path, 'rb') as f:
+                    write_atomic(os.path.join(archives_dir(dst), os.path.basename(path)), f.read())
+            # Flux et fichiers associés (.meta, formats, variantes .gz/.br)
+            for path in feed_files(src):
+                target = os.path.join(feeds_dir, os.path.basename(path))
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        write_atomic(target, f.read())
+                elif os.path.exists(target):
+                    # Absent du lot (format plus demandé, brotli non installé) :
+                    # ne pas servir l'ancien fichier
+                    os.remove(target)
+            items = load_feed_items(dst)
+            build = publish_changes(dst, items, previous_guids, feed.get('category'),
+                                    feed.get('author'), feeds_dir=feeds_dir)
+            summary['feeds'].append(dict(feed, shard=shard, items=len(items), build=build))
+    summary['feeds'].sort(key=lambda f: f['index'])
+    summary['failed'].sort(key=lambda f: f['index'])
+    write_atomic(os.path.join(root, 'merge.json'),
+                 json.dumps(summary, ensure_ascii=False, indent=1).encode('utf-8'))
+    return summary
+
+
+def run_local(listpath, shards, root=SHARDS_DIR):
+    """Lance les N lots en processus séparés sur cette machine, puis les assemble."""
+    processes = []
+    for shard in range(shards):
+        directory = shard_dir(shard, shards, root)
+        os.makedirs(directory, exist_ok=True)
+        log = open(os.path.join(directory, 'run.log'), 'w', encoding='utf-8')
+        cmd = [sys.executable, os.path.abspath(__file__), 'run', listpath,
+               f'--shards={shards}', f'--shard={shard}']
+        processes.append((shard, subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT,
+                                                  env=dict(os.environ, PYTHONIOENCODING='utf-8')), log))
+    for shard, process, log in processes:
+        code = process.wait()
+        log.close()
+        print(f"{'✅' if code == 0 else '❌'} Lot {shard} terminé (code {code}, "
+              f"{os.path.relpath(log.name, BASE_DIR)})")
+    return merge_shards(shards, root)
+
+
+def print_summary(summary):
+    print('\nRésumé:')
+    print(f"  Lots    : {summary['shards'] - len(summary['missing'])}/{summary['shards']}")
+    print(f"  Traités : {len(summary['feeds'])}")
+    print(f"  Échecs  : {len(summary['failed'])}")
+    for f in summary['failed']:
+        print(f"   [{f['index']}] lot {f['shard']} : {f['url']} -> {f['error']}")
+    if summary['missing']:
+        print(f"⚠️  Lot(s) sans manifeste : {', '.join(map(str, summary['missing']))}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+    if not args or args[0] not in ('plan', 'run', 'merge', 'local'):
+        print(__doc__)
+        sys.exit(1)
+    command = args[0]
+    shards = int(options['shards']) if options.get('shards') else None
+
+    if command == 'merge':
+        try:
+            summary = merge_shards(shards)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print_summary(summary)
+        sys.exit(1 if summary['missing'] else 0)
+
+    if len(args) < 2 or not shards or shards < 1:
+        print("❌ Fichier de liste et --shards=N requis")
+        sys.exit(1)
+    listpath = os.path.abspath(os.path.expanduser(args[1]))
+    try:
+        tasks = read_tasks(listpath)
+    except Exception as e:
+        print(f"❌ Impossible de lire le fichier: {e}")
+        sys.exit(1)
+
+    if command == 'plan':
+        counts = [0] * shards
+        hosts = [set() for _ in range(shards)]
+        for url, _, _ in tasks:
+            if url:
+                shard = shard_of(url, shards)
+                counts[shard] += 1
+                hosts[shard].add(urlparse(url if urlparse(url).scheme else 'http://' + url).hostname)
+        for shard in range(shards):
+            print(f"  Lot {shard} : {counts[shard]} flux, {len(hosts[shard])} site(s)")
+    elif command == 'run':
+        shard = int(options.get('shard') or 0)
+        if not 0 <= shard < shards:
+            print(f"❌ --shard doit être compris entre 0 et {shards - 1}")
+            sys.exit(1)
+        manifest = run_shard(tasks, shard, shards)
+        print(f"\n📦 Lot {shard}/{shards} : {len(manifest['feeds'])} flux, "
+              f"{len(manifest['failed'])} échec(s)")
+    else:
+        start = time.time()
+        summary = run_local(listpath, shards)
+        print_summary(summary)
+        print(f"⏱️  {time.time() - start:.1f}s")
+        sys.exit(1 if summary['missing'] else 0)
+
+
+if __name__ == '__main__':
+    main()
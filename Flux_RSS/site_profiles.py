@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""site_profiles.py
+Profils d'extraction par site pour create_rss_robust.py.
+
+Sans profil, extract_bulletins_smart parcourt tous les <a> de la page et
+devine les bulletins avec des mots-clés (menus et pieds de page compris).
+Un profil indique où se trouve la liste des bulletins : seuls les liens de
+ce sous-arbre sont examinés.
+
+Les profils sont lus dans profils_sites.json (à côté du script, voir
+profils_sites.exemple.json) :
+
+    {"profiles": [
+        {"name": "DRAAF Nouvelle-Aquitaine",
+         "host": "draaf.nouvelle-aquitaine.agriculture.gouv.fr",
+         "path": "/vigne-*",
+         "container": "#contenu .texte",
+         "link": "a[href]",
+         "date": "time, .date"}
+    ]}
+
+  - host, path : motifs fnmatch (path facultatif, "*" par défaut) ;
+  - container : sélecteur CSS de la liste des bulletins ;
+  - link : sélecteur des liens dans cette liste (par défaut "a[href]") ;
+  - date : sélecteur facultatif de la date, cherché près de chaque lien.
+
+Le premier profil qui correspond à l'URL est utilisé. Les sélecteurs sont
+compilés une seule fois (soupsieve) et le fichier n'est relu que s'il a
+changé. Si aucun profil ne correspond, ou si le profil ne trouve aucun
+lien (page modifiée), l'heuristique actuelle est utilisée.
+
+Avec le module cssselect (pip install cssselect), le sélecteur container est
+aussi compilé pour lxml : create_rss_robust.py repère les conteneurs dans
+l'arbre lxml et ne construit l'arbre BeautifulSoup que de ces sous-arbres.
+Sans lui (ou pour un sélecteur que cssselect ne sait pas traduire), toute
+la page est analysée par BeautifulSoup. --streaming ne sait pas appliquer un
+profil : la page d'un site avec profil est analysée normalement.
+
+Usage:
+    python site_profiles.py <url>      (profil utilisé et comparaison avec l'heuristique)
+"""
+
+import os
+import sys
+import json
+import time
+from fnmatch import fnmatch
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import soupsieve
+
+try:
+    from lxml.cssselect import CSSSelector
+    from cssselect import SelectorError
+    _HAS_CSSSELECT = True
+except ImportError:
+    _HAS_CSSSELECT = False
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES_PATH = os.path.join(BASE_DIR, 'profils_sites.json')
+DEFAULT_LINK_SELECTOR = 'a[href]'
+
+# (chemin, mtime) -> profils compilés
+_loaded = {}
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Sélecteur CSS compilé (une fois par sélecteur et par processus)."""
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=None)
+def compile_lxml_selector(selector):
+    """Même sélecteur pour un arbre lxml (XPath), ou None sans cssselect ou s'il est intraduisible."""
+    if not _HAS_CSSSELECT:
+        return None
+    try:
+        return CSSSelector(selector, translator='html')
+    except SelectorError:
+        return None
+
+
+def load_profiles(path=PROFILES_PATH):
+    """
+    Lit et compile les profils ; [] si le fichier est absent.
+    Un profil invalide est signalé et ignoré.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f).get('profiles', [])
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Profils de sites illisibles ({path}): {e}")
+        entries = []
+
+    profiles = []
+    for entry in entries:
+        try:
+            profiles.append({
+                'name': entry.get('name') or entry['host'],
+                'host': entry['host'].lower(),
+                'path': entry.get('path') or '*',
+                'container': compile_selector(entry['container']),
+                'container_lxml': compile_lxml_selector(entry['container']),
+                'link': compile_selector(entry.get('link') or DEFAULT_LINK_SELECTOR),
+                'date': compile_selector(entry['date']) if entry.get('date') else None,
+            })
+        except (KeyError, AttributeError, soupsieve.SelectorSyntaxError) as e:
+            print(f"⚠️  Profil ignoré {entry!r}: {e}")
+    _loaded[path] = (mtime, profiles)
+    return profiles
+
+
+def profiles_signature(path=PROFILES_PATH):
+    """Identifie la version du fichier de profils (0 s'il est absent), pour les caches."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def find_profile(url, path=PROFILES_PATH):
+    """Premier profil correspondant à l'URL, ou None."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    for profile in load_profiles(path):
+        if fnmatch(host, profile['host']) and fnmatch(parsed.path or '/', profile['path']):
+            return profile
+    return None
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    url = sys.argv[1]
+    profile = find_profile(url)
+    if profile is None:
+        print(f"ℹ️  Aucun profil pour {url} (heuristique par mots-clés)")
+        return
+    print(f"🧭 Profil « {profile['name']} »")
+
+    # Import local : create_rss_robust importe ce module
+    import create_rss_robust as robust
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(robust.fetch_page(url), 'lxml')
+    for label, extract in (
+            ('profil', lambda: robust.extract_bulletins_with_profile(soup, url, profile)),
+            ('heuristique', lambda: robust.extract_links_heuristic(soup, url, ['bsv', 'bulletin']))):
+        start = time.perf_counter()
+        bulletins = extract()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {label:12} : {len(bulletins)} bulletin(s) en {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""snapshot_archive.py
+Instantanés des pages téléchargées : enregistrement puis rejeu hors ligne.
+
+Après la correction d'une heuristique d'extraction, il fallait tout
+retélécharger depuis les sites des DRAAF pour régénérer les flux. Avec
+--record, chaque réponse reçue par les scripts (create_rss.py,
+create_rss_from_index.py, create_rss_robust.py) est conservée ; avec
+--replay, les mêmes scripts relisent ces réponses au lieu du réseau :
+
+    python create_rss_robust.py --pipeline liste.xlsx --record
+    python create_rss_robust.py --pipeline liste.xlsx --replay
+    python create_rss_from_index.py <URL> --replay=2025-07-01   (état à cette date)
+
+Organisation du dossier snapshots/ :
+
+    snapshots/index.jsonl          une ligne par réponse : URL, date, statut,
+                                   en-têtes, empreinte SHA-256 du corps
+    snapshots/pages/ab/<sha256>.gz corps compressés (gzip), un seul
+                                   exemplaire par contenu
+
+Une page inchangée depuis son dernier enregistrement n'ajoute rien. Le
+rejeu prend, pour chaque URL, la réponse la plus récente (ou la plus
+récente jusqu'à la date indiquée) ; une URL jamais enregistrée est une
+erreur, aucun accès réseau n'est fait. En rejeu, le cache d'extraction
+(extraction_cache.py) est ignoré : les pages sont toujours réanalysées.
+
+Usage:
+    python snapshot_archive.py          (statistiques de l'archive)
+    python snapshot_archive.py <URL>    (historique des réponses d'une URL)
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import email.message
+import threading
+import urllib.error
+from hashlib import sha256
+
+from feed_io import write_atomic
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, 'snapshots')
+INDEX_NAME = 'index.jsonl'
+
+# Mode choisi en ligne de commande (configure) : enregistrement, rejeu
+# (avec date limite éventuelle) et dossier de l'archive
+_state = {'record': False, 'replay': False, 'before': None, 'directory': SNAPSHOT_DIR}
+# Réponses connues par URL, chargées une fois depuis index.jsonl
+_index = {}
+_loaded = set()
+# Threads de téléchargement du mode pipeline
+_lock = threading.Lock()
+
+
+def configure(options, directory=SNAPSHOT_DIR):
+    """
+    Active l'enregistrement (--record) ou le rejeu (--replay[=AAAA-MM-JJ])
+    d'après les options de la ligne de commande.
+    """
+    replay = options.get('replay')
+    _state['record'] = 'record' in options and 'replay' not in options
+    _state['replay'] = 'replay' in options
+    _state['before'] = None
+    _state['directory'] = directory
+    if isinstance(replay, str) and replay:
+        # Toute la journée indiquée (heure locale)
+        _state['before'] = time.mktime(time.strptime(replay, '%Y-%m-%d')) + 86400
+    if _state['record']:
+        print(f"📼 Réponses enregistrées dans {directory}")
+    elif _state['replay']:
+        limit = f" (état au {replay})" if _state['before'] else ''
+        print(f"📼 Rejeu hors ligne depuis {directory}{limit}")
+
+
+def recording():
+    return _state['record']
+
+
+def replaying():
+    return _state['replay']
+
+
+def _page_path(directory, digest):
+    return os.path.join(directory, 'pages', digest[:2], digest + '.gz')
+
+
+def _history(directory):
+    """Réponses enregistrées par URL (dans l'ordre d'enregistrement)."""
+    if directory not in _loaded:
+        history = _index.setdefault(directory, {})
+        try:
+            with open(os.path.join(directory, INDEX_NAME), encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Ligne tronquée (interruption pendant l'écriture)
+                        continue
+                    history.setdefault(entry['url'], []).append(entry)
+        except FileNotFoundError:
+            pass
+        _loaded.add(directory)
+    return _index[directory]
+
+
+def _content_type(headers):
+    return next((value for name, value in headers if name.lower() == 'content-type'), None)
+
+
+def record(url, status, reason, headers, body, directory=None):
+    """
+    Enregistre une réponse si le mode --record est actif (sinon ne fait rien).
+
+    Args:
+        headers: en-têtes HTTP, paires (nom, valeur) ou dict
+        body: corps de la réponse (bytes)
+    """
+    if not _state['record']:
+        return
+    directory = directory or _state['directory']
+    headers = [[name, value] for name, value in (headers.items() if hasattr(headers, 'items') else headers)]
+    digest = sha256(body).hexdigest()
+    with _lock:
+        entries = _history(directory).setdefault(url, [])
+        # Même contenu que la dernière fois (les en-têtes comme Date changent
+        # à chaque requête : seul Content-Type compte, pour le décodage)
+        last = entries[-1] if entries else None
+        if last and (last['sha256'], last['status'], _content_type(last['headers'])) == \
+                (digest, status, _content_type(headers)):
+            return
+        path = _page_path(directory, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, gzip.compress(body, mtime=0))
+        entry = {'url': url, 'time': time.time(), 'status': status, 'reason': reason,
+                 'headers': headers, 'sha256': digest, 'size': len(body)}
+        with open(os.path.join(directory, INDEX_NAME), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        entries.append(entry)
+
+
+def load(url, directory=None):
+    """
+    Réponse enregistrée pour une URL (la plus récente, ou la plus récente
+    avant la date de --replay=AAAA-MM-JJ).
+
+    Returns:
+        dict avec status, reason, headers (paires), body (bytes), time
+
+    Raises:
+        FileNotFoundError si l'URL n'a jamais été enregistrée
+    """
+    directory = directory or _state['directory']
+    with _lock:
+        entries = _history(directory).get(url, [])
+    if _state['before'] is not None:
+        entries = [e for e in entries if e['time'] < _state['before']]
+    if not entries:
+        raise FileNotFoundError(f"Page absente des instantanés: {url}")
+    entry = entries[-1]
+    with gzip.open(_page_path(directory, entry['sha256']), 'rb') as f:
+        body = f.read()
+    return dict(entry, body=body)
+
+
+def replay_text(url):
+    """
+    Équivalent de fetch (create_rss.py, create_rss_from_index.py) en rejeu :
+    texte de la page décodé selon le charset de Content-Type, sinon UTF-8 ;
+    une erreur HTTP enregistrée est relevée comme urllib.error.HTTPError.
+    """
+    snapshot = load(url)
+    headers = email.message.Message()
+    for name, value in snapshot['headers']:
+        headers[name] = value
+    if snapshot['status'] >= 400:
+        raise urllib.error.HTTPError(url, snapshot['status'], snapshot['reason'], headers, None)
+    charset = headers.get_content_charset() or 'utf-8'
+    return snapshot['body'].decode(charset, errors='replace')
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    history = _history(SNAPSHOT_DIR)
+    if not history:
+        print(f"ℹ️  Aucun instantané ({SNAPSHOT_DIR} vide ou absent)")
+        return
+
+    if args:
+        entries = history.get(args[0], [])
+        if not entries:
+            print(f"ℹ️  Aucun instantané pour {args[0]}")
+            return
+        for entry in entries:
+            print(f"  {time.strftime('%d/%m/%Y %H:%M', time.localtime(entry['time']))}  "
+                  f"HTTP {entry['status']}  {entry['size']:>10,} octets  {entry['sha256'][:12]}")
+        return
+
+    responses = sum(len(entries) for entries in history.values())
+    raw = sum(e['size'] for entries in history.values() for e in entries)
+    pages = {e['sha256'] for entries in history.values() for e in entries}
+    stored = sum(os.path.getsize(_page_path(SNAPSHOT_DIR, d)) for d in pages
+                 if os.path.exists(_page_path(SNAPSHOT_DIR, d)))
+    print(f"📼 {len(history)} URL(s), {responses} réponse(s), {len(pages)} contenu(s) distinct(s)")
+    print(f"   {raw / 1e6:.1f} Mo reçus, {stored / 1e6:.1f} Mo sur disque")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,9 +15,12 @@ cd /d "%~dp0"
 REM Configuration - Modifiez ces lignes selon vos besoins
 REM -------------------------------------------------------
 
+REM Les options passées au .bat sont transmises (ex. : update_flux_rss.bat --profile)
+REM (scheduler.py refuse les options qu'il ne peut pas transmettre, voir son aide)
+
 REM Viticulture Auvergne
 echo [1/3] Mise a jour : Viticulture Auvergne...
-python create_rss_robust.py "https://draaf.auvergne-rhone-alpes.agriculture.gouv.fr/viticulture-auvergne-2025-r1445.html" "Viticulture_Auvergne.xml"
+python create_rss_robust.py "https://draaf.auvergne-rhone-alpes.agriculture.gouv.fr/viticulture-auvergne-2025-r1445.html" "Viticulture_Auvergne.xml" %*
 if %errorlevel% neq 0 (
     echo ERREUR lors de la mise a jour de Viticulture Auvergne
 ) else (
@@ -36,6 +39,23 @@ REM echo [3/3] Mise a jour : Arboriculture...
 REM python create_rss_robust.py "URL_ARBORICULTURE" "Arboriculture.xml"
 REM echo.
 
+REM Flux listés dans flux_planifies.csv (URL,nom) : chacun relu à son rythme,
+REM seulement quand son échéance est passée (voir scheduler.py). Planifier ce
+REM .bat toutes les heures suffit.
+if exist "flux_planifies.csv" (
+    echo Mise a jour des flux planifies...
+    python scheduler.py flux_planifies.csv %*
+    echo.
+)
+
+REM Changements depuis la derniere execution (bulletins ajoutes/retires/modifies)
+python diff_feeds.py --snapshot
+echo.
+
+REM Copie des flux modifies vers le tableau de bord (Flux affichage\liste_des_flux)
+python publish_feeds.py
+echo.
+
 echo ========================================================================
 echo   Mise a jour terminee
 echo ========================================================================
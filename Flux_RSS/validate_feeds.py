@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""validate_feeds.py
+Validation en masse des flux RSS générés (remplace verify_rss.py pour les
+contrôles automatiques après chaque exécution).
+
+Chaque fichier est lu en flux (iterparse + libération des éléments), donc
+avec une mémoire constante, et les fichiers sont vérifiés en parallèle.
+
+Contrôles :
+  - XML bien formé, racine <rss version="2.0"> et <channel>
+  - champs obligatoires du canal (title, link, description)
+  - champs obligatoires des items (title, link, guid, pubDate)
+  - guid en double
+  - dates lisibles, ni dans le futur ni antérieures à MIN_YEAR
+  - nombre d'items (au moins --min-items)
+
+Usage:
+    python validate_feeds.py [dossier_ou_fichiers...] [--json] [--report=rapport.json]
+                             [--min-items=1] [--workers=N]
+
+Code de sortie : 0 si aucun flux en erreur, 1 sinon.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import email.utils
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+
+CHANNEL_REQUIRED = ('title', 'link', 'description')
+ITEM_REQUIRED = ('title', 'link', 'guid', 'pubDate')
+MIN_YEAR = 1990
+# Tolérance pour les dates « dans le futur » (fuseaux, horloges)
+FUTURE_TOLERANCE = 2 * 86400
+
+
+def parse_rfc822(text):
+    """Timestamp d'une date RFC 822, ou None si illisible."""
+    parsed = email.utils.parsedate_tz(text or '')
+    if parsed is None:
+        return None
+    try:
+        return email.utils.mktime_tz(parsed)
+    except (OverflowError, ValueError):
+        return None
+
+
+def validate_feed(path, min_items=1):
+    """
+    Valide un flux RSS en un seul passage.
+
+    Returns:
+        dict avec file, ok, items, errors, warnings
+    """
+    report = {'file': path, 'ok': True, 'items': 0, 'errors': [], 'warnings': []}
+    errors = report['errors']
+    warnings = report['warnings']
+    now = time.time()
+    guids = set()
+    channel_fields = {}
+    channel = None
+    root_checked = False
+    undated = 0
+    depth = 0
+    readable = True
+
+    try:
+        for event, elem in ET.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if not root_checked:
+                    root_checked = True
+                    if elem.tag != 'rss':
+                        errors.append(f"racine <{elem.tag}> au lieu de <rss>")
+                    elif elem.get('version') != '2.0':
+                        warnings.append(f"version RSS {elem.get('version')!r} (attendu 2.0)")
+                elif elem.tag == 'channel' and depth == 2:
+                    channel = elem
+                continue
+
+            depth -= 1
+            if depth == 2 and elem.tag != 'item':
+                # Champ du canal (title, link, lastBuildDate...)
+                channel_fields[elem.tag] = (elem.text or '').strip()
+                continue
+            if elem.tag != 'item' or depth != 2:
+                continue
+
+            report['items'] += 1
+            n = report['items']
+            fields = {child.tag: (child.text or '').strip() for child in elem}
+            for name in ITEM_REQUIRED:
+                if not fields.get(name):
+                    errors.append(f"item {n} : <{name}> manquant ou vide")
+
+            guid = fields.get('guid')
+            if guid:
+                if guid in guids:
+                    errors.append(f"item {n} : guid en double {guid}")
+                guids.add(guid)
+
+            if fields.get('pubDate'):
+                ts = parse_rfc822(fields['pubDate'])
+                if ts is None:
+                    errors.append(f"item {n} : pubDate illisible {fields['pubDate']!r}")
+                elif ts > now + FUTURE_TOLERANCE:
+                    warnings.append(f"item {n} : pubDate dans le futur ({fields['pubDate']})")
+                elif time.gmtime(ts).tm_year < MIN_YEAR:
+                    warnings.append(f"item {n} : pubDate antérieure à {MIN_YEAR}")
+                elif fields['pubDate'] == channel_fields.get('lastBuildDate'):
+                    # Date de repli (date de génération) : bulletin non daté
+                    undated += 1
+
+            # Libérer les items déjà contrôlés
+            if channel is not None:
+                del channel[:]
+    except ET.ParseError as e:
+        errors.append(f"XML mal formé : {e}")
+        readable = False
+    except OSError as e:
+        errors.append(f"lecture impossible : {e}")
+        readable = False
+
+    if readable and channel is None:
+        errors.append("élément <channel> absent")
+    elif channel is not None and readable:
+        for name in CHANNEL_REQUIRED:
+            if not channel_fields.get(name):
+                errors.append(f"canal : <{name}> manquant ou vide")
+        build = channel_fields.get('lastBuildDate')
+        if build and parse_rfc822(build) is None:
+            warnings.append(f"lastBuildDate illisible {build!r}")
+
+    if report['items'] < min_items and not errors:
+        errors.append(f"{report['items']} item(s), minimum attendu {min_items}")
+    if undated:
+        warnings.append(f"{undated} item(s) datés de la génération (date non trouvée)")
+
+    report['ok'] = not errors
+    return report
+
+
+def collect_paths(targets):
+    """Liste des fichiers .xml à valider (dossiers parcourus, non récursif)."""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(sorted(glob.glob(os.path.join(target, '*.xml'))))
+        else:
+            paths.append(target)
+    return paths
+
+
+def validate_all(paths, min_items=1, workers=None):
+    """Valide plusieurs flux en parallèle ; retourne le rapport global."""
+    start = time.time()
+    if len(paths) <= 1 or workers == 1:
+        results = [validate_feed(p, min_items) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_feed, paths, [min_items] * len(paths),
+                                    chunksize=max(1, len(paths) // 32)))
+    return {
+        'generated': email.utils.formatdate(time.time(), usegmt=True),
+        'elapsed': round(time.time() - start, 3),
+        'summary': {
+            'files': len(results),
+            'valid': sum(1 for r in results if r['ok']),
+            'invalid': sum(1 for r in results if not r['ok']),
+            'items': sum(r['items'] for r in results),
+            'warnings': sum(len(r['warnings']) for r in results),
+        },
+        'files': results,
+    }
+
+
+def print_report(report):
+    """Affichage lisible du rapport."""
+    print("=" * 70)
+    print("  🔎 Validation des flux RSS")
+    print("=" * 70)
+    for r in report['files']:
+        status = '✅' if r['ok'] else '❌'
+        print(f"{status} {os.path.basename(r['file'])} ({r['items']} item(s))")
+        for e in r['errors']:
+            print(f"     ❌ {e}")
+        for w in r['warnings']:
+            print(f"     ⚠️  {w}")
+    s = report['summary']
+    print("-" * 70)
+    print(f"{s['files']} flux, {s['valid']} valide(s), {s['invalid']} en erreur, "
+          f"{s['items']} item(s), {s['warnings']} avertissement(s) "
+          f"en {report['elapsed']:.2f}s")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    options = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if not args:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        args = [os.path.join(base_dir, 'liste_des_flux')]
+
+    paths = collect_paths(args)
+    if not paths:
+        print("❌ Aucun flux à valider.")
+        sys.exit(1)
+
+    workers = int(options['workers']) if options.get('workers') else None
+    report = validate_all(paths, int(options.get('min-items') or 1), workers)
+
+    if options.get('report'):
+        with open(options['report'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if 'json' in options:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+
+    sys.exit(0 if report['summary']['invalid'] == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
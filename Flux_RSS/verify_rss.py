@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Vérifie le contenu d'un flux RSS"""
+"""Vérifie le contenu d'un flux RSS
+
+Affiche un seul flux ; pour contrôler automatiquement tous les flux de
+liste_des_flux/ (rapport JSON), utiliser validate_feeds.py.
+"""
 import xml.etree.ElementTree as ET
 import sys
 